@@ -0,0 +1,62 @@
+import math
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+
+class TensorBatchLoader:
+    """
+    Zero-worker replacement for DataLoader over a TensorDataset.
+
+    Each epoch draws one index permutation and gathers whole batches with
+    index_select, instead of calling __getitem__ per sample and collating.
+    With `device` set, the tensors are moved there once up front so batches
+    are gathered on the device. Exposes `.dataset` and len() like DataLoader.
+    """
+
+    def __init__(self, dataset: TensorDataset, batch_size: int = 512, shuffle: bool = False,
+                 device=None, pin_memory: bool = False, generator: torch.Generator = None):
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.generator = generator
+        tensors = dataset.tensors
+        if device is not None:
+            tensors = tuple(t.to(device) for t in tensors)
+        elif pin_memory:
+            tensors = tuple(t.pin_memory() for t in tensors)
+        self.tensors = tensors
+        self.n = tensors[0].shape[0]
+
+    def __len__(self):
+        return math.ceil(self.n / self.batch_size)
+
+    def __iter__(self):
+        if not self.shuffle:
+            # Contiguous slices are views: no gather, no copy
+            for start in range(0, self.n, self.batch_size):
+                yield tuple(t[start:start + self.batch_size] for t in self.tensors)
+            return
+        perm = torch.randperm(self.n, generator=self.generator).to(self.tensors[0].device)
+        for start in range(0, self.n, self.batch_size):
+            idx = perm[start:start + self.batch_size]
+            yield tuple(t.index_select(0, idx) for t in self.tensors)
+
+
+def make_loader(dataset: TensorDataset, batch_size: int = 512, shuffle: bool = False,
+                num_workers: int = 0, pin_memory: bool = None, prefetch_factor: int = 2,
+                persistent_workers: bool = True, device=None):
+    """
+    Build the batch iterator for a TensorDataset.
+
+    num_workers == 0 uses TensorBatchLoader (index-permutation fast path).
+    Otherwise a DataLoader with worker processes, prefetching and, by
+    default, persistent workers. pin_memory defaults to CUDA availability.
+    """
+    if pin_memory is None:
+        pin_memory = torch.cuda.is_available()
+    if num_workers == 0:
+        return TensorBatchLoader(dataset, batch_size=batch_size, shuffle=shuffle,
+                                 device=device, pin_memory=pin_memory)
+    return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle,
+                      num_workers=num_workers, pin_memory=pin_memory,
+                      prefetch_factor=prefetch_factor, persistent_workers=persistent_workers)
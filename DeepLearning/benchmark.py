@@ -0,0 +1,344 @@
+"""
+Micro-benchmarks for FraudNet inference and training.
+
+Run from the DeepLearning directory:
+
+    python benchmark.py backends
+    python benchmark.py infer         # DataLoader vs direct slicing, 1 / 100 / 1M rows
+    python benchmark.py cache         # cold vs warm load of data/creditcard.csv
+    python benchmark.py loader        # one shuffled epoch: DataLoader workers vs index permutation
+    python benchmark.py logging       # per-step logging overhead: SummaryWriter vs MetricsSink
+    python benchmark.py train         # fp32 eager vs fast mode (bf16 + logits, +compile), epoch time and AUC
+    python benchmark.py quantize      # needs FraudNet.pth and data/creditcard.csv
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import torch
+from model import FraudNet
+
+
+def _timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return np.asarray(samples)
+
+
+def _load_or_init(pth_path, input_dim):
+    from inference import load_model_for_inference
+
+    if os.path.exists(pth_path):
+        return load_model_for_inference(pth_path, input_dim)
+    # Latency doesn't depend on the weights; fall back to a fresh model
+    print(f"{pth_path} not found, benchmarking an untrained FraudNet")
+    return FraudNet(input_dim).eval()
+
+
+# -----------------------------
+# backends: eager vs TorchScript vs ONNX
+# -----------------------------
+def bench_backends(args):
+    from export import export_onnx, export_torchscript
+    from inference import infer_proba, load_exported_model
+
+    model = _load_or_init(args.pth, args.input_dim)
+    rng = np.random.default_rng(0)
+    X_big = rng.normal(size=(1024, args.input_dim)).astype(np.float32)
+    X_one = X_big[:1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {"eager": model}
+        backends["torchscript"] = load_exported_model(
+            export_torchscript(model, args.input_dim, os.path.join(tmp, "FraudNet.pt")))
+        try:
+            backends["onnx"] = load_exported_model(
+                export_onnx(model, args.input_dim, os.path.join(tmp, "FraudNet.onnx")))
+        except ImportError:
+            print("onnx / onnxruntime not installed, skipping ONNX backend")
+
+        reference = infer_proba(model, X_big)
+        for name, m in backends.items():
+            max_diff = float(np.max(np.abs(infer_proba(m, X_big) - reference)))
+            single = _timed(lambda: infer_proba(m, X_one), args.iters) * 1e6
+            batch = _timed(lambda: infer_proba(m, X_big), max(1, args.iters // 10))
+            print(f"[{name}] max |diff| vs eager: {max_diff:.2e}")
+            print(f"  1 row:     p50={np.percentile(single, 50):8.1f}us  p99={np.percentile(single, 99):8.1f}us")
+            print(f"  1024 rows: p50={np.median(batch) * 1e3:8.3f}ms  throughput={1024 / np.median(batch):,.0f} rows/s")
+
+
+# -----------------------------
+# quantize: fp32 vs dynamic int8 (AUC delta + throughput)
+# -----------------------------
+def bench_quantize(args):
+    from sklearn.metrics import roc_auc_score
+    from data_loader import load_data
+    from inference import infer_proba, load_model_for_inference
+
+    _, test_ds, input_dim, y_test, _ = load_data()
+    X_test = test_ds.tensors[0]
+    fp32 = load_model_for_inference(args.pth, input_dim)
+    int8 = load_model_for_inference(args.pth, input_dim, quantize=True)
+
+    results = {}
+    for name, m in (("fp32", fp32), ("int8", int8)):
+        probs = infer_proba(m, X_test, batch_size=args.batch_size)
+        t = _timed(lambda: infer_proba(m, X_test, batch_size=args.batch_size), args.repeats)
+        results[name] = (roc_auc_score(y_test, probs), len(X_test) / np.median(t))
+
+    print(f"held-out split: {len(X_test)} rows, batch_size={args.batch_size}")
+    for name, (auc, rps) in results.items():
+        print(f"  {name}: AUC={auc:.5f}  throughput={rps:,.0f} rows/s")
+    print(f"  AUC delta (int8 - fp32): {results['int8'][0] - results['fp32'][0]:+.5f}")
+    print(f"  speedup: {results['int8'][1] / results['fp32'][1]:.2f}x")
+
+
+# -----------------------------
+# infer: DataLoader-based infer_proba vs direct batched slicing
+# -----------------------------
+def _infer_proba_dataloader(model, X, batch_size=1024):
+    # Previous implementation, kept as the baseline
+    from torch.utils.data import DataLoader, TensorDataset
+
+    dl = DataLoader(TensorDataset(X), batch_size=batch_size, shuffle=False)
+    probs = []
+    with torch.no_grad():
+        for (xb,) in dl:
+            probs.append(model(xb).squeeze(1).cpu())
+    return torch.cat(probs).numpy()
+
+
+def bench_infer(args):
+    from inference import infer_proba
+
+    model = FraudNet(args.input_dim).eval()
+    for rows in args.rows:
+        X = torch.randn(rows, args.input_dim)
+        repeats = max(3, min(args.iters, 2_000_000 // rows))
+        np.testing.assert_allclose(infer_proba(model, X), _infer_proba_dataloader(model, X), rtol=1e-6)
+        old = _timed(lambda: _infer_proba_dataloader(model, X), repeats)
+        new = _timed(lambda: infer_proba(model, X), repeats)
+        print(f"{rows:>9,} rows: DataLoader p50={np.median(old) * 1e3:9.3f}ms  "
+              f"direct p50={np.median(new) * 1e3:9.3f}ms  speedup={np.median(old) / np.median(new):.2f}x")
+
+
+# -----------------------------
+# cache: pd.read_csv vs columnar cache (cold build / warm mmap)
+# -----------------------------
+def bench_cache(args):
+    import shutil
+    import tempfile
+    from csv_cache import read_csv_cached
+
+    cache_dir = tempfile.mkdtemp(prefix="csv_cache_bench_")
+    try:
+        t0 = time.perf_counter()
+        baseline = pd.read_csv(args.csv)
+        t_csv = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        read_csv_cached(args.csv, cache_dir=cache_dir)
+        t_cold = time.perf_counter() - t0
+
+        warm, touched = [], []
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            df = read_csv_cached(args.csv, cache_dir=cache_dir)
+            warm.append(time.perf_counter() - t0)
+            df.select_dtypes("number").to_numpy(dtype=np.float32)  # touch every page
+            touched.append(time.perf_counter() - t0)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{args.csv}: {len(baseline):,} rows x {baseline.shape[1]} columns")
+    print(f"  pd.read_csv:               {t_csv:8.3f}s")
+    print(f"  cold (parse + build cache): {t_cold:8.3f}s")
+    print(f"  warm (mmap):               {np.median(warm):8.3f}s")
+    print(f"  warm + read all columns:   {np.median(touched):8.3f}s")
+
+
+# -----------------------------
+# loader: per-sample DataLoader (0..N workers) vs TensorBatchLoader
+# -----------------------------
+def bench_loader(args):
+    from torch.utils.data import DataLoader, TensorDataset
+    from batching import make_loader
+
+    ds = TensorDataset(torch.randn(args.rows, args.input_dim), torch.randint(0, 2, (args.rows,)).float())
+
+    def epoch(loader):
+        for xb, yb in loader:
+            pass
+
+    loaders = {"DataLoader (0 workers)": DataLoader(ds, batch_size=args.batch_size, shuffle=True)}
+    for w in args.workers:
+        if w > 0:
+            loaders[f"DataLoader ({w} workers)"] = make_loader(ds, args.batch_size, shuffle=True, num_workers=w)
+    loaders["index permutation"] = make_loader(ds, args.batch_size, shuffle=True, num_workers=0)
+
+    print(f"{args.rows:,} rows x {args.input_dim}, batch_size={args.batch_size}")
+    for name, loader in loaders.items():
+        epoch(loader)  # warm-up (starts persistent workers)
+        t = _timed(lambda: epoch(loader), args.repeats)
+        print(f"  {name:<24} epoch p50={np.median(t) * 1e3:9.2f}ms  ({args.rows / np.median(t):,.0f} rows/s)")
+
+
+# -----------------------------
+# train: fp32 eager BCELoss vs fast mode (bf16 autocast, logits, torch.compile)
+# -----------------------------
+def _synthetic_fraud(rows, input_dim, fraud_rate=0.02, seed=0):
+    from torch.utils.data import TensorDataset
+
+    g = torch.Generator().manual_seed(seed)
+    X = torch.randn(rows, input_dim, generator=g)
+    w = torch.randn(input_dim, generator=g)
+    score = X @ w + 2.0 * torch.randn(rows, generator=g)
+    y = (score > torch.quantile(score, 1 - fraud_rate)).float()
+    n_train = int(rows * 0.8)
+    return TensorDataset(X[:n_train], y[:n_train]), TensorDataset(X[n_train:], y[n_train:])
+
+
+def bench_train(args):
+    from batching import make_loader
+    from train import train_model
+
+    train_ds, test_ds = _synthetic_fraud(args.rows, args.input_dim)
+    y_test = test_ds.tensors[1].numpy()
+    modes = {
+        "fp32 eager (BCELoss)": dict(fast=False),
+        "fast (bf16 + logits)": dict(fast=True),
+        "fast + torch.compile": dict(fast=True, compile_model=True),
+    }
+    print(f"synthetic {args.rows:,} rows x {args.input_dim}, batch_size={args.batch_size}, {args.epochs} epochs")
+    results = {}
+    for name, kwargs in modes.items():
+        torch.manual_seed(0)
+        train_loader = make_loader(train_ds, args.batch_size, shuffle=True)
+        test_loader = make_loader(test_ds, args.batch_size)
+        history = train_model(FraudNet(args.input_dim), train_loader, test_loader, y_test,
+                              epochs=args.epochs, lr=1e-3, **kwargs)
+        # The first epoch includes compilation / warm-up
+        steady = [h["epoch_time"] for h in history[1:]] or [history[0]["epoch_time"]]
+        results[name] = (np.median(steady), history[0]["epoch_time"], history[-1]["auc"])
+
+    base_time, _, base_auc = results["fp32 eager (BCELoss)"]
+    print()
+    for name, (epoch_time, first, auc) in results.items():
+        print(f"  {name:<22} epoch p50={epoch_time:7.3f}s (first {first:6.2f}s)  "
+              f"speedup={base_time / epoch_time:5.2f}x  AUC={auc:.4f} ({auc - base_auc:+.4f})")
+
+
+# -----------------------------
+# logging: per-step TensorBoard logging cost as a fraction of step time
+# -----------------------------
+def bench_logging(args):
+    import torch.nn as nn
+    from torch.utils.tensorboard import SummaryWriter
+    from metrics_sink import MetricsSink
+
+    X = torch.randn(args.batch_size, args.input_dim)
+    y = (torch.rand(args.batch_size) < 0.02).float()
+    model = FraudNet(args.input_dim)
+    opt = torch.optim.Adam(model.parameters())
+    criterion = nn.BCELoss()
+
+    def step():
+        loss = criterion(model(X).squeeze(1), y)
+        opt.zero_grad()
+        loss.backward()
+        opt.step()
+        return loss
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = SummaryWriter(os.path.join(tmp, "sync"), flush_secs=1)
+        sink = MetricsSink(os.path.join(tmp, "async"), flush_secs=10)
+        modes = {
+            "no logging": lambda i: step(),
+            "SummaryWriter + .item()": lambda i: writer.add_scalar("loss", step().item(), i),
+            "MetricsSink": lambda i: sink.add_scalar("loss", step().detach(), i),
+        }
+        for fn in modes.values():
+            for i in range(200):
+                fn(i)
+        # Interleaved rounds so drift (turbo, page cache) hits every mode alike
+        samples = {name: [] for name in modes}
+        for _ in range(args.rounds):
+            for name, fn in modes.items():
+                t0 = time.perf_counter()
+                for i in range(args.steps):
+                    fn(i)
+                samples[name].append((time.perf_counter() - t0) / args.steps)
+        results = {name: float(np.median(t)) for name, t in samples.items()}
+        writer.close()
+        sink.close()
+
+    base = results["no logging"]
+    print(f"{args.rounds} x {args.steps} steps, batch_size={args.batch_size}")
+    for name, t in results.items():
+        print(f"  {name:<24} step={t * 1e6:8.1f}us  overhead={(t - base) / base:+7.2%}")
+    print(f"  MetricsSink enqueue: {sink.stats()['enqueue_us_per_event']:.2f}us/event")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FraudNet micro-benchmarks")
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = default)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("backends", help="eager vs TorchScript vs ONNX, 1 and 1024 rows")
+    p.add_argument("--pth", default="FraudNet.pth")
+    p.add_argument("--input-dim", type=int, default=30)
+    p.add_argument("--iters", type=int, default=2000)
+    p.set_defaults(func=bench_backends)
+
+    p = sub.add_parser("quantize", help="fp32 vs int8 AUC delta and throughput on the test split")
+    p.add_argument("--pth", default="FraudNet.pth")
+    p.add_argument("--batch-size", type=int, default=1024)
+    p.add_argument("--repeats", type=int, default=5)
+    p.set_defaults(func=bench_quantize)
+
+    p = sub.add_parser("infer", help="infer_proba: DataLoader vs direct slicing")
+    p.add_argument("--rows", type=int, nargs="+", default=[1, 100, 1_000_000])
+    p.add_argument("--input-dim", type=int, default=30)
+    p.add_argument("--iters", type=int, default=1000)
+    p.set_defaults(func=bench_infer)
+
+    p = sub.add_parser("cache", help="cold vs warm load of the columnar CSV cache")
+    p.add_argument("--csv", default="data/creditcard.csv")
+    p.add_argument("--repeats", type=int, default=5)
+    p.set_defaults(func=bench_cache)
+
+    p = sub.add_parser("loader", help="one shuffled epoch: DataLoader workers vs index permutation")
+    p.add_argument("--rows", type=int, default=227_845)
+    p.add_argument("--input-dim", type=int, default=30)
+    p.add_argument("--batch-size", type=int, default=512)
+    p.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    p.add_argument("--repeats", type=int, default=3)
+    p.set_defaults(func=bench_loader)
+
+    p = sub.add_parser("logging", help="per-step logging overhead: SummaryWriter vs MetricsSink")
+    p.add_argument("--steps", type=int, default=1000)
+    p.add_argument("--rounds", type=int, default=5)
+    p.add_argument("--batch-size", type=int, default=512)
+    p.add_argument("--input-dim", type=int, default=30)
+    p.set_defaults(func=bench_logging)
+
+    p = sub.add_parser("train", help="epoch time and AUC parity: fp32 eager vs fast training mode")
+    p.add_argument("--rows", type=int, default=284_807)
+    p.add_argument("--input-dim", type=int, default=30)
+    p.add_argument("--batch-size", type=int, default=512)
+    p.add_argument("--epochs", type=int, default=5)
+    p.set_defaults(func=bench_train)
+
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
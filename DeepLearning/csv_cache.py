@@ -0,0 +1,8 @@
+"""
+Binary columnar cache for large CSV datasets. The implementation is shared
+with fraud_api: see fraud_api/loaders/csv_cache.py.
+"""
+import os
+from shared import use_shared
+
+use_shared(__name__, os.path.join("loaders", "csv_cache.py"))
@@ -4,12 +4,21 @@ from sklearn.preprocessing import StandardScaler
 from torch.utils.data import TensorDataset
 import torch
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+from scaling import AffineScaler, SCALER_PATH
+from csv_cache import read_csv_cached
 
 data_dir = "data"
 
-def load_data():
+def load_data(use_cache: bool = True, eda: bool = False):
+    """
+    Split creditcard.csv into scaled train/test TensorDatasets.
+
+    Returns (train_ds, test_ds, input_dim, y_test, scaler), where scaler is
+    the AffineScaler fitted on the training split. Nothing is written: the
+    caller saves the scaler next to the model it trained, so loading data
+    alone never replaces the scaler paired with an existing FraudNet.pth.
+    """
     os.makedirs(data_dir, exist_ok=True)
     file_path = os.path.join(data_dir, "creditcard.csv")
     
@@ -22,9 +31,12 @@ def load_data():
             "Dataset: mlg-ulb/creditcardfraud"
         )
 
-    df = pd.read_csv(file_path)
-    classDistVisual(df)
-    featureDistVisual(df)
+    # Parsed once into data/.cache, memory-mapped on later runs
+    df = read_csv_cached(file_path, cache_dir=os.path.join(data_dir, ".cache")) if use_cache else pd.read_csv(file_path)
+    if eda:
+        # Opt-in; redrawn only when the dataset hash changes (see eda.py)
+        from eda import eda_report
+        eda_report(file_path, df=df)
     X = df.drop("Class", axis=1)
     y = df["Class"]
 
@@ -45,18 +57,30 @@ def load_data():
         torch.tensor(y_test.values, dtype=torch.float32)
     )
 
-    return train_ds, test_ds, X_train.shape[1], y_test
+    return train_ds, test_ds, X_train.shape[1], y_test, AffineScaler.from_sklearn(scaler)
 
-def classDistVisual(df: pd.DataFrame):
+def load_new_data(file_path: str, val_size: float = 0.2):
+    """
+    Prepare a batch of new labelled transactions for incremental training.
 
+    The saved scaler's running mean/variance are updated with this batch
+    only (partial_fit, no refit over history). Returns the same tuple as
+    load_data(), with a stratified validation slice of the new batch in
+    place of the test set and the updated scaler. Nothing is written: the
+    caller saves the scaler once the fine-tuned model is saved, so a failed
+    run leaves both untouched and a rerun doesn't count the batch twice.
+    """
+    df = pd.read_csv(file_path)
+    X = df.drop("Class", axis=1).to_numpy(dtype=np.float64)
+    y = df["Class"]
 
-    sns.countplot(x='Class', data=df)
-    plt.title("Fraud vs Non-Fraud Transactions")
-    plt.savefig("plots/classdist.png", bbox_inches="tight"); plt.close()
+    scaler = AffineScaler.load(SCALER_PATH).partial_fit(X)
+    X = scaler.transform(X)
 
-def featureDistVisual(df: pd.DataFrame):
-    plt.figure(figsize=(10,8))
-    corr = df.corr(numeric_only=True)
-    sns.heatmap(corr, cmap="coolwarm", center=0)
-    plt.title("Feature correlation"); 
-    plt.savefig("plots/featuredist.png", bbox_inches="tight"); plt.close()
+    stratify = y if y.value_counts().min() >= 2 else None
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, y, test_size=val_size, random_state=42, stratify=stratify
+    )
+    train_ds = TensorDataset(torch.from_numpy(X_train), torch.tensor(y_train.values, dtype=torch.float32))
+    val_ds = TensorDataset(torch.from_numpy(X_val), torch.tensor(y_val.values, dtype=torch.float32))
+    return train_ds, val_ds, X.shape[1], y_val, scaler
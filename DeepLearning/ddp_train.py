@@ -0,0 +1,164 @@
+"""
+CPU data-parallel training for FraudNet (torch.distributed, gloo backend).
+
+Each local process trains a DistributedDataParallel replica on its shard of
+the training TensorDataset and gradients are all-reduced every step. The
+global batch size is fixed, so every process count follows the same
+optimisation schedule and only wall-clock time differs.
+
+    python ddp_train.py --procs 4 --save            # train with 4 processes
+    python ddp_train.py --procs 1 2 4 8 --target-auc 0.97   # scaling report
+"""
+import argparse
+import os
+import socket
+import time
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+import torch.nn as nn
+import torch.optim as optim
+from torch.nn.parallel import DistributedDataParallel
+from sklearn.metrics import roc_auc_score
+from model import FraudNet, save_model
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def shard_indices(n: int, rank: int, world_size: int, epoch: int, seed: int = 0) -> torch.Tensor:
+    """
+    This rank's rows for `epoch`: one permutation shared by all ranks
+    (seeded by seed + epoch) split round-robin, padded by wrapping around so
+    every rank runs the same number of steps (as DistributedSampler does).
+    """
+    g = torch.Generator().manual_seed(seed + epoch)
+    perm = torch.randperm(n, generator=g)
+    total = -(-n // world_size) * world_size
+    if total > n:
+        perm = torch.cat([perm, perm[:total - n]])
+    return perm[rank::world_size]
+
+
+# ------------------------
+# Worker process
+# ------------------------
+def _worker(rank, world_size, port, train_ds, test_ds, y_test, args, results):
+    os.environ["MASTER_ADDR"] = "127.0.0.1"
+    os.environ["MASTER_PORT"] = str(port)
+    # Split the cores between processes instead of oversubscribing them
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // world_size))
+    dist.init_process_group("gloo", rank=rank, world_size=world_size)
+
+    X, y = train_ds.tensors
+    torch.manual_seed(args.seed)  # identical initial weights on every rank
+    model = DistributedDataParallel(FraudNet(X.shape[1]))
+    criterion = nn.BCELoss()
+    optimizer = optim.Adam(model.parameters(), lr=args.lr)
+    local_batch = max(1, args.batch_size // world_size)
+
+    history = []
+    stop = torch.zeros(1)
+    start = time.perf_counter()
+    for epoch in range(args.max_epochs):
+        t0 = time.perf_counter()
+        model.train()
+        idx = shard_indices(len(X), rank, world_size, epoch, seed=args.seed)
+        for b in range(0, len(idx), local_batch):
+            bi = idx[b:b + local_batch]
+            loss = criterion(model(X[bi]).squeeze(1), y[bi])
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+        epoch_time = time.perf_counter() - t0
+
+        if rank == 0:
+            # Evaluation is cheap next to training and runs on rank 0 only
+            model.eval()
+            with torch.inference_mode():
+                probs = model.module(test_ds.tensors[0]).squeeze(1).numpy()
+            auc = roc_auc_score(y_test, probs)
+            history.append({"epoch": epoch + 1, "epoch_time": epoch_time,
+                            "elapsed": time.perf_counter() - start, "auc": auc})
+            print(f"[procs={world_size}] epoch {epoch + 1}: {epoch_time:.2f}s  AUC={auc:.4f}", flush=True)
+            stop.fill_(float(args.target_auc is not None and auc >= args.target_auc))
+        dist.broadcast(stop, src=0)
+        if stop.item():
+            break
+
+    if rank == 0:
+        if args.save:
+            save_model(model.module)
+        results.put({"procs": world_size, "history": history})
+    dist.destroy_process_group()
+
+
+def train_ddp(train_ds, test_ds, y_test, procs: int, args) -> dict:
+    """
+    Train with `procs` local processes and return rank 0's per-epoch
+    history (epoch time, elapsed time, test AUC).
+    """
+    for t in train_ds.tensors + test_ds.tensors:
+        t.share_memory_()  # children map the same pages instead of pickling copies
+    ctx = mp.get_context("spawn")
+    results = ctx.SimpleQueue()
+    mp.spawn(_worker, args=(procs, _free_port(), train_ds, test_ds, np.asarray(y_test), args, results),
+             nprocs=procs, join=True)
+    return results.get()
+
+
+# ------------------------
+# Scaling report
+# ------------------------
+def _time_to_target(history, target):
+    for h in history:
+        if target is not None and h["auc"] >= target:
+            return h["elapsed"], h["epoch"]
+    return None, None
+
+
+def scaling_report(runs, target_auc):
+    base = runs[0]
+    base_epoch = np.median([h["epoch_time"] for h in base["history"]])
+    base_ttt, _ = _time_to_target(base["history"], target_auc)
+    print(f"\nScaling report (target AUC {target_auc}, baseline {base['procs']} process(es))")
+    print(f"{'procs':>5} {'epoch s':>9} {'speedup':>8} {'effic.':>7} {'epochs':>7} {'time-to-target s':>17} {'speedup':>8}")
+    for run in runs:
+        p = run["procs"]
+        epoch_time = np.median([h["epoch_time"] for h in run["history"]])
+        speedup = base_epoch / epoch_time
+        efficiency = speedup * base["procs"] / p
+        ttt, epochs = _time_to_target(run["history"], target_auc)
+        ttt_col = f"{ttt:17.2f}" if ttt is not None else f"{'not reached':>17}"
+        ttt_speedup = f"{base_ttt / ttt:8.2f}" if ttt and base_ttt else f"{'-':>8}"
+        print(f"{p:>5} {epoch_time:9.3f} {speedup:8.2f} {efficiency:7.0%} {epochs or '-':>7} {ttt_col} {ttt_speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Data-parallel CPU training for FraudNet (gloo)")
+    parser.add_argument("--procs", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="process counts to run; more than one prints a scaling report")
+    parser.add_argument("--target-auc", type=float, default=None,
+                        help="stop once test AUC reaches this value (headline metric: time to reach it)")
+    parser.add_argument("--max-epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=512, help="global batch size across processes")
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", action="store_true", help="save FraudNet.pth from the last run and its scaler.npz")
+    args = parser.parse_args()
+
+    from data_loader import load_data
+    train_ds, test_ds, _, y_test, scaler = load_data()
+    runs = [train_ddp(train_ds, test_ds, y_test, p, args) for p in args.procs]
+    if args.save:
+        scaler.save()  # after FraudNet.pth, which rank 0 saved
+    if len(runs) > 1:
+        scaling_report(runs, args.target_auc)
+
+
+if __name__ == "__main__":
+    main()
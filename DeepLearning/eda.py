@@ -0,0 +1,79 @@
+"""
+Exploratory plots for the credit card dataset, kept out of training.
+
+    python eda.py            # writes plots/classdist.png and plots/featuredist.png
+    python eda.py --force    # redraw even if the dataset is unchanged
+
+The report is keyed by the dataset's content hash (plots/eda.json) and is
+only redrawn when the CSV changes. matplotlib and seaborn are imported
+here and nowhere on the training path.
+"""
+import argparse
+import json
+import os
+import pandas as pd
+from csv_cache import cached_digest, read_csv_cached
+
+PLOTS_DIR = "plots"
+STAMP_NAME = "eda.json"
+PLOTS = ("classdist.png", "featuredist.png")
+
+
+def classDistVisual(df: pd.DataFrame, plots_dir: str = PLOTS_DIR):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.countplot(x='Class', data=df)
+    plt.title("Fraud vs Non-Fraud Transactions")
+    plt.savefig(os.path.join(plots_dir, "classdist.png"), bbox_inches="tight"); plt.close()
+
+
+def featureDistVisual(df: pd.DataFrame, plots_dir: str = PLOTS_DIR):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(10,8))
+    corr = df.corr(numeric_only=True)
+    sns.heatmap(corr, cmap="coolwarm", center=0)
+    plt.title("Feature correlation");
+    plt.savefig(os.path.join(plots_dir, "featuredist.png"), bbox_inches="tight"); plt.close()
+
+
+def eda_report(file_path: str = os.path.join("data", "creditcard.csv"), plots_dir: str = PLOTS_DIR,
+               force: bool = False, df: pd.DataFrame = None) -> bool:
+    """
+    Draw the EDA plots unless plots_dir already holds them for this exact
+    dataset. Returns True if the plots were (re)drawn.
+    """
+    digest = cached_digest(file_path)
+
+    stamp_path = os.path.join(plots_dir, STAMP_NAME)
+    if not force and os.path.exists(stamp_path):
+        with open(stamp_path) as f:
+            stamp = json.load(f)
+        if stamp.get("digest") == digest and all(os.path.exists(os.path.join(plots_dir, p)) for p in PLOTS):
+            print(f"EDA plots in {plots_dir}/ are up to date")
+            return False
+
+    os.makedirs(plots_dir, exist_ok=True)
+    if df is None:
+        df = read_csv_cached(file_path)
+    classDistVisual(df, plots_dir)
+    featureDistVisual(df, plots_dir)
+    with open(stamp_path, "w") as f:
+        json.dump({"file": os.path.basename(file_path), "digest": digest}, f)
+    print(f"EDA plots written to {plots_dir}/")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EDA plots for the credit card dataset")
+    parser.add_argument("--csv", default=os.path.join("data", "creditcard.csv"))
+    parser.add_argument("--plots-dir", default=PLOTS_DIR)
+    parser.add_argument("--force", action="store_true", help="redraw even if the dataset is unchanged")
+    args = parser.parse_args()
+    eda_report(args.csv, plots_dir=args.plots_dir, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
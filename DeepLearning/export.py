@@ -0,0 +1,55 @@
+"""
+Export a trained FraudNet to TorchScript and/or ONNX next to FraudNet.pth.
+
+    python export.py --input-dim 30                  # FraudNet.pt + FraudNet.onnx
+    python export.py --input-dim 30 --format torchscript
+"""
+import argparse
+import os
+import torch
+from inference import load_model_for_inference
+
+
+def exported_path(pth_path: str, fmt: str) -> str:
+    """
+    FraudNet.pth -> FraudNet.pt (TorchScript) / FraudNet.onnx
+    """
+    base, _ = os.path.splitext(pth_path)
+    return base + (".pt" if fmt == "torchscript" else ".onnx")
+
+
+def export_torchscript(model: torch.nn.Module, input_dim: int, path: str) -> str:
+    model = model.cpu().eval()
+    with torch.no_grad():
+        traced = torch.jit.trace(model, torch.zeros(1, input_dim))
+    traced.save(path)
+    return path
+
+
+def export_onnx(model: torch.nn.Module, input_dim: int, path: str, opset: int = 18) -> str:
+    model = model.cpu().eval()
+    torch.onnx.export(
+        model, torch.zeros(1, input_dim), path,
+        input_names=["features"], output_names=["fraud_probability"],
+        dynamic_axes={"features": {0: "batch"}, "fraud_probability": {0: "batch"}},
+        opset_version=opset,
+    )
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export FraudNet to TorchScript / ONNX")
+    parser.add_argument("--pth", default="FraudNet.pth")
+    parser.add_argument("--input-dim", type=int, default=30)
+    parser.add_argument("--format", choices=["torchscript", "onnx", "both"], default="both")
+    args = parser.parse_args()
+
+    model = load_model_for_inference(args.pth, input_dim=args.input_dim)
+    if args.format in ("torchscript", "both"):
+        print(f"TorchScript -> {export_torchscript(model, args.input_dim, exported_path(args.pth, 'torchscript'))}")
+    if args.format in ("onnx", "both"):
+        print(f"ONNX        -> {export_onnx(model, args.input_dim, exported_path(args.pth, 'onnx'))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,75 @@
+import functools
 import torch
-from torch.utils.data import DataLoader, TensorDataset
 import numpy as np
 from model import FraudNet  # ensure this matches your model class
+import os
+from scaling import AffineScaler, SCALER_PATH
+from thresholds import ThresholdTable
 
-def load_model_for_inference(pth_path: str, input_dim: int, device: str = "cpu") -> torch.nn.Module:
+# Written next to FraudNet.pth by train.py
+OPERATING_POINTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'operating_points.json')
+
+def load_model_for_inference(pth_path: str, input_dim: int, device: str = "cpu",
+                             quantize: bool = False) -> torch.nn.Module:
     model = FraudNet(input_dim)
     state = torch.load(pth_path, map_location=device)
     model.load_state_dict(state)
     model.to(device)
     model.eval()
+    if quantize:
+        model = quantize_model(model)
     return model
 
-def infer_proba(model: torch.nn.Module, features, device: str = "cpu", batch_size: int = 1024) -> np.ndarray:
+def quantize_model(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Dynamic int8 quantization of every nn.Linear (weights int8, activations
+    quantized on the fly). CPU only.
+    """
+    if next(model.parameters()).device.type != "cpu":
+        raise ValueError("Dynamic quantization is only supported on CPU")
+    return torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+class OnnxModel:
+    """
+    onnxruntime session behind the same call signature as FraudNet:
+    (n, input_dim) float tensor in, (n, 1) probability tensor out.
+    """
+    def __init__(self, onnx_path: str, num_threads: int = 0):
+        import onnxruntime as ort
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            opts.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(onnx_path, opts, providers=["CPUExecutionProvider"])
+
+    def __call__(self, xb: torch.Tensor) -> torch.Tensor:
+        x = xb.detach().cpu().numpy().astype(np.float32, copy=False)
+        return torch.from_numpy(self.session.run(None, {"features": x})[0])
+
+    def eval(self):
+        return self
+
+def load_exported_model(path: str, device: str = "cpu"):
+    """
+    Load an artifact written by export.py: .pt (TorchScript, frozen and
+    optimized for inference) or .onnx (onnxruntime, all graph optimizations).
+    Usable anywhere an eager FraudNet is, e.g. infer_proba().
+    """
+    if path.endswith(".onnx"):
+        return OnnxModel(path)
+    module = torch.jit.load(path, map_location=device).eval()
+    return torch.jit.optimize_for_inference(torch.jit.freeze(module))
+
+def load_scaler(scaler_path: str = SCALER_PATH) -> AffineScaler:
+    return AffineScaler.load(scaler_path)
+
+def infer_proba(model: torch.nn.Module, features, device: str = "cpu", batch_size: int = 1024,
+                scaler: AffineScaler = None) -> np.ndarray:
+    # Raw (unscaled) features can be passed together with the training scaler
+    if scaler is not None:
+        if torch.is_tensor(features):
+            features = features.cpu().numpy()
+        features = scaler.transform(features)
     if isinstance(features, np.ndarray):
         X = torch.from_numpy(features).float()
     elif torch.is_tensor(features):
@@ -19,16 +77,43 @@ def infer_proba(model: torch.nn.Module, features, device: str = "cpu", batch_siz
     else:
         raise TypeError("features must be a NumPy array or a torch.Tensor")
 
-    dl = DataLoader(TensorDataset(X), batch_size=batch_size, shuffle=False)
-    probs = []
-    with torch.no_grad():
-        for (xb,) in dl:
-            xb = xb.to(device)
-            p = model(xb).squeeze(1)  # model outputs sigmoid probs
-            probs.append(p.cpu())
-    return torch.cat(probs).numpy()
+    # Probabilities are written straight into one preallocated output; the
+    # input is sliced as views, no DataLoader/collate or final concatenation.
+    n = X.shape[0]
+    probs = np.empty(n, dtype=np.float32)
+    out = torch.from_numpy(probs)
+    with torch.inference_mode():
+        if n <= batch_size:
+            # Small inputs: single pass
+            out.copy_(model(X.to(device)).reshape(-1))  # model outputs sigmoid probs
+        else:
+            for start in range(0, n, batch_size):
+                xb = X[start:start + batch_size]
+                out[start:start + xb.shape[0]].copy_(model(xb.to(device)).reshape(-1))
+    return probs
+
+@functools.lru_cache(maxsize=32)
+def _optimal_threshold(table_path: str, mtime_ns: int, cost_fp: float, cost_fn: float) -> float:
+    return ThresholdTable.load(table_path).optimal_threshold(cost_fp, cost_fn)
+
+def decision_threshold(table_path: str = OPERATING_POINTS_PATH, cost_fp: float = None,
+                       cost_fn: float = None, default: float = 0.5) -> float:
+    """
+    Cost-optimal threshold from the operating-point table saved by training
+    (costs default to the ones it was built with), or `default` if none.
+    The table is parsed and searched once per file version and costs; later
+    calls cost a stat() and a cache lookup.
+    """
+    try:
+        mtime_ns = os.stat(table_path).st_mtime_ns
+    except FileNotFoundError:
+        return default
+    return _optimal_threshold(table_path, mtime_ns, cost_fp, cost_fn)
 
-def infer_label(model: torch.nn.Module, features, threshold: float = 0.5, **kwargs) -> np.ndarray:
+def infer_label(model: torch.nn.Module, features, threshold: float = None, **kwargs) -> np.ndarray:
+    # threshold=None: the cost-optimal one from operating_points.json
+    if threshold is None:
+        threshold = decision_threshold()
     probs = infer_proba(model, features, **kwargs)
     return (probs >= threshold).astype(np.int64)
 
@@ -47,7 +132,7 @@ def main():
     ], dtype=np.float32)
     model = load_model_for_inference("FraudNet.pth", input_dim=X.shape[1], device="cpu")
     probs = infer_proba(model, X)            # returns probabilities in [0,1]
-    preds = infer_label(model, X, 0.5)       # returns 0/1 labels
+    preds = infer_label(model, X)            # returns 0/1 labels at the cost-optimal threshold
     print(probs, preds)
 
 
@@ -0,0 +1,36 @@
+import torch
+
+
+class StreamingAUC:
+    """
+    Approximate ROC AUC accumulated batch by batch on the model's device.
+
+    Predictions are bucketed into `num_bins` equal-width bins per class, so
+    memory is constant and nothing is copied to the host until compute().
+    With the default 4096 bins the result is typically within 1e-3 of
+    sklearn's exact roc_auc_score.
+    """
+
+    def __init__(self, num_bins: int = 4096, device="cpu"):
+        self.num_bins = num_bins
+        self.pos = torch.zeros(num_bins, dtype=torch.float64, device=device)
+        self.neg = torch.zeros(num_bins, dtype=torch.float64, device=device)
+
+    def reset(self):
+        self.pos.zero_()
+        self.neg.zero_()
+
+    @torch.no_grad()
+    def update(self, probs: torch.Tensor, labels: torch.Tensor):
+        idx = (probs.detach().reshape(-1).clamp(0, 1) * (self.num_bins - 1)).long()
+        labels = labels.detach().reshape(-1).to(self.pos.dtype)
+        self.pos.index_add_(0, idx, labels)
+        self.neg.index_add_(0, idx, 1 - labels)
+
+    def compute(self) -> float:
+        # P(score_pos > score_neg) + 0.5 * P(same bin)
+        neg_below = torch.cumsum(self.neg, 0) - self.neg
+        n_pairs = self.pos.sum() * self.neg.sum()
+        if n_pairs == 0:
+            return float("nan")
+        return ((self.pos * (neg_below + 0.5 * self.neg)).sum() / n_pairs).item()
@@ -0,0 +1,7 @@
+"""
+Asynchronous TensorBoard logging. The implementation is shared with
+fraud_api: see fraud_api/metrics_sink.py.
+"""
+from shared import use_shared
+
+use_shared(__name__, "metrics_sink.py")
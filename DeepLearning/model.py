@@ -21,6 +21,12 @@ class FraudNet(nn.Module):
     def forward(self, x):
         return self.layers(x)
 
+    def forward_logits(self, x):
+        """
+        Pre-sigmoid output, for BCEWithLogitsLoss. Same weights as forward().
+        """
+        return self.layers[:-1](x)
+
 
 # Mapping from string model name to class for save/load utilities
 model_factory = {
@@ -0,0 +1,86 @@
+import numpy as np
+from os import path
+
+# Saved next to FraudNet.pth by train.py / ddp_train.py --save
+SCALER_PATH = path.join(path.dirname(path.abspath(__file__)), 'scaler.npz')
+
+
+class AffineScaler:
+    """
+    StandardScaler statistics applied as `(x - mean) * inv_scale`.
+
+    Training fits a regular sklearn StandardScaler; its `mean_`/`scale_` are
+    saved to `scaler.npz` so inference can scale raw features in place
+    without sklearn. `var_` and `n_samples_seen` are saved too, so
+    partial_fit() can fold new data into the statistics later.
+    """
+
+    def __init__(self, mean, scale, dtype=np.float32, var=None, n_samples_seen=None):
+        # Full-precision stats are kept for save(); the float32 copies do the work
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.var_ = None if var is None else np.asarray(var, dtype=np.float64)
+        self.n_samples_seen = None if n_samples_seen is None else int(n_samples_seen)
+        self.dtype = dtype
+        self._set_working_copies()
+
+    def _set_working_copies(self):
+        self.mean = np.ascontiguousarray(self.mean_, dtype=self.dtype)
+        self.inv_scale = np.ascontiguousarray(1.0 / self.scale_, dtype=self.dtype)
+        self.n_features = self.mean.shape[0]
+
+    @classmethod
+    def from_sklearn(cls, scaler, dtype=np.float32):
+        n = scaler.n_features_in_
+        # mean_ is fitted even with with_mean=False, so check the flags
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n)
+        if scaler.with_mean and scaler.with_std:
+            # Running statistics only make sense for a full standardization
+            return cls(mean, scale, dtype=dtype, var=scaler.var_,
+                       n_samples_seen=np.max(scaler.n_samples_seen_))
+        return cls(mean, scale, dtype=dtype)
+
+    def partial_fit(self, X):
+        """
+        Fold a new batch into mean/variance (Chan et al. pairwise update),
+        as StandardScaler.partial_fit does, without revisiting old data.
+        """
+        if self.n_samples_seen is None or self.var_ is None:
+            raise ValueError("Scaler has no running statistics; retrain with train.py to refit it")
+        X = np.asarray(X, dtype=np.float64)
+        n_a, n_b = self.n_samples_seen, X.shape[0]
+        if n_b == 0:
+            return self
+        n = n_a + n_b
+        mean_b = X.mean(axis=0)
+        delta = mean_b - self.mean_
+        m2 = self.var_ * n_a + X.var(axis=0) * n_b + delta ** 2 * (n_a * n_b / n)
+        self.mean_ = self.mean_ + delta * (n_b / n)
+        self.var_ = m2 / n
+        scale = np.sqrt(self.var_)
+        # Same guard as sklearn: constant features keep a unit scale
+        self.scale_ = np.where(scale < 10 * np.finfo(np.float64).eps, 1.0, scale)
+        self.n_samples_seen = n
+        self._set_working_copies()
+        return self
+
+    def save(self, scaler_path: str = SCALER_PATH):
+        stats = dict(mean=self.mean_, scale=self.scale_)
+        if self.n_samples_seen is not None and self.var_ is not None:
+            stats.update(var=self.var_, n_samples_seen=self.n_samples_seen)
+        np.savez(scaler_path, **stats)
+
+    @classmethod
+    def load(cls, scaler_path: str = SCALER_PATH, dtype=np.float32):
+        with np.load(scaler_path) as f:
+            running = dict(var=f["var"], n_samples_seen=f["n_samples_seen"]) if "var" in f.files else {}
+            return cls(f["mean"], f["scale"], dtype=dtype, **running)
+
+    def transform(self, X, out=None):
+        """
+        Scale a NumPy array. Pass `out=X` to scale a float32 buffer in place.
+        """
+        out = np.subtract(X, self.mean, out=out, dtype=self.mean.dtype)
+        np.multiply(out, self.inv_scale, out=out)
+        return out
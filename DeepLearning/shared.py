@@ -0,0 +1,26 @@
+"""
+Modules shared with fraud_api.
+
+A shared module has one implementation under ../fraud_api. The module of
+the same name here is a stub that installs it with use_shared(), so the
+usual `from metrics_sink import MetricsSink` works unchanged. It is loaded
+by file path because the two projects' flat module names collide
+(inference.py, scaling.py, ...), so fraud_api/ can't just go on sys.path.
+"""
+import importlib.util
+import os
+import sys
+
+FRAUD_API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fraud_api")
+
+
+def use_shared(module_name: str, relpath: str):
+    """
+    Execute fraud_api/<relpath> as `module_name` and register it in
+    sys.modules, replacing the calling stub.
+    """
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(FRAUD_API_DIR, relpath))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
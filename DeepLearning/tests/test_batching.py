@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batching import TensorBatchLoader, make_loader
+
+
+class TestTensorBatchLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.ds = TensorDataset(torch.arange(1000.).unsqueeze(1), torch.arange(1000.))
+
+    def test_shuffled_epoch_covers_every_row_once(self):
+        loader = TensorBatchLoader(self.ds, batch_size=128, shuffle=True)
+        batches = list(loader)
+        self.assertEqual(len(batches), len(loader))
+        xs = torch.cat([xb.squeeze(1) for xb, _ in batches])
+        ys = torch.cat([yb for _, yb in batches])
+        self.assertTrue(torch.equal(xs, ys))  # rows stay paired
+        self.assertTrue(torch.equal(xs.sort().values, torch.arange(1000.)))
+        self.assertFalse(torch.equal(xs, torch.arange(1000.)))
+
+    def test_unshuffled_matches_dataloader(self):
+        ours = list(TensorBatchLoader(self.ds, batch_size=300))
+        ref = list(DataLoader(self.ds, batch_size=300))
+        self.assertEqual(len(ours), len(ref))
+        for (a, b), (c, d) in zip(ours, ref):
+            self.assertTrue(torch.equal(a, c) and torch.equal(b, d))
+
+    def test_make_loader_picks_fast_path_without_workers(self):
+        self.assertIsInstance(make_loader(self.ds, num_workers=0), TensorBatchLoader)
+        self.assertIsInstance(make_loader(self.ds, num_workers=1), DataLoader)
+
+
+if __name__ == "__main__":
+    unittest.main()
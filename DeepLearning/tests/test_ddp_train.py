@@ -0,0 +1,26 @@
+import os
+import sys
+import unittest
+
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ddp_train import shard_indices
+
+
+class TestShardIndices(unittest.TestCase):
+
+    def test_shards_cover_dataset_with_equal_lengths(self):
+        n, world = 1001, 4
+        shards = [shard_indices(n, r, world, epoch=3) for r in range(world)]
+        self.assertEqual({len(s) for s in shards}, {251})
+        self.assertTrue(torch.equal(torch.cat(shards).unique(), torch.arange(n)))
+
+    def test_same_epoch_same_permutation(self):
+        a = shard_indices(100, 0, 2, epoch=1)
+        self.assertTrue(torch.equal(a, shard_indices(100, 0, 2, epoch=1)))
+        self.assertFalse(torch.equal(a, shard_indices(100, 0, 2, epoch=2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
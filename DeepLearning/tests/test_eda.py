@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from eda import eda_report
+
+
+class TestEdaReport(unittest.TestCase):
+
+    def test_redraws_only_when_dataset_changes(self):
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv = os.path.join(tmp, "creditcard.csv")
+            plots = os.path.join(tmp, "plots")
+            df = pd.DataFrame({"V1": rng.normal(size=200), "Amount": rng.random(200),
+                               "Class": (rng.random(200) < 0.1).astype(int)})
+            df.to_csv(csv, index=False)
+            self.assertTrue(eda_report(csv, plots_dir=plots))
+            self.assertFalse(eda_report(csv, plots_dir=plots))
+            df.iloc[:100].to_csv(csv, index=False)
+            self.assertTrue(eda_report(csv, plots_dir=plots))
+
+    def test_training_imports_skip_plotting_libraries(self):
+        code = "import sys, train; print('matplotlib' in sys.modules or 'seaborn' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from export import export_onnx, export_torchscript
+from inference import infer_proba, load_exported_model
+from model import FraudNet
+
+
+class TestExportParity(unittest.TestCase):
+
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = FraudNet(30).eval()
+        self.X = np.random.default_rng(0).normal(size=(1024, 30)).astype(np.float32)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _assert_parity(self, exported):
+        for X in (self.X[:1], self.X):
+            np.testing.assert_allclose(
+                infer_proba(exported, X), infer_proba(self.model, X), rtol=1e-5, atol=1e-6
+            )
+
+    def test_torchscript_matches_eager(self):
+        path = export_torchscript(self.model, 30, os.path.join(self.tmp.name, "FraudNet.pt"))
+        self._assert_parity(load_exported_model(path))
+
+    def test_onnx_matches_eager(self):
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            self.skipTest("onnxruntime not installed")
+        path = export_onnx(self.model, 30, os.path.join(self.tmp.name, "FraudNet.onnx"))
+        self._assert_parity(load_exported_model(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
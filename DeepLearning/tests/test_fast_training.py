@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+
+import torch
+import torch.nn as nn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model import FraudNet
+from train import make_forward_loss
+
+
+class TestFastTrainingMode(unittest.TestCase):
+
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = FraudNet(30).eval()
+        self.x = torch.randn(256, 30)
+        self.y = (torch.rand(256) < 0.1).float()
+
+    def test_logits_are_probability_compatible(self):
+        with torch.no_grad():
+            torch.testing.assert_close(torch.sigmoid(self.model.forward_logits(self.x)), self.model(self.x))
+
+    def test_fast_loss_matches_bce(self):
+        base = make_forward_loss(self.model, torch.device("cpu"))
+        fast = make_forward_loss(self.model, torch.device("cpu"), fast=True)
+        with torch.no_grad():
+            p_ref, loss_ref = base(self.x, self.y)
+            p_fast, loss_fast = fast(self.x, self.y)
+        # bf16 matmuls: agreement to a couple of decimal places
+        torch.testing.assert_close(p_fast, p_ref, atol=2e-2, rtol=0)
+        self.assertAlmostEqual(loss_fast.item(), loss_ref.item(), delta=1e-2)
+        self.assertAlmostEqual(loss_ref.item(), nn.BCELoss()(p_ref, self.y).item(), places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import inference
+from thresholds import ThresholdTable
+
+
+class TestDecisionThreshold(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "operating_points.json")
+        y = np.array([0, 0, 0, 1, 1])
+        ThresholdTable.from_scores(y, [0.1, 0.2, 0.6, 0.7, 0.9], n_bins=10).save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_table_is_parsed_once(self):
+        with mock.patch.object(inference.ThresholdTable, "load", wraps=ThresholdTable.load) as load:
+            first = inference.decision_threshold(self.path)
+            for _ in range(5):
+                self.assertEqual(inference.decision_threshold(self.path), first)
+            self.assertEqual(load.call_count, 1)
+            inference.decision_threshold(self.path, cost_fn=1.0)  # other costs: searched again
+            self.assertEqual(load.call_count, 2)
+
+    def test_rewritten_table_is_reloaded(self):
+        first = inference.decision_threshold(self.path)
+        y = np.array([0, 0, 1, 1, 1])
+        ThresholdTable.from_scores(y, [0.1, 0.15, 0.2, 0.3, 0.4], n_bins=10).save(self.path)
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1_000_000))
+        self.assertNotEqual(inference.decision_threshold(self.path), first)
+
+    def test_missing_table_uses_default(self):
+        self.assertEqual(inference.decision_threshold(os.path.join(self.tmp.name, "none.json"), default=0.3), 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
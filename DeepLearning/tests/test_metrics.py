@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import torch
+from sklearn.metrics import roc_auc_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metrics import StreamingAUC
+
+
+class TestStreamingAUC(unittest.TestCase):
+
+    def test_matches_sklearn_across_batches(self):
+        rng = np.random.default_rng(0)
+        labels = (rng.random(50_000) < 0.01).astype(np.float32)
+        probs = np.clip(rng.normal(0.2 + 0.5 * labels, 0.15), 0, 1).astype(np.float32)
+
+        acc = StreamingAUC()
+        for start in range(0, len(labels), 512):
+            acc.update(torch.from_numpy(probs[start:start + 512]), torch.from_numpy(labels[start:start + 512]))
+        self.assertAlmostEqual(acc.compute(), roc_auc_score(labels, probs), delta=1e-3)
+
+    def test_reset(self):
+        acc = StreamingAUC()
+        acc.update(torch.tensor([0.9, 0.1]), torch.tensor([1.0, 0.0]))
+        self.assertAlmostEqual(acc.compute(), 1.0)
+        acc.reset()
+        self.assertTrue(np.isnan(acc.compute()))
+
+
+if __name__ == "__main__":
+    unittest.main()
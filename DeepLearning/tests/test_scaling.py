@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scaling import AffineScaler
+
+
+class TestAffineScalerParity(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X_train = rng.normal(loc=5.0, scale=[1.0] * 29 + [250.0], size=(2000, 30))
+        self.X_new = rng.normal(loc=5.0, scale=[1.0] * 29 + [250.0], size=(128, 30))
+        self.sk = StandardScaler().fit(self.X_train)
+
+    def test_matches_sklearn_transform(self):
+        affine = AffineScaler.from_sklearn(self.sk)
+        got = affine.transform(self.X_new.astype(np.float32))
+        self.assertEqual(got.dtype, np.float32)
+        np.testing.assert_allclose(got, self.sk.transform(self.X_new), rtol=1e-5, atol=1e-5)
+
+    def test_npz_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scaler.npz")
+            AffineScaler.from_sklearn(self.sk).save(path)
+            affine = AffineScaler.load(path)
+        np.testing.assert_array_equal(affine.mean_, self.sk.mean_)
+        np.testing.assert_array_equal(affine.scale_, self.sk.scale_)
+        buf = self.X_new.astype(np.float32)
+        affine.transform(buf, out=buf)
+        np.testing.assert_allclose(buf, self.sk.transform(self.X_new), rtol=1e-5, atol=1e-5)
+
+    def test_partial_fit_matches_refit_on_all_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scaler.npz")
+            AffineScaler.from_sklearn(self.sk).save(path)
+            affine = AffineScaler.load(path).partial_fit(self.X_new)
+        full = StandardScaler().fit(np.vstack([self.X_train, self.X_new]))
+        self.assertEqual(affine.n_samples_seen, len(self.X_train) + len(self.X_new))
+        np.testing.assert_allclose(affine.mean_, full.mean_, rtol=1e-10)
+        np.testing.assert_allclose(affine.scale_, full.scale_, rtol=1e-10)
+
+    def test_load_new_data_does_not_write_scaler(self):
+        import pandas as pd
+        from unittest import mock
+        import data_loader
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scaler.npz")
+            AffineScaler.from_sklearn(self.sk).save(path)
+            with open(path, "rb") as f:
+                before = f.read()
+            csv = os.path.join(tmp, "new.csv")
+            df = pd.DataFrame(self.X_new, columns=[f"f{i}" for i in range(30)])
+            df["Class"] = np.arange(len(df)) % 2
+            df.to_csv(csv, index=False)
+
+            with mock.patch.object(data_loader, "SCALER_PATH", path):
+                *_, scaler = data_loader.load_new_data(csv)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), before)  # saved by the caller after the model
+        self.assertEqual(scaler.n_samples_seen, len(self.X_train) + len(self.X_new))
+
+    def test_load_data_returns_scaler_without_saving(self):
+        import pandas as pd
+        from unittest import mock
+        import data_loader
+
+        with tempfile.TemporaryDirectory() as tmp:
+            df = pd.DataFrame(self.X_train, columns=[f"f{i}" for i in range(30)])
+            df["Class"] = np.arange(len(df)) % 2
+            df.to_csv(os.path.join(tmp, "creditcard.csv"), index=False)
+            with mock.patch.object(data_loader, "data_dir", tmp), \
+                    mock.patch.object(AffineScaler, "save") as save:
+                train_ds, _, _, _, scaler = data_loader.load_data(use_cache=False)
+        save.assert_not_called()
+        self.assertEqual(scaler.n_samples_seen, len(train_ds))
+
+
+if __name__ == "__main__":
+    unittest.main()
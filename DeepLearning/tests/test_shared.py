@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import torch
+from tensorboard.backend.event_processing.event_accumulator import EventAccumulator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared import FRAUD_API_DIR
+
+
+class TestSharedModules(unittest.TestCase):
+    """
+    The implementations are tested in fraud_api/tests; these check that the
+    stubs here resolve to them and work as DeepLearning uses them.
+    """
+
+    def test_metrics_sink(self):
+        import metrics_sink
+        from metrics_sink import MetricsSink
+
+        self.assertEqual(os.path.dirname(metrics_sink.__file__), FRAUD_API_DIR)
+        with tempfile.TemporaryDirectory() as tmp:
+            with MetricsSink(tmp, flush_secs=60) as sink:
+                sink.update("loss", torch.tensor(2.0), run="train")
+                sink.update("loss", torch.tensor(4.0), run="train")
+                sink.log_mean("loss", 0, run="train")
+            train = EventAccumulator(os.path.join(tmp, "train")).Reload()
+            self.assertEqual([e.value for e in train.Scalars("loss")], [3.0])
+
+    def test_thresholds(self):
+        import numpy as np
+        import thresholds
+        from thresholds import ThresholdTable
+
+        self.assertEqual(os.path.dirname(thresholds.__file__), FRAUD_API_DIR)
+        y = np.array([0, 0, 0, 1, 1])
+        table = ThresholdTable.from_scores(y, [0.1, 0.2, 0.6, 0.7, 0.9], n_bins=10)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "operating_points.json")
+            table.save(path)
+            self.assertEqual(ThresholdTable.load(path).optimal_threshold(), table.optimal_threshold())
+
+    def test_csv_cache(self):
+        import pandas as pd
+        import csv_cache
+        from csv_cache import read_csv_cached
+
+        self.assertEqual(os.path.dirname(csv_cache.__file__), os.path.join(FRAUD_API_DIR, "loaders"))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "creditcard.csv")
+            pd.DataFrame({"Time": [0.0, 1.0], "Amount": [5.0, 7.5], "Class": [0, 1]}).to_csv(path, index=False)
+            for _ in range(2):  # build, then memory-mapped read
+                df = read_csv_cached(path, cache_dir=os.path.join(tmp, ".cache"))
+                self.assertEqual(df["Amount"].tolist(), [5.0, 7.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
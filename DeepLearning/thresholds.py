@@ -0,0 +1,7 @@
+"""
+Operating-point tables. The implementation is shared with fraud_api: see
+fraud_api/thresholds.py.
+"""
+from shared import use_shared
+
+use_shared(__name__, "thresholds.py")
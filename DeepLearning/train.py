@@ -1,31 +1,37 @@
-from pandas._libs.tslibs.offsets import YearBegin
-from scipy import test
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import  DataLoader
-from data_loader import load_data
+import argparse
+from data_loader import load_data, load_new_data
 from sklearn.metrics import roc_auc_score
 from model import FraudNet
-import torch.utils.tensorboard as tb
 import datetime
+import time
 from model import save_model
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix
+from metrics import StreamingAUC
+from metrics_sink import MetricsSink
+from thresholds import ThresholdTable
+from batching import make_loader
 import numpy as np
 
+# Plotting libraries are imported on first use, not at training startup
 def plotLossCurve(train_losses, val_losses):
+    import matplotlib.pyplot as plt
     plt.figure()
     plt.plot(train_losses, label="train")
     plt.plot(val_losses, label="val")
     plt.xlabel("Epoch"); plt.ylabel("Loss"); plt.legend(); plt.title("Loss")
     plt.savefig("plots/losscurve.png", bbox_inches="tight"); plt.close()
 
-def confusion_matrix_visual(y_pred_probs, y_test):
+def confusion_matrix_visual(y_pred_probs, y_test, threshold=0.5):
+    import os
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.metrics import confusion_matrix
+
     y_pred_probs = np.asarray(y_pred_probs, dtype=np.float32)
     y_test = np.asarray(y_test)
-    y_pred_labels = (y_pred_probs >= 0.5).astype(int)  # Convert probabilities to class labels
+    y_pred_labels = (y_pred_probs >= threshold).astype(int)  # Convert probabilities to class labels
     cm = confusion_matrix(y_test, y_pred_labels)
 
     plt.figure(figsize=(6,5))
@@ -33,70 +39,215 @@ def confusion_matrix_visual(y_pred_probs, y_test):
     plt.xlabel("Predicted")
     plt.ylabel("Actual")
     plt.title("Confusion Matrix")
+    os.makedirs("plots", exist_ok=True)
     plt.savefig("plots/confusionmatrix.png", bbox_inches="tight"); plt.close()
 
+def default_device():
+    return torch.device('cuda') if torch.cuda.is_available() else torch.device('cpu')
+
 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 LOG_DIR = f"./logs/run_{timestamp}"
 
 # ------------------------
 # Training function
 # ------------------------
-def train_model(model, train_loader, test_loader, y_test, epochs=10, lr=1e-3):
-    from os import path
-    device = torch.device('cuda') if torch.cuda.is_available() else torch.device('cpu')
+def make_forward_loss(model, device, fast=False, compile_model=False):
+    """
+    Return fn(xb, yb) -> (probabilities, loss) for one batch.
+
+    The default is the original formulation: sigmoid output + BCELoss in
+    fp32. fast=True trains on logits with BCEWithLogitsLoss (numerically
+    stable) under bf16 autocast; compile_model=True (fast only) also wraps
+    it in torch.compile. That covers forward + loss and, through AOTAutograd,
+    their backward; optimizer.step() stays eager. Measure first: for an MLP
+    this small the compiled version can be slower on CPU. The model's
+    forward() still returns probabilities, so saved weights and inference
+    are unchanged.
+    """
+    if compile_model and not fast:
+        raise ValueError("compile_model requires fast=True")
+    if not fast:
+        criterion = nn.BCELoss()
+
+        def forward_loss(xb, yb):
+            probs = model(xb).squeeze(1)
+            return probs, criterion(probs, yb)
+        return forward_loss
+
+    criterion = nn.BCEWithLogitsLoss()
+
+    def forward_loss(xb, yb):
+        with torch.autocast(device_type=device.type, dtype=torch.bfloat16):
+            logits = model.forward_logits(xb).squeeze(1)
+        logits = logits.float()  # loss and probabilities in fp32
+        return torch.sigmoid(logits), criterion(logits, yb)
+
+    if compile_model:
+        forward_loss = torch.compile(forward_loss)
+    return forward_loss
+
+
+def train_model(model, train_loader, test_loader, y_test, epochs=10, lr=1e-3, streaming_auc=False,
+                fast=False, compile_model=False, log_flush_secs=10.0, operating_points_path=None):
+    """
+    Train `model`, logging loss/AUC per epoch to TensorBoard. Returns a list
+    of per-epoch {"epoch", "epoch_time", "auc"} dicts.
+
+    Predictions, labels and loss sums stay on the device for the whole epoch
+    and are copied to the host once for the AUC. With streaming_auc=True a
+    binned StreamingAUC is accumulated instead, so no per-sample buffers are
+    kept at all. fast/compile_model select the training formulation, see
+    make_forward_loss().
+
+    TensorBoard events go through a MetricsSink, written and flushed by a
+    background thread every `log_flush_secs`.
+
+    After the last epoch, a precision/recall/cost table over thresholds is
+    built from the validation predictions (saved to operating_points_path if
+    given) and the confusion matrix is drawn at its cost-optimal threshold.
+    """
+    device = default_device()
     model = model.to(device)
 
-    train_logger = tb.SummaryWriter(path.join(LOG_DIR, 'train'), flush_secs=1)
-    test_logger = tb.SummaryWriter(path.join(LOG_DIR, 'test'), flush_secs=1)
+    sink = MetricsSink(LOG_DIR, flush_secs=log_flush_secs)
 
-    criterion = nn.BCELoss()
+    forward_loss = make_forward_loss(model, device, fast=fast, compile_model=compile_model)
     optimizer = optim.Adam(model.parameters(), lr=lr)
-    train_loss = []
-    test_loss = []
 
+    n_train, n_test = len(train_loader.dataset), len(test_loader.dataset)
+    if streaming_auc:
+        train_auc_acc = StreamingAUC(device=device)
+        test_auc_acc = StreamingAUC(device=device)
+    else:
+        train_preds = torch.empty(n_train, device=device)
+        train_labels = torch.empty(n_train, device=device)
+    # Validation predictions are always kept: the confusion matrix needs them
+    y_pred = torch.empty(n_test, device=device)
+
+    history = []
+    train_start = time.perf_counter()
     for epoch in range(epochs):
+        t0 = time.perf_counter()
         model.train()
-        train_preds = []
-        train_labels = []
+        offset = 0
+        if streaming_auc:
+            train_auc_acc.reset()
         for xb, yb in train_loader:
-            preds = model(xb).squeeze()
-            loss = criterion(preds, yb)
-            train_loss.append(loss.item())
+            # No-op when the loader already yields device tensors
+            xb = xb.to(device, non_blocking=True)
+            yb = yb.to(device, non_blocking=True)
+            preds, loss = forward_loss(xb, yb)
             optimizer.zero_grad()
             loss.backward()
             optimizer.step()
-            train_preds.extend(preds.detach().numpy())
-            train_labels.extend(yb.numpy())
-        train_logger.add_scalar("loss", sum(train_loss)/len(train_loss), global_step=epoch)
-        train_auc = roc_auc_score(train_labels, train_preds)
-        train_logger.add_scalar("auc", train_auc, global_step=epoch)  
+
+            n = yb.shape[0]
+            # Running mean over all steps so far, kept on the device
+            sink.update("loss", loss.detach(), run="train")
+            if streaming_auc:
+                train_auc_acc.update(preds, yb)
+            else:
+                train_preds[offset:offset + n] = preds.detach()
+                train_labels[offset:offset + n] = yb
+            offset += n
+        sink.log_mean("loss", epoch, run="train")
+        if streaming_auc:
+            train_auc = train_auc_acc.compute()
+        else:
+            train_auc = roc_auc_score(train_labels[:offset].cpu().numpy(), train_preds[:offset].cpu().numpy())
+        sink.add_scalar("auc", train_auc, epoch, run="train")
         # Validation AUC
         model.eval()
+        offset = 0
+        if streaming_auc:
+            test_auc_acc.reset()
         with torch.no_grad():
-            y_pred = []
             for xb, yb in test_loader:
-                preds=model(xb).squeeze()
-                y_pred.extend(model(xb).squeeze().numpy())
-                loss = criterion(preds, yb)
-                test_loss.append(loss.item())
-                
-        auc = roc_auc_score(y_test, y_pred)
-        if epoch==8:
-            confusion_matrix_visual(y_pred, y_test)
-        test_logger.add_scalar("auc", auc, global_step=epoch)
-        test_logger.add_scalar("loss", sum(test_loss)/len(test_loss), global_step=epoch)
-        
+                xb = xb.to(device, non_blocking=True)
+                yb = yb.to(device, non_blocking=True)
+                preds, loss = forward_loss(xb, yb)
+                n = yb.shape[0]
+                y_pred[offset:offset + n] = preds
+                offset += n
+                sink.update("loss", loss, run="test")
+                if streaming_auc:
+                    test_auc_acc.update(preds, yb)
+
+        if streaming_auc:
+            auc = test_auc_acc.compute()
+        else:
+            auc = roc_auc_score(y_test, y_pred.cpu().numpy())
+        sink.add_scalar("auc", auc, epoch, run="test")
+        sink.log_mean("loss", epoch, run="test")
+
+        history.append({"epoch": epoch + 1, "epoch_time": time.perf_counter() - t0, "auc": auc})
         print(f"Epoch {epoch+1}/{epochs} - Test AUC: {auc:.4f}")
+
+    sink.close()
+    total = time.perf_counter() - train_start
+
+    y_pred_np = y_pred.cpu().numpy()
+    table = ThresholdTable.from_scores(y_test, y_pred_np)
+    threshold = table.optimal_threshold()
+    if operating_points_path:
+        table.save(operating_points_path)
+    confusion_matrix_visual(y_pred_np, y_test, threshold)
+    print(f"Cost-optimal threshold: {threshold:.3f}")
+    print(f"Metrics logging: {sink.stats()['enqueue_s'] / total:.3%} of training time "
+          f"({sink.events} events)")
+    return history
     
 
 def main():
-    train_ds, test_ds, input_dim, y_test = load_data()
-    train_loader = DataLoader(train_ds, batch_size=512, shuffle=True)
-    test_loader = DataLoader(test_ds, batch_size=512, shuffle=False)
+    parser = argparse.ArgumentParser(description="Train FraudNet")
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--num-workers", type=int, default=0,
+                        help="DataLoader worker processes (0 = in-process index-permutation batches)")
+    parser.add_argument("--prefetch-factor", type=int, default=2, help="batches prefetched per worker")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--fast", action="store_true",
+                        help="logits + BCEWithLogitsLoss under bf16 autocast")
+    parser.add_argument("--compile", action="store_true",
+                        help="with --fast, also torch.compile forward + loss (Adam step stays eager)")
+    parser.add_argument("--log-flush-secs", type=float, default=10.0,
+                        help="TensorBoard flush interval of the background metrics writer")
+    parser.add_argument("--eda", action="store_true",
+                        help="also draw the EDA plots (skipped if the dataset is unchanged)")
+    parser.add_argument("--incremental", metavar="NEW_CSV",
+                        help="fine-tune FraudNet.pth on this batch of new transactions only")
+    args = parser.parse_args()
+    if args.compile and not args.fast:
+        parser.error("--compile requires --fast")
+
+    # Either way the scaler is saved only after the model it belongs to
+    if args.incremental:
+        # Only the new rows are touched
+        train_ds, test_ds, input_dim, y_test, scaler = load_new_data(args.incremental)
+    else:
+        train_ds, test_ds, input_dim, y_test, scaler = load_data(eda=args.eda)
+    # The zero-worker path keeps the whole (small) dataset on the training device
+    device = default_device() if args.num_workers == 0 else None
+    loader_kwargs = dict(batch_size=args.batch_size, num_workers=args.num_workers,
+                         prefetch_factor=args.prefetch_factor, device=device)
+    train_loader = make_loader(train_ds, shuffle=True, **loader_kwargs)
+    test_loader = make_loader(test_ds, shuffle=False, **loader_kwargs)
 
-    model = FraudNet(input_dim)
-    train_model(model, train_loader, test_loader, y_test, epochs=10, lr=1e-3)
+    if args.incremental:
+        from os import path
+        from inference import load_model_for_inference
+        pth = path.join(path.dirname(path.abspath(__file__)), "FraudNet.pth")
+        model = load_model_for_inference(pth, input_dim)  # train_model switches it back to train()
+    else:
+        model = FraudNet(input_dim)
+    from inference import OPERATING_POINTS_PATH
+    # An incremental batch's validation slice has too few frauds to re-pick
+    # the threshold, so only a full run rewrites operating_points.json
+    train_model(model, train_loader, test_loader, y_test, epochs=args.epochs, lr=args.lr,
+                fast=args.fast, compile_model=args.compile, log_flush_secs=args.log_flush_secs,
+                operating_points_path=None if args.incremental else OPERATING_POINTS_PATH)
     save_model(model)
+    scaler.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from executor import QueueFull
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row requests and scores them in one model pass.
+
+    A background thread blocks on the first queued request, then keeps
+    collecting until either `max_batch_size` rows are waiting or `max_wait_us`
+    microseconds have passed since that first row. The batch is handed to
+    `predict_fn` (list of rows -> list of probabilities) and every caller's
+    Future is resolved with its own result. A row may be submitted with its
+    own predict_fn (e.g. a specific model version's predict_batch); rows
+    with different functions are scored in separate passes. With
+    `max_queue` > 0, submit() raises QueueFull once that many rows are
+    already waiting.
+
+    With an `executor` (InferenceExecutor), passes run on its pool instead of
+    the batcher thread, so they share its worker and torch-thread budget; a
+    pass the executor rejects fails its rows with QueueFull.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_us: int = 2000,
+                 max_queue: int = 0, executor=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_wait_us < 0:
+            raise ValueError("max_wait_us must be >= 0")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_us = max_wait_us
+        self.max_queue = max_queue
+        self.executor = executor
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._running = False
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)  # wake the worker
+        self._thread.join(timeout)
+        self._thread = None
+
+    # -----------------------------
+    # Client side
+    # -----------------------------
+    def submit(self, row, predict_fn=None) -> Future:
+        """
+        Queue one row for scoring with `predict_fn` (default: the batcher's).
+        Returns a Future resolving to its probability.
+        """
+        if not self._running:
+            raise RuntimeError("MicroBatcher is not running")
+        if self.max_queue and self._queue.qsize() >= self.max_queue:
+            raise QueueFull("micro-batch queue is full")
+        fut = Future()
+        self._queue.put((row, fut, predict_fn or self.predict_fn))
+        return fut
+
+    def stats(self) -> dict:
+        """
+        Batch-size distribution observed since start (or last reset).
+        """
+        with self._stats_lock:
+            sizes = dict(sorted(self._batch_sizes.items()))
+        n_batches = sum(sizes.values())
+        n_requests = sum(size * count for size, count in sizes.items())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_us": self.max_wait_us,
+            "queued": self._queue.qsize(),
+            "batches": n_batches,
+            "requests": n_requests,
+            "mean_batch_size": (n_requests / n_batches) if n_batches else 0.0,
+            "batch_size_histogram": sizes,
+        }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._batch_sizes.clear()
+
+    # -----------------------------
+    # Worker side
+    # -----------------------------
+    def _collect(self):
+        item = self._queue.get()
+        if item is None:
+            return []
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait_us / 1e6
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+    @staticmethod
+    def _resolve(futures, compute):
+        try:
+            probs = compute()
+        except Exception as exc:
+            for fut in futures:
+                fut.set_exception(exc)
+        else:
+            for fut, prob in zip(futures, probs):
+                fut.set_result(float(prob))
+
+    def _dispatch(self, predict_fn, items):
+        rows = [row for row, _ in items]
+        futures = [fut for _, fut in items]
+        if self.executor is None:
+            self._resolve(futures, lambda: predict_fn(rows))
+            return
+        try:
+            pass_fut = self.executor.submit(predict_fn, rows)
+        except QueueFull as exc:
+            for fut in futures:
+                fut.set_exception(exc)
+            return
+        # Not waited on: the next window is collected while this pass runs
+        pass_fut.add_done_callback(lambda f: self._resolve(futures, f.result))
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+            groups = {}
+            for row, fut, predict_fn in batch:
+                groups.setdefault(predict_fn, []).append((row, fut))
+            for predict_fn, items in groups.items():
+                self._dispatch(predict_fn, items)
+                with self._stats_lock:
+                    self._batch_sizes[len(items)] += 1
+
+        # Fail anything still queued so callers don't hang on shutdown
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("MicroBatcher stopped"))
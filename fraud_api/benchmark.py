@@ -0,0 +1,419 @@
+"""
+Micro-benchmarks for the fraud_api serving path.
+
+Run from the fraud_api directory after training (needs models/):
+
+    python benchmark.py latency --iters 2000
+    python benchmark.py scaler
+    python benchmark.py startup
+    python benchmark.py backends           # after export_model.py
+    python benchmark.py quantize           # fp32 vs int8 on the held-out split
+    python benchmark.py cache --csv data/creditcard.csv
+    python benchmark.py load --dataset paysim   # peak RSS, default vs compact loading
+    python benchmark.py swap --swaps 10         # request latency while model versions hot-swap
+    python benchmark.py shadow --challenger-dir ../DeepLearning   # request latency with shadow scoring
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import joblib
+import numpy as np
+import pandas as pd
+
+
+def _sample_transactions(feature_names, n, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(n, len(feature_names)))
+    return [dict(zip(feature_names, row.tolist())) for row in values]
+
+
+def _percentiles(samples_s):
+    us = np.asarray(samples_s) * 1e6
+    return {
+        "mean_us": float(us.mean()),
+        "p50_us": float(np.percentile(us, 50)),
+        "p99_us": float(np.percentile(us, 99)),
+    }
+
+
+def _time_calls(fn, args_list):
+    samples = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(args)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _print_row(label, stats):
+    print(f"{label:<28} mean={stats['mean_us']:9.1f}us  p50={stats['p50_us']:9.1f}us  p99={stats['p99_us']:9.1f}us")
+
+
+# -----------------------------
+# latency: DataFrame path vs preallocated float32 path
+# -----------------------------
+def bench_latency(args):
+    from inference import ModelRegistry
+
+    # Eager TabNet backend: the DataFrame baseline needs the classifier itself
+    registry = ModelRegistry(backend="tabnet").load()
+    feature_names = registry.feature_names
+    scaler = joblib.load(registry.scaler_path)  # sklearn scaler for the baseline
+    clf = registry.clf
+    txs = _sample_transactions(feature_names, args.iters)
+
+    # Original implementation, kept here as the baseline
+    def pandas_features(tx):
+        df = pd.DataFrame([tx])
+        df = df[feature_names]
+        return scaler.transform(df.values)
+
+    def pandas_predict(tx):
+        return float(clf.predict_proba(pandas_features(tx))[:, 1][0])
+
+    def buffer_features(tx):
+        X = registry._single_buffer()
+        X[0] = registry._row_values(tx)
+        return registry.scaler.transform(X, out=X)
+
+    # Warm up both paths (allocator, torch kernels)
+    for tx in txs[:50]:
+        pandas_predict(tx)
+        registry.predict_single(tx)
+
+    print(f"{args.iters} single-row requests, {len(feature_names)} features")
+    _print_row("features: DataFrame", _percentiles(_time_calls(pandas_features, txs)))
+    _print_row("features: float32 buffer", _percentiles(_time_calls(buffer_features, txs)))
+    _print_row("predict: DataFrame", _percentiles(_time_calls(pandas_predict, txs)))
+    _print_row("predict: float32 buffer", _percentiles(_time_calls(registry.predict_single, txs)))
+
+
+# -----------------------------
+# scaler: sklearn transform vs folded affine transform
+# -----------------------------
+def bench_scaler(args):
+    from scaling import AffineScaler
+
+    sk_scaler = joblib.load(args.scaler)
+    affine = AffineScaler.from_sklearn(sk_scaler)
+    rng = np.random.default_rng(0)
+
+    for rows in (1, 1024):
+        X = rng.normal(size=(rows, affine.n_features)).astype(np.float32)
+        buf = np.empty_like(X)
+        calls = [X] * args.iters
+
+        def affine_inplace(x):
+            np.copyto(buf, x)
+            return affine.transform(buf, out=buf)
+
+        print(f"{rows} row(s), {args.iters} calls")
+        _print_row("  sklearn transform", _percentiles(_time_calls(sk_scaler.transform, calls)))
+        _print_row("  affine in place", _percentiles(_time_calls(affine_inplace, calls)))
+
+
+# -----------------------------
+# startup: cold-start time to first successful prediction
+# -----------------------------
+_STARTUP_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+import inference
+t_import = time.perf_counter()
+inference.registry.load()
+t_load = time.perf_counter()
+tx = dict.fromkeys(inference.registry.feature_names, 0.0)
+inference.predict_single(tx)
+t_first = time.perf_counter()
+print(json.dumps({
+    "import_s": t_import - t0,
+    "load_s": t_load - t_import,
+    "first_prediction_s": t_first - t_load,
+    "total_s": t_first - t0,
+}))
+"""
+
+
+def bench_startup(args):
+    runs = []
+    for _ in range(args.runs):
+        # Fresh interpreter each run so nothing is cached in-process
+        out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT],
+                             check=True, capture_output=True, text=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(f"{args.runs} cold starts (median)")
+    for key in ("import_s", "load_s", "first_prediction_s", "total_s"):
+        print(f"  {key:<20} {np.median([r[key] for r in runs]):.3f}s")
+
+
+# -----------------------------
+# backends: eager TabNet vs exported TorchScript / ONNX
+# -----------------------------
+def bench_backends(args):
+    from inference import ModelRegistry
+
+    registries = {b: ModelRegistry(backend=b).load() for b in args.backends}
+    n_features = next(iter(registries.values())).n_features
+    rng = np.random.default_rng(0)
+    X_big = rng.normal(size=(1024, n_features)).astype(np.float32)
+    X_one = np.ascontiguousarray(X_big[:1])
+
+    reference = None
+    for name, reg in registries.items():
+        reg.warmup()
+        probs = reg.predict_proba(X_big)
+        if reference is None:
+            reference = probs
+        max_diff = float(np.max(np.abs(probs - reference)))
+
+        single = _percentiles(_time_calls(reg.predict_proba, [X_one] * args.iters))
+        batch_s = _time_calls(reg.predict_proba, [X_big] * max(1, args.iters // 20))
+        rows_per_s = X_big.shape[0] / np.median(batch_s)
+
+        print(f"[{name}] max |diff| vs {args.backends[0]}: {max_diff:.2e}")
+        _print_row("  1 row", single)
+        print(f"  1024 rows: p50={np.median(batch_s) * 1e3:.2f}ms  throughput={rows_per_s:,.0f} rows/s")
+
+
+# -----------------------------
+# quantize: fp32 vs dynamic int8 TabNet (AUC delta + throughput)
+# -----------------------------
+def bench_quantize(args):
+    from sklearn.metrics import roc_auc_score
+    from inference import ModelRegistry
+    from train_tabnet import load_scaled_data
+
+    # The split (and scaling) train_tabnet.py trains with, so X_test is held out
+    _, X_test, _, y_test, _, _ = load_scaled_data(dataset=args.dataset)
+    X = np.ascontiguousarray(X_test, dtype=np.float32)
+    results = {}
+    for name, quantize in (("fp32", False), ("int8", True)):
+        reg = ModelRegistry(backend="tabnet", quantize=quantize).load()
+        probs = reg.predict_proba(X)
+        batches = [X[i:i + 1024] for i in range(0, min(len(X), 1024 * args.batches), 1024)]
+        t0 = time.perf_counter()
+        for xb in batches:
+            reg.predict_proba(xb)
+        rps = sum(len(xb) for xb in batches) / (time.perf_counter() - t0)
+        results[name] = (roc_auc_score(y_test, probs), rps)
+
+    print(f"held-out split: {len(y_test)} rows ({args.dataset})")
+    for name, (auc, rps) in results.items():
+        print(f"  {name}: AUC={auc:.5f}  throughput={rps:,.0f} rows/s")
+    print(f"  AUC delta (int8 - fp32): {results['int8'][0] - results['fp32'][0]:+.5f}")
+    print(f"  speedup: {results['int8'][1] / results['fp32'][1]:.2f}x")
+
+
+# -----------------------------
+# cache: pd.read_csv vs columnar cache (cold build / warm mmap)
+# -----------------------------
+def bench_cache(args):
+    import shutil
+    import tempfile
+    from loaders.csv_cache import read_csv_cached
+
+    cache_dir = tempfile.mkdtemp(prefix="csv_cache_bench_")
+    try:
+        t0 = time.perf_counter()
+        baseline = pd.read_csv(args.csv)
+        t_csv = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        read_csv_cached(args.csv, cache_dir=cache_dir)
+        t_cold = time.perf_counter() - t0
+
+        warm, touched = [], []
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            df = read_csv_cached(args.csv, cache_dir=cache_dir)
+            warm.append(time.perf_counter() - t0)
+            df.select_dtypes("number").to_numpy(dtype=np.float32)  # touch every page
+            touched.append(time.perf_counter() - t0)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{args.csv}: {len(baseline):,} rows x {baseline.shape[1]} columns")
+    print(f"  pd.read_csv:               {t_csv:8.3f}s")
+    print(f"  cold (parse + build cache): {t_cold:8.3f}s")
+    print(f"  warm (mmap):               {np.median(warm):8.3f}s")
+    print(f"  warm + read all columns:   {np.median(touched):8.3f}s")
+
+
+# -----------------------------
+# load: peak RSS of load_fraud_data, default vs compact (dtype schema)
+# -----------------------------
+_LOAD_SCRIPT = """
+import json, resource, sys, time
+from loaders.kaggle_loader import load_fraud_data
+t0 = time.perf_counter()
+load_fraud_data(dataset=sys.argv[1], balance_data=sys.argv[2] == "1", compact=sys.argv[3] == "1")
+print(json.dumps({
+    "seconds": time.perf_counter() - t0,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def bench_load(args):
+    print(f"load_fraud_data({args.dataset!r}, balance_data={args.balance})")
+    for compact in (False, True):
+        # Separate interpreter per mode: ru_maxrss is a process-lifetime peak
+        out = subprocess.run(
+            [sys.executable, "-c", _LOAD_SCRIPT, args.dataset, str(int(args.balance)), str(int(compact))],
+            check=True, capture_output=True, text=True,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        label = "compact" if compact else "default"
+        print(f"  {label:<8} peak RSS={r['peak_rss_mb']:9.1f} MB  time={r['seconds']:.2f}s")
+
+
+# -----------------------------
+# swap: request latency with and without concurrent model hot-swaps
+# -----------------------------
+def bench_swap(args):
+    import tempfile
+    import threading
+    import model_store
+    from executor import lower_thread_priority
+    from inference import ModelManager
+
+    with tempfile.TemporaryDirectory() as root:
+        for v in ("a", "b"):
+            model_store.publish("models", root, version=v, activate_version=v == "a")
+        manager = ModelManager(root=root)
+        manager.active.warmup()
+        txs = _sample_transactions(manager.active.feature_names, 256)
+
+        def serve(stop=None, iters=None):
+            samples, versions = [], set()
+            i = 0
+            while (i < iters) if stop is None else not stop():
+                reg = manager.active
+                t0 = time.perf_counter()
+                reg.predict_single(txs[i % len(txs)])
+                samples.append(time.perf_counter() - t0)
+                versions.add(reg.version)
+                i += 1
+            return samples, versions
+
+        baseline, _ = serve(iters=args.iters)
+
+        done = threading.Event()
+
+        def swapper():
+            lower_thread_priority(args.nice)
+            for k in range(args.swaps):
+                manager.swap_to("b" if k % 2 == 0 else "a")
+            done.set()
+
+        t0 = time.perf_counter()
+        threading.Thread(target=swapper, daemon=True).start()
+        during, versions = serve(stop=done.is_set)
+        elapsed = time.perf_counter() - t0
+
+    print(f"{args.swaps} swaps in {elapsed:.2f}s ({elapsed / args.swaps * 1e3:.0f} ms per load+warmup), "
+          f"versions served: {sorted(versions)}")
+    _print_row("no swap", _percentiles(baseline))
+    _print_row("during swaps", _percentiles(during))
+
+
+# -----------------------------
+# shadow: primary request latency with and without shadow scoring
+# -----------------------------
+def bench_shadow(args):
+    import os
+    import tempfile
+    from inference import FraudNetRegistry, ModelRegistry
+    from shadow import ShadowScorer, model_name
+
+    primary = ModelRegistry().warmup()
+    challenger = FraudNetRegistry(args.challenger_dir).warmup()
+    txs = _sample_transactions(primary.feature_names, 256)
+    name = model_name(primary)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer = ShadowScorer(lambda: {"primary": primary, "challenger": challenger},
+                              os.path.join(tmp, "shadow.csv"), nice=args.nice).start()
+
+        def serve(with_shadow):
+            samples = []
+            for i in range(args.iters):
+                tx = txs[i % len(txs)]
+                t0 = time.perf_counter()
+                prob = primary.predict_single(tx)
+                if with_shadow:
+                    scorer.submit(tx, "primary", prob, name)
+                samples.append(time.perf_counter() - t0)
+            return samples
+
+        # Interleave rounds so drift on a shared machine hits both equally
+        off, on = [], []
+        for _ in range(args.rounds):
+            off += serve(False)
+            on += serve(True)
+        scorer.stop()
+        stats = scorer.stats()
+
+    print(f"shadow: {stats['scored']} scored, {stats['dropped']} dropped, {stats['errors']} errors")
+    _print_row("primary only", _percentiles(off))
+    _print_row("primary + shadow", _percentiles(on))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fraud_api micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("latency", help="per-request latency, DataFrame vs float32 buffer")
+    p.add_argument("--iters", type=int, default=2000)
+    p.set_defaults(func=bench_latency)
+
+    p = sub.add_parser("scaler", help="sklearn StandardScaler vs AffineScaler")
+    p.add_argument("--scaler", default="models/scaler.pkl")
+    p.add_argument("--iters", type=int, default=5000)
+    p.set_defaults(func=bench_scaler)
+
+    p = sub.add_parser("startup", help="cold start to first successful prediction")
+    p.add_argument("--runs", type=int, default=5)
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("backends", help="latency/throughput of eager vs exported backends")
+    p.add_argument("--backends", nargs="+", default=["tabnet", "torchscript", "onnx"])
+    p.add_argument("--iters", type=int, default=1000)
+    p.set_defaults(func=bench_backends)
+
+    p = sub.add_parser("quantize", help="fp32 vs int8 AUC delta and throughput")
+    p.add_argument("--dataset", default="creditcard")
+    p.add_argument("--batches", type=int, default=50, help="1024-row batches timed for throughput")
+    p.set_defaults(func=bench_quantize)
+
+    p = sub.add_parser("cache", help="cold vs warm load of the columnar CSV cache")
+    p.add_argument("--csv", default="data/creditcard.csv")
+    p.add_argument("--repeats", type=int, default=5)
+    p.set_defaults(func=bench_cache)
+
+    p = sub.add_parser("load", help="peak RSS of default vs compact dataset loading")
+    p.add_argument("--dataset", default="paysim")
+    p.add_argument("--balance", action="store_true")
+    p.set_defaults(func=bench_load)
+
+    p = sub.add_parser("swap", help="request latency while model versions hot-swap")
+    p.add_argument("--swaps", type=int, default=10)
+    p.add_argument("--iters", type=int, default=2000, help="requests timed without swapping")
+    p.add_argument("--nice", type=int, default=10, help="niceness of the loading thread (0 = none)")
+    p.set_defaults(func=bench_swap)
+
+    p = sub.add_parser("shadow", help="primary latency with and without shadow scoring")
+    p.add_argument("--challenger-dir", default="../DeepLearning", help="FraudNet.pt + scaler.npz")
+    p.add_argument("--iters", type=int, default=1000, help="requests per round")
+    p.add_argument("--rounds", type=int, default=5)
+    p.add_argument("--nice", type=int, default=10, help="niceness of the shadow thread (0 = none)")
+    p.set_defaults(func=bench_shadow)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
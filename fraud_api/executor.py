@@ -0,0 +1,100 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFull(Exception):
+    """Raised when inference work is rejected to apply backpressure."""
+
+
+def configure_torch_threads(num_threads: int):
+    """
+    Pin torch intra-op threads so workers x threads does not exceed the cores.
+    """
+    import torch
+
+    torch.set_num_threads(num_threads)
+    try:
+        # Requests already run concurrently on the pool; inter-op parallelism
+        # only adds more threads. Can only be set before torch starts it.
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+def default_torch_threads(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def lower_thread_priority(nice: int):
+    """
+    Renice the calling thread (on Linux, niceness is per thread) so that
+    background work only gets CPU that request handling leaves idle.
+    """
+    if nice <= 0:
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+    except (AttributeError, OSError):
+        pass
+
+
+class InferenceExecutor:
+    """
+    Dedicated, bounded thread pool for model forward passes.
+
+    At most `workers` passes run at once and at most `max_queue` more may
+    wait. Anything beyond that is rejected immediately with QueueFull rather
+    than piling up behind the model.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def submit(self, fn, *args):
+        """
+        Submit fn(*args) to the pool. Returns a concurrent.futures.Future.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull("inference queue is full")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            fut = self._pool.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        fut.add_done_callback(lambda _: self._release())
+        return fut
+
+    async def run(self, fn, *args):
+        """
+        Await fn(*args) on the pool without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - self.workers),
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
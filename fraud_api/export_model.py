@@ -0,0 +1,129 @@
+"""
+Export the trained TabNet model to TorchScript and/or ONNX.
+
+Artifacts are written next to the .zip so the API can serve them with
+FRAUD_API_BACKEND=torchscript or FRAUD_API_BACKEND=onnx:
+
+    python export_model.py                 # both formats
+    python export_model.py --format onnx
+"""
+import argparse
+import copy
+import torch
+from pytorch_tabnet import sparsemax
+from pytorch_tabnet.tab_network import GBN
+from pytorch_tabnet.tab_model import TabNetClassifier
+from inference import MODEL_PATH, exported_path
+
+
+class TraceableEntmax15(torch.nn.Module):
+    """
+    Forward-only entmax15 without the autograd.Function wrapper, which
+    TorchScript and ONNX cannot serialize. Same math as Entmax15Function.
+    """
+
+    def __init__(self, dim=-1):
+        super().__init__()
+        self.dim = dim
+
+    def forward(self, x):
+        max_val, _ = x.max(dim=self.dim, keepdim=True)
+        x = (x - max_val) / 2
+        tau_star, _ = sparsemax.Entmax15Function._threshold_and_support(x, self.dim)
+        return torch.clamp(x - tau_star, min=0) ** 2
+
+
+class TraceableSparsemax(torch.nn.Module):
+    """
+    Forward-only sparsemax, same math as SparsemaxFunction.
+    """
+
+    def __init__(self, dim=-1):
+        super().__init__()
+        self.dim = dim
+
+    def forward(self, x):
+        max_val, _ = x.max(dim=self.dim, keepdim=True)
+        x = x - max_val
+        tau, _ = sparsemax.SparsemaxFunction._threshold_and_support(x, dim=self.dim)
+        return torch.clamp(x - tau, min=0)
+
+
+def _make_traceable(network: torch.nn.Module) -> torch.nn.Module:
+    """
+    Copy of the network with its attention selectors swapped for traceable
+    ones. Ghost batch norm is replaced by its inner BatchNorm1d: in eval mode
+    splitting the batch into virtual batches changes nothing, and the
+    data-dependent split does not export.
+    """
+    network = copy.deepcopy(network)
+    for parent in list(network.modules()):
+        for name, child in parent.named_children():
+            if isinstance(child, GBN):
+                setattr(parent, name, child.bn)
+            elif isinstance(child, sparsemax.Entmax15):
+                setattr(parent, name, TraceableEntmax15(child.dim))
+            elif isinstance(child, sparsemax.Sparsemax):
+                setattr(parent, name, TraceableSparsemax(child.dim))
+    return network
+
+
+class TabNetProba(torch.nn.Module):
+    """
+    TabNet network followed by softmax, returning P(fraud) per row.
+    """
+
+    def __init__(self, network):
+        super().__init__()
+        self.network = network
+
+    def forward(self, x):
+        out, _ = self.network(x)  # (logits, mask loss)
+        return torch.softmax(out, dim=1)[:, 1]
+
+
+def _proba_module(clf: TabNetClassifier) -> TabNetProba:
+    module = TabNetProba(_make_traceable(clf.network)).cpu().eval()
+    for p in module.parameters():
+        p.requires_grad_(False)
+    return module
+
+
+def export_torchscript(clf: TabNetClassifier, path: str) -> str:
+    module = _proba_module(clf)
+    example = torch.zeros(1, clf.network.input_dim)
+    with torch.no_grad():
+        traced = torch.jit.trace(module, example)
+    traced.save(path)
+    return path
+
+
+def export_onnx(clf: TabNetClassifier, path: str, opset: int = 18) -> str:
+    module = _proba_module(clf)
+    example = torch.zeros(1, clf.network.input_dim)
+    torch.onnx.export(
+        module, example, path,
+        input_names=["features"], output_names=["fraud_probability"],
+        dynamic_axes={"features": {0: "batch"}, "fraud_probability": {0: "batch"}},
+        opset_version=opset,
+    )
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export TabNet to TorchScript / ONNX")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--format", choices=["torchscript", "onnx", "both"], default="both")
+    args = parser.parse_args()
+
+    clf = TabNetClassifier(device_name="cpu")
+    clf.load_model(args.model)
+
+    if args.format in ("torchscript", "both"):
+        print(f"TorchScript -> {export_torchscript(clf, exported_path(args.model, 'torchscript'))}")
+    if args.format in ("onnx", "both"):
+        print(f"ONNX        -> {export_onnx(clf, exported_path(args.model, 'onnx'))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,112 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+import os
+import random
+from fastapi import FastAPI, Header, HTTPException, Response
 from pydantic import BaseModel
-from typing import List
-from inference import predict_single, predict_batch
+from typing import List, Optional
+import model_store
+from inference import predict_batch, manager, challenger, WATCH_SECS, RELOAD_NICE
+from batcher import MicroBatcher
+from executor import InferenceExecutor, QueueFull, configure_torch_threads, default_torch_threads
+from shadow import ShadowScorer, model_name
+
+# Load and warm up the model in the background at startup. When disabled the
+# model is loaded lazily by the first prediction.
+WARMUP_ON_STARTUP = os.getenv("FRAUD_API_WARMUP", "1") == "1"
+
+# -----------------------------
+# Inference pool config
+# -----------------------------
+# Forward passes run on a dedicated pool of INFERENCE_WORKERS threads, each
+# torch op using TORCH_THREADS intra-op threads (default: cores / workers).
+# Up to MAX_QUEUE requests may wait; beyond that the API answers 503.
+# Micro-batched passes run on the same pool, so batching adds no threads.
+INFERENCE_WORKERS = int(os.getenv("FRAUD_API_INFERENCE_WORKERS", "2"))
+MAX_QUEUE = int(os.getenv("FRAUD_API_MAX_QUEUE", "64"))
+TORCH_THREADS = int(os.getenv("FRAUD_API_TORCH_THREADS", "0")) or default_torch_threads(INFERENCE_WORKERS)
+
+# -----------------------------
+# Micro-batching config
+# -----------------------------
+# When enabled, concurrent /predict_one calls are coalesced into a single
+# predict_proba pass of up to BATCH_MAX_SIZE rows, waiting at most
+# BATCH_MAX_WAIT_US microseconds for the batch to fill.
+BATCHING_ENABLED = os.getenv("FRAUD_API_BATCHING", "0") == "1"
+BATCH_MAX_SIZE = int(os.getenv("FRAUD_API_BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_US = int(os.getenv("FRAUD_API_BATCH_MAX_WAIT_US", "2000"))
+
+# -----------------------------
+# Challenger / shadow config
+# -----------------------------
+# With a challenger loaded (FRAUD_API_CHALLENGER_DIR, see inference.py),
+# CHALLENGER_FRACTION of /predict_one and /decide requests are answered by it
+# instead of the primary (A/B). SHADOW_FRACTION of those requests are also
+# scored by the other model on a background thread, and both scores are
+# appended to SHADOW_LOG. The response never waits for the shadow score.
+CHALLENGER_FRACTION = float(os.getenv("FRAUD_API_CHALLENGER_FRACTION", "0"))
+SHADOW_FRACTION = float(os.getenv("FRAUD_API_SHADOW_FRACTION", "0"))
+SHADOW_LOG = os.getenv("FRAUD_API_SHADOW_LOG", "logs/shadow_scores.csv")
+
+# -----------------------------
+# Model admin
+# -----------------------------
+# /admin/* requires a matching X-Admin-Token header, and is disabled (404)
+# while no token is configured
+ADMIN_TOKEN = os.getenv("FRAUD_API_ADMIN_TOKEN")
 
 # -----------------------------
 # FastAPI app
 # -----------------------------
 app = FastAPI(title="Fraud Detection API")
 
+executor = InferenceExecutor(INFERENCE_WORKERS, MAX_QUEUE)
+batcher = (
+    MicroBatcher(predict_batch, BATCH_MAX_SIZE, BATCH_MAX_WAIT_US, max_queue=MAX_QUEUE, executor=executor)
+    if BATCHING_ENABLED else None
+)
+shadow = (
+    ShadowScorer(lambda: {"primary": manager.active, "challenger": challenger}, SHADOW_LOG, nice=RELOAD_NICE)
+    if challenger is not None and SHADOW_FRACTION > 0 else None
+)
+
+
+def _warmup():
+    try:
+        manager.active.warmup()
+        if challenger is not None:
+            challenger.warmup()
+    except Exception as exc:
+        print(f"Model warm-up failed: {exc!r}")
+
+
+@app.on_event("startup")
+def start_inference():
+    configure_torch_threads(TORCH_THREADS)
+    if batcher is not None:
+        batcher.start()
+    if shadow is not None:
+        shadow.start()
+    if WARMUP_ON_STARTUP:
+        # /readyz reports 200 once this finishes; the server accepts traffic meanwhile
+        executor.submit(_warmup)
+    if WATCH_SECS > 0:
+        manager.watch(WATCH_SECS)
+
+
+@app.on_event("shutdown")
+def stop_inference():
+    manager.stop()
+    if batcher is not None:
+        batcher.stop()
+    if shadow is not None:
+        shadow.stop()
+    executor.shutdown()
+
+
+def _overloaded():
+    return HTTPException(status_code=503, detail="Inference queue is full", headers={"Retry-After": "1"})
+
 # -----------------------------
 # Request schemas
 # -----------------------------
@@ -46,21 +145,138 @@ class Transaction(BaseModel):
 class TransactionsBatch(BaseModel):
     transactions: List[Transaction]
 
+class ReloadRequest(BaseModel):
+    version: Optional[str] = None
+
 # -----------------------------
 # Endpoints
 # -----------------------------
+async def _score_one(tx: Transaction):
+    """
+    Score with the primary or, for CHALLENGER_FRACTION of requests, the
+    challenger. Returns the probability and the registry that produced it.
+    """
+    use_challenger = challenger is not None and random.random() < CHALLENGER_FRACTION
+    # Pinned for the whole request: a hot swap meanwhile doesn't change which
+    # model scores it, nor the threshold/version reported with the score
+    reg = challenger if use_challenger else manager.active
+    try:
+        if batcher is not None:
+            prob = await asyncio.wrap_future(batcher.submit(tx, reg.predict_batch))
+        else:
+            prob = await executor.run(reg.predict_single, tx)
+    except QueueFull:
+        raise _overloaded()
+    if shadow is not None and random.random() < SHADOW_FRACTION:
+        shadow.submit(tx, "challenger" if use_challenger else "primary", prob, model_name(reg))
+    return prob, reg
+
+
 @app.post("/predict_one")
-def predict_one(tx: Transaction):
-    prob = predict_single(tx.dict())
+async def predict_one(tx: Transaction):
+    prob, _ = await _score_one(tx)
     return {"fraud_probability": prob}
 
 
+@app.post("/decide")
+async def decide(tx: Transaction):
+    """
+    Score one transaction and apply the cost-optimal threshold chosen at
+    model load (see /operating_point).
+    """
+    prob, reg = await _score_one(tx)
+    return {"fraud_probability": prob, "action": reg.decide(prob), "threshold": reg.decision_threshold,
+            "model": reg.family, "model_version": reg.version}
+
+
 @app.post("/predict_batch")
-def predict_many(batch: TransactionsBatch):
-    probs = predict_batch([t.dict() for t in batch.transactions])
+async def predict_many(batch: TransactionsBatch):
+    try:
+        probs = await executor.run(predict_batch, batch.transactions)
+    except QueueFull:
+        raise _overloaded()
     return {"fraud_probabilities": probs}
 
 
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz(response: Response):
+    reg = manager.active
+    # Without warm-up on startup the first request loads the models, so the
+    # pod must take traffic before they are loaded
+    ready = not WARMUP_ON_STARTUP or (reg.ready and (challenger is None or challenger.ready))
+    if not ready:
+        response.status_code = 503
+    return {"ready": ready, "loaded": reg.loaded, "model_version": reg.version}
+
+
+@app.get("/operating_point")
+async def operating_point():
+    """
+    The decision threshold in use and its precision/recall/cost on the
+    held-out split (null if training wrote no operating-point table).
+    """
+    reg = manager.active
+    return {"threshold": reg.decision_threshold, "operating_point": reg.operating_point}
+
+
+def _check_admin(token):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled (set FRAUD_API_ADMIN_TOKEN)")
+    if token is None or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/admin/reload", status_code=202)
+async def admin_reload(req: ReloadRequest = None, x_admin_token: Optional[str] = Header(None)):
+    """
+    Load a model version (default: the one named in models/CURRENT) in the
+    background, warm it up and swap it in. Requests keep being served by the
+    current version until then; poll /admin/model for progress.
+    """
+    _check_admin(x_admin_token)
+    version = req.version if req is not None else None
+    if version is not None and version not in model_store.list_versions(manager.root):
+        raise HTTPException(status_code=404, detail=f"Unknown model version '{version}'")
+    if version is None and model_store.current_version(manager.root) is None:
+        raise HTTPException(status_code=409, detail="No models/CURRENT to reload; publish a version first")
+    manager.reload_async(version)
+    return {"loading": version or model_store.current_version(manager.root),
+            "serving": manager.active.version}
+
+
+@app.get("/admin/model")
+async def admin_model(x_admin_token: Optional[str] = Header(None)):
+    _check_admin(x_admin_token)
+    return manager.status()
+
+
+@app.get("/batch_stats")
+async def batch_stats():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+
+@app.get("/shadow_stats")
+async def shadow_stats():
+    return {
+        "challenger": challenger.family if challenger is not None else None,
+        "challenger_fraction": CHALLENGER_FRACTION if challenger is not None else 0.0,
+        "shadow_fraction": SHADOW_FRACTION if shadow is not None else 0.0,
+        **(shadow.stats() if shadow is not None else {}),
+    }
+
+
+@app.get("/executor_stats")
+async def executor_stats():
+    return {"torch_threads": TORCH_THREADS, **executor.stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
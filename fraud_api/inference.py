@@ -1,38 +1,424 @@
-import pandas as pd
-import joblib
-from pytorch_tabnet.tab_model import TabNetClassifier
+from operator import attrgetter, itemgetter
+import os
+import threading
+import numpy as np
+import model_store
+from executor import lower_thread_priority
 
 # -----------------------------
-# Load artifacts once at import
+# Artifact paths
 # -----------------------------
+# Flat layout written by train_tabnet.py. When models/CURRENT exists the
+# version it names under models/versions/ is served instead (model_store.py).
+MODELS_DIR = model_store.MODELS_DIR
 MODEL_PATH = "models/best_tabnet_model.zip"
 SCALER_PATH = "models/scaler.pkl"
 FEATURE_NAMES_PATH = "models/feature_names.pkl"
+OPERATING_POINTS_PATH = "models/operating_points.json"
 
-clf = TabNetClassifier()
-clf.load_model(MODEL_PATH)
+# "tabnet" serves the .zip eagerly; "torchscript" / "onnx" serve the graph
+# written next to it by export_model.py.
+BACKEND = os.getenv("FRAUD_API_BACKEND", "tabnet")
+BACKENDS = ("tabnet", "torchscript", "onnx")
 
-scaler = joblib.load(SCALER_PATH)
-feature_names = joblib.load(FEATURE_NAMES_PATH)
+# Dynamic int8 quantization of TabNet's Linear layers (tabnet backend, CPU only)
+QUANTIZE = os.getenv("FRAUD_API_QUANTIZE", "0") == "1"
+
+# -----------------------------
+# Decision config (/decide)
+# -----------------------------
+# The cost-optimal threshold is picked once per model load from the
+# operating-point table written by training. Costs default to the ones the
+# table was built with; without a table DEFAULT_THRESHOLD is used.
+COST_FP = float(os.getenv("FRAUD_API_COST_FP")) if os.getenv("FRAUD_API_COST_FP") else None
+COST_FN = float(os.getenv("FRAUD_API_COST_FN")) if os.getenv("FRAUD_API_COST_FN") else None
+DEFAULT_THRESHOLD = float(os.getenv("FRAUD_API_THRESHOLD", "0.5"))
+
+# Poll models/CURRENT every WATCH_SECS seconds and hot-swap on change (0 = off)
+WATCH_SECS = float(os.getenv("FRAUD_API_WATCH_SECS", "0"))
+# Niceness of the background reload thread, so loading a new version takes
+# CPU from request handling only when it is idle (Linux; 0 = same priority)
+RELOAD_NICE = int(os.getenv("FRAUD_API_RELOAD_NICE", "10"))
+
+# -----------------------------
+# Challenger model (A/B and shadow scoring, see fraud_api.py)
+# -----------------------------
+# Directory holding a FraudNet from the DeepLearning project: FraudNet.pt
+# (its export.py), scaler.npz and optionally operating_points.json.
+CHALLENGER_DIR = os.getenv("FRAUD_API_CHALLENGER_DIR")
+FRAUDNET_MODEL_FILE = "FraudNet.pt"
+FRAUDNET_SCALER_FILE = "scaler.npz"
+# DeepLearning trains on creditcard.csv without Class, in file order
+CREDITCARD_FEATURES = ["Time"] + [f"V{i}" for i in range(1, 29)] + ["Amount"]
+
+
+def exported_path(model_path: str, backend: str) -> str:
+    """
+    models/best_tabnet_model.zip -> models/best_tabnet_model.{ts,onnx}
+    """
+    base, _ = os.path.splitext(model_path)
+    return f"{base}.{'ts' if backend == 'torchscript' else backend}"
+
+
+class ModelRegistry:
+    """
+    Owns the TabNet model, scaler and feature order.
+
+    Nothing is imported or read from disk until load() is called, either
+    explicitly (e.g. at API startup) or lazily by the first prediction.
+    warmup() runs a synthetic batch so the first real request doesn't pay for
+    kernel/allocator initialization. `ready` is True once loaded.
+
+    The API serves every model through this interface; subclasses (e.g.
+    FraudNetRegistry) override the _load_* hooks.
+    """
+
+    family = "tabnet"
+
+    def __init__(self, model_path: str = MODEL_PATH, scaler_path: str = SCALER_PATH,
+                 feature_names_path: str = FEATURE_NAMES_PATH, backend: str = BACKEND,
+                 quantize: bool = QUANTIZE, operating_points_path: str = OPERATING_POINTS_PATH,
+                 version: str = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose one of {BACKENDS}.")
+        if quantize and backend != "tabnet":
+            raise ValueError("quantize is only supported with the 'tabnet' backend")
+        self.backend = backend
+        self.quantize = quantize
+        self.version = version  # model_store version name, None for the flat layout
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.feature_names_path = feature_names_path
+        self.operating_points_path = operating_points_path
+
+        self.clf = None           # TabNetClassifier (tabnet backend only)
+        self.torch_module = None  # underlying torch module, if any
+        self._predict = None      # float32 (n, n_features) -> P(fraud) (n,)
+        self.scaler = None
+        self.feature_names = None
+        self.n_features = 0
+        self.operating_points = None  # ThresholdTable, if training wrote one
+        self.operating_point = None   # its row at decision_threshold
+        self.decision_threshold = DEFAULT_THRESHOLD
+        self.ready = False
+
+        self._load_lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def loaded(self) -> bool:
+        return self._predict is not None
+
+    def load(self):
+        """
+        Load all artifacts. Safe to call repeatedly and from several threads.
+        """
+        if self.loaded:
+            return self
+        with self._load_lock:
+            if self.loaded:
+                return self
+            feature_names = self._load_feature_names()
+            scaler = self._load_scaler()
+            predict = self._load_backend()
+            self._load_operating_points()
+
+            # Getters return field values already in `feature_names` order, so
+            # a request goes straight into a float32 buffer without a DataFrame
+            # or column reindex. Dicts use item lookup, pydantic models attributes.
+            self._item_getter = itemgetter(*feature_names)
+            self._attr_getter = attrgetter(*feature_names)
+            self.feature_names = feature_names
+            self.n_features = len(feature_names)
+            self.scaler = scaler
+            self._predict = predict  # set last: marks the registry as loaded
+            # A loaded model can serve; warmup() only saves the first request
+            # the kernel/allocator setup. Lazy loading relies on this.
+            self.ready = True
+        return self
+
+    # Heavy imports deferred until a model is actually needed
+    def _load_feature_names(self) -> list:
+        import joblib
+
+        return joblib.load(self.feature_names_path)
+
+    def _load_scaler(self):
+        from scaling import AffineScaler
+
+        # StandardScaler folded into a float32 affine transform
+        return AffineScaler.load(self.scaler_path)
+
+    def _load_torchscript(self, path: str):
+        import torch
+
+        module = torch.jit.load(path, map_location="cpu").eval()
+        module = torch.jit.optimize_for_inference(torch.jit.freeze(module))
+        self.torch_module = module
+
+        def predict(X):
+            with torch.inference_mode():
+                return module(torch.from_numpy(X)).numpy()
+        return predict
+
+    def _load_backend(self):
+        if self.backend == "tabnet":
+            from pytorch_tabnet.tab_model import TabNetClassifier
+
+            clf = TabNetClassifier()
+            clf.load_model(self.model_path)
+            if self.quantize:
+                import torch
+
+                clf.device = "cpu"
+                clf.network = torch.ao.quantization.quantize_dynamic(
+                    clf.network.cpu().eval(), {torch.nn.Linear}, dtype=torch.qint8
+                )
+            self.clf = clf
+            self.torch_module = clf.network
+            return lambda X: clf.predict_proba(X)[:, 1]
+
+        path = exported_path(self.model_path, self.backend)
+        if self.backend == "torchscript":
+            return self._load_torchscript(path)
+
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = int(os.getenv("FRAUD_API_TORCH_THREADS", "0"))
+        if threads:
+            opts.intra_op_num_threads = threads
+        session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        return lambda X: session.run(None, {"features": X})[0]
+
+    def _load_operating_points(self):
+        if not os.path.exists(self.operating_points_path):
+            return
+        from thresholds import ThresholdTable
+
+        table = ThresholdTable.load(self.operating_points_path)
+        k = table.optimal_index(COST_FP, COST_FN)
+        self.operating_points = table
+        self.operating_point = table.row(k, COST_FP, COST_FN)
+        self.decision_threshold = float(table.threshold[k])
+
+    def decide(self, prob: float) -> str:
+        """
+        Action for a fraud probability at the precomputed threshold.
+        """
+        return "flag" if prob >= self.decision_threshold else "approve"
+
+    def warmup(self, rows: int = 8):
+        """
+        Load (if needed) and score a synthetic batch.
+        """
+        self.load()
+        X = np.zeros((rows, self.n_features), dtype=np.float32)
+        self._predict(X)
+        self._predict(X[:1])
+        return self
+
+    # -----------------------------
+    # Feature extraction
+    # -----------------------------
+    def _row_values(self, transaction):
+        getter = self._item_getter if isinstance(transaction, dict) else self._attr_getter
+        return getter(transaction)
+
+    def _single_buffer(self) -> np.ndarray:
+        # One preallocated (1, n_features) buffer per serving thread
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = np.empty((1, self.n_features), dtype=np.float32)
+        return buf
+
+    def to_features(self, transactions, out: np.ndarray = None) -> np.ndarray:
+        """
+        Write transactions (dicts or Transaction models) into a float32
+        (n, n_features) array in `feature_names` order.
+        """
+        self.load()
+        if out is None:
+            out = np.empty((len(transactions), self.n_features), dtype=np.float32)
+        for i, tx in enumerate(transactions):
+            out[i] = self._row_values(tx)
+        return out
+
+    # -----------------------------
+    # Prediction
+    # -----------------------------
+    def predict_single(self, transaction) -> float:
+        self.load()
+        X = self._single_buffer()
+        X[0] = self._row_values(transaction)
+        X_scaled = self.scaler.transform(X, out=X)
+        return float(self._predict(X_scaled)[0])
+
+    def predict_batch(self, transactions: list) -> list[float]:
+        X = self.to_features(transactions)
+        X_scaled = self.scaler.transform(X, out=X)
+        return self._predict(X_scaled).tolist()
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Score an already scaled float32 (n, n_features) array.
+        """
+        self.load()
+        return self._predict(X)
+
+
+class FraudNetRegistry(ModelRegistry):
+    """
+    FraudNet (DeepLearning/) behind the ModelRegistry interface.
+
+    Serves the TorchScript export, so no DeepLearning code is imported.
+    The scaler is the mean/scale pair in scaler.npz and the feature order is
+    the creditcard.csv column order FraudNet was trained on.
+    """
+
+    family = "fraudnet"
+
+    def __init__(self, model_dir: str, version: str = None):
+        super().__init__(
+            model_path=os.path.join(model_dir, FRAUDNET_MODEL_FILE),
+            scaler_path=os.path.join(model_dir, FRAUDNET_SCALER_FILE),
+            feature_names_path=None, backend="torchscript", quantize=False,
+            operating_points_path=os.path.join(model_dir, model_store.OPERATING_POINTS_FILE),
+            version=version,
+        )
+
+    def _load_feature_names(self) -> list:
+        return list(CREDITCARD_FEATURES)
+
+    def _load_scaler(self):
+        from scaling import AffineScaler
+
+        with np.load(self.scaler_path) as f:
+            return AffineScaler(f["mean"], f["scale"])
+
+    def _load_backend(self):
+        predict = self._load_torchscript(self.model_path)
+        # FraudNet outputs (n, 1) probabilities
+        return lambda X: predict(X).reshape(-1)
+
+
+class ModelManager:
+    """
+    Serves one ModelRegistry at a time and hot-swaps model versions.
+
+    swap_to() builds a registry for the new version, loads and warms it up
+    on the calling (background) thread while `active` keeps serving, then
+    replaces `active` with a single reference assignment. Requests that
+    already hold the old registry finish on it; it is freed once they are
+    done. Only one swap runs at a time. Background reloads run at
+    RELOAD_NICE so they don't compete with requests for the CPU.
+    """
+
+    def __init__(self, root: str = MODELS_DIR, backend: str = BACKEND, quantize: bool = QUANTIZE):
+        self.root = root
+        self.backend = backend
+        self.quantize = quantize
+        self.active = self._make(model_store.current_version(root))
+        self.loading = None      # version currently being loaded, if any
+        self.last_error = None
+        self.swaps = 0
+        self._swap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def _make(self, version) -> ModelRegistry:
+        return ModelRegistry(**model_store.artifact_paths(version, self.root), backend=self.backend,
+                             quantize=self.quantize, version=version)
+
+    def swap_to(self, version: str = None) -> ModelRegistry:
+        """
+        Load, warm up and activate `version` (default: models/CURRENT).
+        Blocks until done; the previous version keeps serving meanwhile.
+        """
+        with self._swap_lock:
+            version = version or model_store.current_version(self.root)
+            if version == self.active.version and self.active.ready:
+                return self.active
+            self.loading = version
+            try:
+                new = self._make(version).warmup()
+            except Exception as exc:
+                self.last_error = repr(exc)
+                raise
+            finally:
+                self.loading = None
+            self.active = new  # atomic: new requests see the new version from here on
+            self.swaps += 1
+            self.last_error = None
+            print(f"Serving model version {version}")
+            return new
+
+    def reload_async(self, version: str = None) -> threading.Thread:
+        def run():
+            lower_thread_priority(RELOAD_NICE)
+            try:
+                self.swap_to(version)
+            except Exception as exc:
+                print(f"Model reload failed, still serving {self.active.version}: {exc!r}")
+        t = threading.Thread(target=run, name="model-reload", daemon=True)
+        t.start()
+        return t
+
+    def watch(self, interval: float = WATCH_SECS):
+        """
+        Poll models/CURRENT every `interval` seconds and swap when the
+        version it names changes.
+        """
+        def run():
+            lower_thread_priority(RELOAD_NICE)
+            path = model_store.current_path(self.root)
+            last = None
+            while not self._stop.wait(interval):
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                if mtime == last:
+                    continue
+                last = mtime
+                if model_store.current_version(self.root) != self.active.version:
+                    try:
+                        self.swap_to()
+                    except Exception as exc:
+                        print(f"Model reload failed, still serving {self.active.version}: {exc!r}")
+        self._watcher = threading.Thread(target=run, name="model-watch", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        return {
+            "version": self.active.version,
+            "ready": self.active.ready,
+            "loading": self.loading,
+            "swaps": self.swaps,
+            "last_error": self.last_error,
+            "available": model_store.list_versions(self.root),
+        }
+
+
+# Model manager used by the API; `registry` is the registry it started with
+manager = ModelManager()
+registry = manager.active
+challenger = FraudNetRegistry(CHALLENGER_DIR) if CHALLENGER_DIR else None
 
 
-def predict_single(transaction: dict) -> float:
+def predict_single(transaction) -> float:
     """
-    Predict fraud probability for a single transaction (dict input).
+    Predict fraud probability for a single transaction (dict or Transaction).
     """
-    df = pd.DataFrame([transaction])
-    df = df[feature_names]  # enforce correct column order
-    X_scaled = scaler.transform(df.values)
-    prob = clf.predict_proba(X_scaled)[:, 1][0]
-    return float(prob)
+    return manager.active.predict_single(transaction)
 
 
-def predict_batch(transactions: list[dict]) -> list[float]:
+def predict_batch(transactions: list) -> list[float]:
     """
-    Predict fraud probability for multiple transactions (list of dicts).
+    Predict fraud probability for multiple transactions (dicts or Transactions).
     """
-    df = pd.DataFrame(transactions)
-    df = df[feature_names]  # enforce correct column order
-    X_scaled = scaler.transform(df.values)
-    probs = clf.predict_proba(X_scaled)[:, 1]
-    return probs.tolist()
+    return manager.active.predict_batch(transactions)
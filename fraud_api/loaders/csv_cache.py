@@ -0,0 +1,133 @@
+"""
+Binary columnar cache for large CSV datasets.
+
+The first load parses the CSV once and writes every column as its own
+.npy file. String columns are stored as categorical codes plus a category
+list. Later loads memory-map those files, so no parsing happens and pages
+are only read when touched.
+
+Cache entries are keyed by the CSV's content hash and the requested dtype
+schema and column subset. Editing the file or changing dtypes builds a fresh entry. The hash
+itself is remembered per (size, mtime), so an unchanged file is not
+re-hashed on every run.
+
+DeepLearning uses this module too (loaded by path, see DeepLearning/shared.py).
+"""
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 2
+
+
+def file_digest(path: str, chunk_size: int = 1 << 22) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _default_cache_dir(path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path)), ".cache")
+
+
+def cached_digest(path: str, cache_dir: str = None) -> str:
+    """
+    Content hash of `path`, reusing the last one if size and mtime match.
+    The hash is remembered in cache_dir (default: .cache next to the file),
+    the same place read_csv_cached() keeps it.
+    """
+    cache_dir = cache_dir or _default_cache_dir(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    st = os.stat(path)
+    stamp_path = os.path.join(cache_dir, os.path.basename(path) + ".digest.json")
+    stamp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if os.path.exists(stamp_path):
+        with open(stamp_path) as f:
+            saved = json.load(f)
+        if all(saved.get(k) == v for k, v in stamp.items()):
+            return saved["digest"]
+    stamp["digest"] = file_digest(path)
+    with open(stamp_path, "w") as f:
+        json.dump(stamp, f)
+    return stamp["digest"]
+
+
+def _dtype_key(dtype) -> str:
+    # str() of every CategoricalDtype is just "category"; the categories decide the codes
+    if isinstance(dtype, pd.CategoricalDtype) and dtype.categories is not None:
+        return f"category{dtype.categories.tolist()}"
+    return str(dtype)
+
+
+def _schema_key(dtypes: dict, usecols: list = None) -> str:
+    schema = {"v": CACHE_FORMAT_VERSION, "dtypes": {k: _dtype_key(v) for k, v in sorted((dtypes or {}).items())}}
+    if usecols is not None:
+        schema["usecols"] = sorted(usecols)
+    schema = json.dumps(schema)
+    return hashlib.blake2b(schema.encode(), digest_size=8).hexdigest()
+
+
+def _write_entry(df: pd.DataFrame, entry_dir: str):
+    tmp_dir = entry_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    columns = []
+    for i, name in enumerate(df.columns):
+        col = df[name]
+        meta = {"name": name, "file": f"{i}.npy"}
+        # pandas >= 3 parses CSV strings as the `str` dtype, older versions as object
+        if (isinstance(col.dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(col.dtype)
+                or pd.api.types.is_string_dtype(col.dtype)):
+            cat = col.astype("category")
+            meta["categories"] = cat.cat.categories.tolist()
+            values = cat.cat.codes.to_numpy()
+        else:
+            values = col.to_numpy()
+        np.save(os.path.join(tmp_dir, meta["file"]), values)
+        columns.append(meta)
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump({"version": CACHE_FORMAT_VERSION, "rows": len(df), "columns": columns}, f)
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(tmp_dir, entry_dir)
+
+
+def _read_entry(entry_dir: str) -> pd.DataFrame:
+    with open(os.path.join(entry_dir, "meta.json")) as f:
+        meta = json.load(f)
+    data = {}
+    for col in meta["columns"]:
+        # Copy-on-write mapping: reads come straight from the page cache,
+        # accidental writes stay private instead of touching the cache file
+        values = np.load(os.path.join(entry_dir, col["file"]), mmap_mode="c")
+        if "categories" in col:
+            values = pd.Categorical.from_codes(values, categories=col["categories"])
+        data[col["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def read_csv_cached(path: str, cache_dir: str = None, dtypes: dict = None, usecols: list = None) -> pd.DataFrame:
+    """
+    pd.read_csv(path, dtype=dtypes, usecols=usecols) backed by the columnar
+    cache. Columns outside `usecols` are never parsed or cached.
+
+    Column names are stripped of surrounding whitespace before caching.
+    """
+    cache_dir = cache_dir or _default_cache_dir(path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    entry_dir = os.path.join(cache_dir, f"{stem}-{cached_digest(path, cache_dir)}-{_schema_key(dtypes, usecols)}")
+    if os.path.exists(os.path.join(entry_dir, "meta.json")):
+        return _read_entry(entry_dir)
+
+    print(f"Building columnar cache for {path} ...")
+    keep = None if usecols is None else set(usecols)
+    df = pd.read_csv(path, dtype=dtypes, usecols=None if keep is None else (lambda c: c.strip() in keep))
+    df.columns = df.columns.str.strip()
+    _write_entry(df, entry_dir)
+    return _read_entry(entry_dir)
@@ -0,0 +1,139 @@
+"""
+Local, content-addressed store for the Kaggle datasets.
+
+data_dir/manifest.json records, for each dataset, the file that was
+downloaded together with its size, mtime and content hash. A dataset is
+only (re)downloaded when its file is missing or no longer matches the
+manifest. Offline mode (FRAUD_DATA_OFFLINE=1) never touches the network and
+fails fast instead.
+"""
+import datetime
+import json
+import os
+from loaders.csv_cache import file_digest
+
+MANIFEST_NAME = "manifest.json"
+
+DATASETS = {
+    "creditcard": {
+        "kaggle_ref": "mlg-ulb/creditcardfraud",
+        "file": "creditcard.csv",
+        "target_col": "Class",
+        "title": "Credit Card Fraud",
+    },
+    "paysim": {
+        "kaggle_ref": "ealaxi/paysim1",
+        "file": "PS_20174392719_1491204439457_log.csv",
+        "target_col": "isFraud",
+        "title": "PaySim",
+    },
+}
+
+
+def _manifest_path(data_dir: str) -> str:
+    return os.path.join(data_dir, MANIFEST_NAME)
+
+
+def read_manifest(data_dir: str) -> dict:
+    path = _manifest_path(data_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(data_dir: str, manifest: dict):
+    path = _manifest_path(data_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _record(data_dir: str, dataset: str, file_path: str, source: str) -> dict:
+    st = os.stat(file_path)
+    entry = {
+        "file": os.path.basename(file_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "digest": file_digest(file_path),
+        "source": source,
+        "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    manifest = read_manifest(data_dir)
+    manifest[dataset] = entry
+    _write_manifest(data_dir, manifest)
+    return entry
+
+
+def is_valid(data_dir: str, dataset: str, verify_hash: bool = False) -> bool:
+    """
+    True if the dataset file exists and matches its manifest entry.
+
+    Size and mtime are compared by default. With verify_hash the content
+    hash is recomputed as well, which catches in-place corruption. A file
+    whose mtime changed but whose hash still matches (copied, touched) gets
+    its new mtime recorded, so the next check is a stat again.
+    """
+    manifest = read_manifest(data_dir)
+    entry = manifest.get(dataset)
+    if entry is None:
+        return False
+    file_path = os.path.join(data_dir, entry["file"])
+    if not os.path.exists(file_path):
+        return False
+    st = os.stat(file_path)
+    if st.st_size != entry["size"]:
+        return False
+    if verify_hash or st.st_mtime_ns != entry["mtime_ns"]:
+        if file_digest(file_path) != entry["digest"]:
+            return False
+        if st.st_mtime_ns != entry["mtime_ns"]:
+            entry["mtime_ns"] = st.st_mtime_ns
+            _write_manifest(data_dir, manifest)
+    return True
+
+
+def _download(dataset: str, data_dir: str):
+    # Imported here: importing kaggle authenticates, which needs credentials
+    from kaggle.api.kaggle_api_extended import KaggleApi
+
+    spec = DATASETS[dataset]
+    api = KaggleApi()
+    api.authenticate()
+    print(f"Downloading {spec['title']} dataset...")
+    api.dataset_download_files(spec["kaggle_ref"], path=data_dir, unzip=True)
+
+
+def ensure_dataset(dataset: str, data_dir: str = "data", offline: bool = None,
+                   refresh: bool = False, verify_hash: bool = False) -> str:
+    """
+    Return the local path of `dataset`, downloading it only if needed.
+
+    A file that is present but not yet in the manifest (e.g. copied in by
+    hand on an air-gapped machine) is trusted and recorded on first use.
+    """
+    if dataset not in DATASETS:
+        raise ValueError("Dataset not supported. Choose 'creditcard' or 'paysim'.")
+    if offline is None:
+        offline = os.getenv("FRAUD_DATA_OFFLINE", "0") == "1"
+
+    os.makedirs(data_dir, exist_ok=True)
+    file_path = os.path.join(data_dir, DATASETS[dataset]["file"])
+    entry = read_manifest(data_dir).get(dataset)
+
+    if not refresh:
+        if entry is not None and is_valid(data_dir, dataset, verify_hash=verify_hash):
+            return file_path
+        if entry is None and os.path.exists(file_path):
+            _record(data_dir, dataset, file_path, source="local")
+            return file_path
+
+    if offline:
+        raise FileNotFoundError(
+            f"{file_path} is missing or does not match {_manifest_path(data_dir)} and offline "
+            f"mode is on. Copy the '{DATASETS[dataset]['kaggle_ref']}' dataset into {data_dir}/."
+        )
+    _download(dataset, data_dir)
+    _record(data_dir, dataset, file_path, source=f"kaggle:{DATASETS[dataset]['kaggle_ref']}")
+    return file_path
@@ -1,47 +1,175 @@
 import os
+import numpy as np
 import pandas as pd
-from kaggle.api.kaggle_api_extended import KaggleApi
 from sklearn.model_selection import train_test_split
+from loaders.csv_cache import read_csv_cached
+from loaders.dataset_store import DATASETS, ensure_dataset
+from loaders.sampling import balance_indices, stratified_split_indices
+
+# -----------------------------
+# dtype schemas for compact loading
+# -----------------------------
+# float32 numerics, smallest int for labels/counters, categories for
+# low-cardinality strings (PaySim's `type` has 5 values). Compact loading
+# reads only the columns listed here: PaySim's nameOrig/nameDest are
+# per-account ids (millions of distinct values), not features.
+#
+# Categories are fixed, not inferred, so a new batch holding only some
+# transaction types gets the same integer codes the model was trained on.
+PAYSIM_TYPES = pd.CategoricalDtype(["CASH_IN", "CASH_OUT", "DEBIT", "PAYMENT", "TRANSFER"])
+
+SCHEMAS = {
+    "creditcard": {
+        **{c: "float32" for c in ["Time", *[f"V{i}" for i in range(1, 29)], "Amount"]},
+        "Class": "int8",
+    },
+    "paysim": {
+        "step": "int16",
+        "type": PAYSIM_TYPES,
+        "amount": "float32",
+        "oldbalanceOrg": "float32",
+        "newbalanceOrig": "float32",
+        "oldbalanceDest": "float32",
+        "newbalanceDest": "float32",
+        "isFraud": "int8",
+        "isFlaggedFraud": "int8",
+    },
+}
+
+BALANCE_STRATEGIES = ("undersample", "oversample")
+
+
+def _feature_matrix(df: pd.DataFrame, feature_names: list) -> np.ndarray:
+    """
+    Fill one preallocated float32 (n, n_features) array column by column.
+    Categorical columns contribute their integer codes.
+    """
+    X = np.empty((len(df), len(feature_names)), dtype=np.float32)
+    for j, name in enumerate(feature_names):
+        col = df[name]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes = col.cat.codes.to_numpy()
+            if (codes < 0).any():
+                raise ValueError(f"Column '{name}' has values outside {col.cat.categories.tolist()}")
+            X[:, j] = codes
+        else:
+            X[:, j] = col.to_numpy()
+    return X
+
+
+def load_transactions(path: str, dataset: str = "creditcard", feature_names: list = None):
+    """
+    Read a labelled batch of new transactions (CSV or Parquet) with the
+    dataset's compact schema. Returns (X float32, y int8) with columns in
+    `feature_names` order (default: file order minus the target).
+    """
+    target_col = DATASETS[dataset]["target_col"]
+    schema = SCHEMAS[dataset]
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path, columns=list(schema)).astype(schema)
+    else:
+        df = pd.read_csv(path, dtype=schema, usecols=lambda c: c.strip() in schema)
+    df.columns = df.columns.str.strip()
+    if feature_names is None:
+        feature_names = [c for c in df.columns if c != target_col]
+    return _feature_matrix(df, feature_names), df[target_col].to_numpy(dtype=np.int8)
+
+
+def _compact_split(df, target_col, test_size, random_state, strategy, ratio, val_size, return_indices):
+    feature_names = [c for c in df.columns if c != target_col]
+    X = _feature_matrix(df, feature_names)
+    y = df[target_col].to_numpy(dtype=np.int8)
+
+    # Balance and split on index arrays; X/y are gathered once per split
+    idx = None
+    if strategy == "undersample":
+        print("Balancing dataset using undersampling...")
+        idx = balance_indices(y, "undersample", ratio, random_state)
+    train_idx, val_idx, test_idx = stratified_split_indices(
+        y, test_size=test_size, val_size=val_size, random_state=random_state, idx=idx
+    )
+    if strategy == "oversample":
+        # Only training rows are duplicated, so copies never leak into val/test
+        print("Balancing training set using oversampling...")
+        train_idx = balance_indices(y, "oversample", ratio, random_state, idx=train_idx)
+
+    if return_indices:
+        print(f"Train: {len(train_idx)}, Val: {len(val_idx)}, Test: {len(test_idx)} rows")
+        return X, y, {"train": train_idx, "val": val_idx, "test": test_idx}, feature_names
+
+    X_train, X_test = X[train_idx], X[test_idx]
+    y_train, y_test = y[train_idx], y[test_idx]
+    print(f"Train shape: {X_train.shape}, Test shape: {X_test.shape}")
+    return X_train, X_test, y_train, y_test, feature_names
+
 
 def load_fraud_data(
     dataset="creditcard",
     data_dir="data",
     test_size=0.2,
     random_state=42,
-    balance_data=True
+    balance_data=True,
+    use_cache=True,
+    offline=None,
+    compact=False,
+    balance_strategy="undersample",
+    balance_ratio=1.0,
+    val_size=0.0,
+    return_indices=False
 ):
     """
     Downloads a fraud detection dataset from Kaggle, splits into train/test,
     and optionally balances the dataset using undersampling.
-    
+
+    The download is skipped when data_dir already holds a file matching
+    data_dir/manifest.json. With offline=True (or FRAUD_DATA_OFFLINE=1) the
+    network is never used.
+
+    With use_cache, the CSV is parsed once into a memory-mapped columnar
+    cache under data_dir/.cache and later runs load from there.
+
+    compact=True reads only the columns in the dataset's dtype schema
+    (float32 numerics, low-cardinality categoricals) and returns float32/int8 NumPy arrays. Balancing and
+    splitting then work on index arrays instead of DataFrame copies, and
+    these compact-only options apply:
+        balance_strategy: "undersample" (whole dataset, before the split) or
+            "oversample" (training rows only), used when balance_data=True
+        balance_ratio: majority:minority ratio after balancing
+        val_size: fraction held out for validation (needs return_indices)
+        return_indices: return (X, y, {"train", "val", "test"} index arrays,
+            feature_names) instead of materialized splits
+
     Returns:
         X_train, X_test, y_train, y_test, feature_names
     """
-    api = KaggleApi()
-    api.authenticate()
-
-    os.makedirs(data_dir, exist_ok=True)
-
+    if balance_strategy not in BALANCE_STRATEGIES:
+        raise ValueError(f"Unknown balance_strategy '{balance_strategy}'. Choose one of {BALANCE_STRATEGIES}.")
+    if not compact and (return_indices or val_size):
+        raise ValueError("val_size and return_indices require compact=True")
+    if compact and val_size and not return_indices:
+        raise ValueError("val_size requires return_indices=True")
     # -----------------------------
-    # Download datasets
+    # Locate (or download) dataset
     # -----------------------------
-    if dataset == "creditcard":
-        print("Downloading Credit Card Fraud dataset...")
-        api.dataset_download_files("mlg-ulb/creditcardfraud", path=data_dir, unzip=True)
-        file_path = os.path.join(data_dir, "creditcard.csv")
-        target_col = "Class"
-    elif dataset == "paysim":
-        print("Downloading PaySim dataset...")
-        api.dataset_download_files("ealaxi/paysim1", path=data_dir, unzip=True)
-        file_path = os.path.join(data_dir, "PS_20174392719_1491204439457_log.csv")
-        target_col = "isFraud"
-    else:
-        raise ValueError("Dataset not supported. Choose 'creditcard' or 'paysim'.")
+    file_path = ensure_dataset(dataset, data_dir=data_dir, offline=offline)
+    target_col = DATASETS[dataset]["target_col"]
 
     print(f"Loading data from {file_path} ...")
-    df = pd.read_csv(file_path)
+    dtypes = SCHEMAS[dataset] if compact else None
+    usecols = list(dtypes) if compact else None
+    if use_cache:
+        df = read_csv_cached(file_path, cache_dir=os.path.join(data_dir, ".cache"), dtypes=dtypes,
+                             usecols=usecols)
+    else:
+        df = pd.read_csv(file_path, dtype=dtypes,
+                         usecols=None if usecols is None else (lambda c: c.strip() in dtypes))
     df.columns = df.columns.str.strip()  # remove spaces from column names
 
+    if compact:
+        strategy = balance_strategy if balance_data else None
+        return _compact_split(df, target_col, test_size, random_state, strategy,
+                              balance_ratio, val_size, return_indices)
+
     # -----------------------------
     # Features / target
     # -----------------------------
@@ -0,0 +1,88 @@
+"""
+Index-based class balancing and stratified splitting.
+
+Everything here works on the label array and returns sorted int64 index
+arrays. Callers gather only the rows they need (X[idx]) and nothing is
+copied in the meantime. Results depend only on `random_state`.
+"""
+import numpy as np
+
+STRATEGIES = (None, "undersample", "oversample")
+
+
+def _group_by_class(y: np.ndarray, idx: np.ndarray, rng: np.random.Generator):
+    """
+    Shuffle `idx` and group it by class in one pass.
+    Returns (classes, counts, grouped) with grouped[offsets[k]:offsets[k+1]]
+    holding class k's indices in random order.
+    """
+    shuffled = idx[rng.permutation(len(idx))]
+    labels = y[shuffled]
+    order = np.argsort(labels, kind="stable")  # stable: keeps the shuffle within a class
+    grouped = shuffled[order]
+    classes, counts = np.unique(labels[order], return_counts=True)
+    return classes, counts, grouped
+
+
+def balance_indices(y: np.ndarray, strategy: str = "undersample", ratio: float = 1.0,
+                    random_state: int = 42, idx: np.ndarray = None) -> np.ndarray:
+    """
+    Resample `idx` (default: all rows) so that majority:minority == ratio.
+
+    undersample keeps every minority row and samples the majority class
+    without replacement. oversample keeps every majority row and draws
+    minority rows with replacement. Only binary labels are supported.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Choose one of {STRATEGIES}.")
+    if ratio <= 0:
+        raise ValueError("ratio must be > 0")
+    idx = np.arange(len(y)) if idx is None else np.asarray(idx)
+    if strategy is None:
+        return idx
+
+    rng = np.random.default_rng(random_state)
+    classes, counts, grouped = _group_by_class(y, idx, rng)
+    if len(classes) != 2:
+        raise ValueError("balance_indices expects exactly two classes")
+    minority = int(np.argmin(counts))
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    min_idx = grouped[bounds[minority]:bounds[minority + 1]]
+    maj_idx = grouped[bounds[1 - minority]:bounds[2 - minority]]
+
+    if strategy == "undersample":
+        n_maj = min(len(maj_idx), int(round(len(min_idx) * ratio)))
+        # grouped is already shuffled, so the first n_maj rows are a random sample
+        selected = np.concatenate([min_idx, maj_idx[:n_maj]])
+    else:
+        n_min = max(len(min_idx), int(round(len(maj_idx) / ratio)))
+        extra = rng.choice(min_idx, size=n_min - len(min_idx), replace=True)
+        selected = np.concatenate([maj_idx, min_idx, extra])
+    return np.sort(selected)
+
+
+def stratified_split_indices(y: np.ndarray, test_size: float = 0.2, val_size: float = 0.0,
+                             random_state: int = 42, idx: np.ndarray = None):
+    """
+    Stratified train/val/test split of `idx` (default: all rows).
+
+    Returns (train_idx, val_idx, test_idx), each sorted. val_idx is empty
+    when val_size is 0. Every class is split in the same proportions.
+    """
+    if test_size + val_size >= 1:
+        raise ValueError("test_size + val_size must be < 1")
+    idx = np.arange(len(y)) if idx is None else np.asarray(idx)
+    rng = np.random.default_rng(random_state)
+    _, counts, grouped = _group_by_class(y, idx, rng)
+
+    train, val, test = [], [], []
+    start = 0
+    for n in counts:
+        n_test = int(round(n * test_size))
+        n_val = int(round(n * val_size))
+        block = grouped[start:start + n]
+        test.append(block[:n_test])
+        val.append(block[n_test:n_test + n_val])
+        train.append(block[n_test + n_val:])
+        start += n
+    return tuple(np.sort(np.concatenate(parts)) for parts in (train, val, test))
@@ -0,0 +1,128 @@
+"""
+Asynchronous TensorBoard logging for training loops.
+
+Callers append (tag, value, step) events to a deque in constant time,
+without waking anything. A background thread drains the deque every
+`drain_secs`, owns the SummaryWriters, converts values (including device
+tensors) to floats, and flushes to disk every `flush_secs`. The training
+thread never does file I/O or waits on a device sync for logging. Running
+means are kept as a sum and a count per tag (O(1) per update and per read).
+
+DeepLearning uses this module too (loaded by path, see DeepLearning/shared.py).
+"""
+import collections
+import os
+import threading
+import time
+
+
+class RunningMean:
+    """
+    Sum/count accumulator. `value` may be a float or a tensor; tensors stay
+    on their device until the mean is logged.
+    """
+
+    __slots__ = ("total", "count")
+
+    def __init__(self):
+        self.total = 0.0
+        self.count = 0
+
+    def update(self, value, n: int = 1):
+        self.total = self.total + value
+        self.count += n
+
+    @property
+    def mean(self):
+        return self.total / max(self.count, 1)
+
+
+class MetricsSink:
+    """
+    Background-flushed scalar logger.
+
+    `run` selects a subdirectory of log_dir (e.g. "train" / "val"), each
+    with its own SummaryWriter, so runs overlay in TensorBoard as before.
+    Tensor values are read when drained, so don't modify them in place.
+    """
+
+    def __init__(self, log_dir: str, flush_secs: float = 10.0, drain_secs: float = 0.5):
+        self.log_dir = log_dir
+        self.flush_secs = flush_secs
+        self.drain_secs = min(drain_secs, flush_secs)
+        self._pending = collections.deque()
+        self._closed = threading.Event()
+        self._running = {}
+        self.events = 0
+        self.enqueue_s = 0.0  # time spent by callers inside add_scalar/log_mean
+        self._thread = threading.Thread(target=self._run, name="metrics-sink", daemon=True)
+        self._thread.start()
+
+    # -----------------------------
+    # Caller side (constant time, no I/O)
+    # -----------------------------
+    def add_scalar(self, tag: str, value, step: int, run: str = ""):
+        t0 = time.perf_counter()
+        self._pending.append((run, tag, value, step))
+        self.events += 1
+        self.enqueue_s += time.perf_counter() - t0
+
+    def update(self, tag: str, value, n: int = 1, run: str = ""):
+        """
+        Fold `value` into the running mean for (run, tag).
+        """
+        t0 = time.perf_counter()
+        acc = self._running.get((run, tag))
+        if acc is None:
+            acc = self._running[(run, tag)] = RunningMean()
+        acc.update(value, n)
+        self.enqueue_s += time.perf_counter() - t0
+
+    def mean(self, tag: str, run: str = ""):
+        return self._running[(run, tag)].mean
+
+    def log_mean(self, tag: str, step: int, run: str = ""):
+        """
+        Enqueue the current running mean of (run, tag) as a scalar.
+        """
+        self.add_scalar(tag, self.mean(tag, run), step, run=run)
+
+    def stats(self) -> dict:
+        return {"events": self.events, "enqueue_s": self.enqueue_s,
+                "enqueue_us_per_event": self.enqueue_s / max(self.events, 1) * 1e6}
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------
+    # Writer thread
+    # -----------------------------
+    def _run(self):
+        from torch.utils.tensorboard import SummaryWriter
+
+        writers = {}
+        next_flush = time.monotonic() + self.flush_secs
+        while True:
+            closing = self._closed.wait(self.drain_secs)
+            while self._pending:
+                run, tag, value, step = self._pending.popleft()
+                writer = writers.get(run)
+                if writer is None:
+                    # flush_secs is handled here, not by the writer's own timer
+                    writer = writers[run] = SummaryWriter(os.path.join(self.log_dir, run), flush_secs=3600)
+                writer.add_scalar(tag, float(value), global_step=step)
+            if closing:
+                break
+            if time.monotonic() >= next_flush:
+                for w in writers.values():
+                    w.flush()
+                next_flush = time.monotonic() + self.flush_secs
+        for w in writers.values():
+            w.close()
@@ -0,0 +1,144 @@
+"""
+Versioned model directory.
+
+    models/
+    ├── versions/
+    │   ├── 20250101_120000/        # one directory per published model
+    │   │   ├── best_tabnet_model.zip
+    │   │   ├── scaler.pkl
+    │   │   ├── feature_names.pkl
+    │   │   └── operating_points.json   (optional; exports too)
+    │   └── ...
+    └── CURRENT                     # name of the version to serve
+
+Versions are immutable once published. Rolling out (or back) means
+rewriting CURRENT, which is replaced atomically. The API picks the change
+up via POST /admin/reload or by watching CURRENT. Without a CURRENT file,
+the flat models/ layout written by train_tabnet.py is served as before.
+
+    python model_store.py publish                 # snapshot models/ as a new version
+    python model_store.py publish --no-activate
+    python model_store.py list
+    python model_store.py activate 20250101_120000
+"""
+import argparse
+import datetime
+import os
+import shutil
+
+MODELS_DIR = "models"
+VERSIONS_DIR = "versions"
+CURRENT_FILE = "CURRENT"
+
+MODEL_FILE = "best_tabnet_model.zip"
+SCALER_FILE = "scaler.pkl"
+FEATURE_NAMES_FILE = "feature_names.pkl"
+OPERATING_POINTS_FILE = "operating_points.json"
+REQUIRED = (MODEL_FILE, SCALER_FILE, FEATURE_NAMES_FILE)
+OPTIONAL = (OPERATING_POINTS_FILE, "best_tabnet_model.ts", "best_tabnet_model.onnx",
+            "best_tabnet_model.onnx.data")
+
+
+def current_path(root: str = MODELS_DIR) -> str:
+    return os.path.join(root, CURRENT_FILE)
+
+
+def version_dir(version: str, root: str = MODELS_DIR) -> str:
+    return os.path.join(root, VERSIONS_DIR, version)
+
+
+def list_versions(root: str = MODELS_DIR) -> list:
+    path = os.path.join(root, VERSIONS_DIR)
+    if not os.path.isdir(path):
+        return []
+    return sorted(v for v in os.listdir(path) if not v.startswith("."))
+
+
+def current_version(root: str = MODELS_DIR):
+    """
+    Name in models/CURRENT, or None for the flat (unversioned) layout.
+    """
+    try:
+        with open(current_path(root)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def artifact_paths(version: str = None, root: str = MODELS_DIR) -> dict:
+    """
+    ModelRegistry keyword arguments for `version` (None: flat layout).
+    """
+    base = root if version is None else version_dir(version, root)
+    return {
+        "model_path": os.path.join(base, MODEL_FILE),
+        "scaler_path": os.path.join(base, SCALER_FILE),
+        "feature_names_path": os.path.join(base, FEATURE_NAMES_FILE),
+        "operating_points_path": os.path.join(base, OPERATING_POINTS_FILE),
+    }
+
+
+def activate(version: str, root: str = MODELS_DIR):
+    if not os.path.isdir(version_dir(version, root)):
+        raise FileNotFoundError(f"Unknown model version '{version}' (see {os.path.join(root, VERSIONS_DIR)})")
+    tmp = current_path(root) + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(version + "\n")
+    os.replace(tmp, current_path(root))  # readers see the old or the new name, never a partial one
+
+
+def publish(src_dir: str = MODELS_DIR, root: str = MODELS_DIR, version: str = None,
+            activate_version: bool = True) -> str:
+    """
+    Copy the artifacts in `src_dir` into a new version directory (default
+    name: timestamp) and, by default, make it current.
+    """
+    missing = [f for f in REQUIRED if not os.path.exists(os.path.join(src_dir, f))]
+    if missing:
+        raise FileNotFoundError(f"{src_dir} is missing {missing}")
+    version = version or datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    dest = version_dir(version, root)
+    if os.path.exists(dest):
+        raise FileExistsError(f"Model version '{version}' already exists")
+
+    # Stage under a temporary name so a half-copied version is never listed
+    tmp = os.path.join(root, VERSIONS_DIR, f".{version}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name in REQUIRED + OPTIONAL:
+        src = os.path.join(src_dir, name)
+        if os.path.exists(src):
+            shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+    if activate_version:
+        activate(version, root)
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage versioned fraud models")
+    parser.add_argument("--root", default=MODELS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("publish", help="snapshot trained artifacts as a new version")
+    p.add_argument("--from", dest="src", default=MODELS_DIR)
+    p.add_argument("--version", default=None)
+    p.add_argument("--no-activate", action="store_true")
+    sub.add_parser("list", help="list versions, marking the current one")
+    p = sub.add_parser("activate", help="make VERSION current")
+    p.add_argument("version")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        version = publish(args.src, args.root, args.version, activate_version=not args.no_activate)
+        print(f"Published {version}{'' if args.no_activate else ' (current)'}")
+    elif args.command == "list":
+        current = current_version(args.root)
+        for v in list_versions(args.root):
+            print(f"{'*' if v == current else ' '} {v}")
+    else:
+        activate(args.version, args.root)
+        print(f"Current version: {args.version}")
+
+
+if __name__ == "__main__":
+    main()
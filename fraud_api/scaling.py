@@ -0,0 +1,41 @@
+import numpy as np
+import joblib
+
+
+class AffineScaler:
+    """
+    Serving-time replacement for a fitted sklearn StandardScaler.
+
+    `mean_` and `scale_` are pulled out once and applied as
+    `(x - mean) * inv_scale` with NumPy ufuncs, optionally in place on the
+    request buffer. No input validation or copies per call.
+    """
+
+    def __init__(self, mean, scale, dtype=np.float32):
+        scale = np.asarray(scale, dtype=np.float64)
+        self.mean = np.ascontiguousarray(mean, dtype=dtype)
+        self.inv_scale = np.ascontiguousarray(1.0 / scale, dtype=dtype)
+        self.n_features = self.mean.shape[0]
+
+    @classmethod
+    def from_sklearn(cls, scaler, dtype=np.float32):
+        n = scaler.n_features_in_
+        # mean_ is fitted even with with_mean=False, so check the flags
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n)
+        return cls(mean, scale, dtype=dtype)
+
+    @classmethod
+    def load(cls, scaler_path: str, dtype=np.float32):
+        """
+        Load a joblib-pickled StandardScaler (e.g. models/scaler.pkl).
+        """
+        return cls.from_sklearn(joblib.load(scaler_path), dtype=dtype)
+
+    def transform(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Scale X. Pass `out=X` to scale a float32 buffer in place.
+        """
+        out = np.subtract(X, self.mean, out=out, dtype=self.mean.dtype)
+        np.multiply(out, self.inv_scale, out=out)
+        return out
@@ -0,0 +1,103 @@
+"""
+Score a CSV or Parquet file of transactions in fixed-size chunks.
+
+Memory stays bounded by the chunk size regardless of file size: each chunk
+is parsed into a float32 array in feature order, scaled in place, scored and
+appended to the output CSV before the next one is read. With --pipeline a
+reader thread parses the next chunk while the current one is being scored.
+
+    python score_file.py data/creditcard.csv scores.csv --chunk-size 65536 --pipeline
+    python score_file.py transactions.parquet scores.csv --id-column tx_id
+"""
+import argparse
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from inference import registry
+
+_DONE = object()
+
+
+def iter_chunks(path: str, columns: list, chunk_size: int):
+    """
+    Yield DataFrames of at most `chunk_size` rows with only `columns`.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        dtypes = {c: np.float32 for c in registry.feature_names}
+        yield from pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_size)
+
+
+def _parse(chunk: pd.DataFrame, id_column: str):
+    ids = chunk[id_column].to_numpy() if id_column else None
+    X = np.ascontiguousarray(chunk[registry.feature_names].to_numpy(dtype=np.float32))
+    return ids, X
+
+
+def _prefetch(chunks, id_column: str, depth: int):
+    """
+    Parse chunks on a background thread, at most `depth` ahead of scoring.
+    """
+    q = queue.Queue(maxsize=depth)
+
+    def reader():
+        try:
+            for chunk in chunks:
+                q.put(_parse(chunk, id_column))
+        except Exception as exc:
+            q.put(exc)
+        q.put(_DONE)
+
+    threading.Thread(target=reader, name="score-file-reader", daemon=True).start()
+    while True:
+        item = q.get()
+        if item is _DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def score_file(input_path: str, output_path: str, chunk_size: int = 65536,
+               id_column: str = None, pipeline: bool = False) -> dict:
+    registry.load()
+    columns = list(registry.feature_names) + ([id_column] if id_column else [])
+    chunks = iter_chunks(input_path, columns, chunk_size)
+    parsed = (_prefetch(chunks, id_column, depth=2) if pipeline
+              else (_parse(c, id_column) for c in chunks))
+
+    n_rows = 0
+    t0 = time.perf_counter()
+    with open(output_path, "w", newline="") as f:
+        f.write(f"{id_column or 'row'},fraud_probability\n")
+        for ids, X in parsed:
+            probs = registry.predict_proba(registry.scaler.transform(X, out=X))
+            if ids is None:
+                ids = np.arange(n_rows, n_rows + len(probs))
+            pd.DataFrame({"id": ids, "p": probs}).to_csv(f, header=False, index=False)
+            n_rows += len(probs)
+    elapsed = time.perf_counter() - t0
+    return {"rows": n_rows, "seconds": elapsed, "rows_per_s": n_rows / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream-score a transactions file")
+    parser.add_argument("input", help="CSV or .parquet file with the model's feature columns")
+    parser.add_argument("output", help="output CSV (id, fraud_probability)")
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--id-column", default=None, help="column copied to the output (default: row number)")
+    parser.add_argument("--pipeline", action="store_true", help="parse the next chunk while scoring")
+    args = parser.parse_args()
+
+    stats = score_file(args.input, args.output, args.chunk_size, args.id_column, args.pipeline)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.1f}s ({stats['rows_per_s']:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Multi-process serving for the Fraud Detection API.
+
+The parent process loads the model, scaler and feature names once, moves the
+TabNet weights into shared memory and then forks the uvicorn workers. Workers
+inherit the already-loaded model read-only, so they start without reading
+the .zip again and each extra worker adds no copy of the weights.
+
+    python serve.py --workers 4 --port 8000
+
+Hot swaps (model_store.py) happen per worker: set FRAUD_API_WATCH_SECS so
+every worker follows models/CURRENT. A swapped-in model is loaded by each
+worker separately and is not shared.
+"""
+import argparse
+import gc
+import multiprocessing as mp
+import os
+import signal
+import socket
+import time
+
+
+def _pss_mb(pid: int) -> float:
+    """
+    Proportional set size of a process (Linux only). Shared pages are split
+    across the processes mapping them, so this is what a worker really costs.
+    """
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def share_model_memory(network):
+    """
+    Move the torch module's parameters and buffers into shared memory.
+    """
+    network.eval()
+    for p in network.parameters():
+        p.requires_grad_(False)
+    network.share_memory()
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, log_level: str):
+    import uvicorn
+
+    config = uvicorn.Config(app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Fraud Detection API with N worker processes")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("FRAUD_API_WORKERS", "4")))
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--report-memory", action="store_true",
+                        help="print per-worker PSS once the workers are up (Linux)")
+    args = parser.parse_args()
+
+    # Split cores across processes x inference threads before the app reads it
+    if "FRAUD_API_TORCH_THREADS" not in os.environ:
+        pool_workers = int(os.getenv("FRAUD_API_INFERENCE_WORKERS", "2"))
+        cores = os.cpu_count() or 1
+        os.environ["FRAUD_API_TORCH_THREADS"] = str(max(1, cores // (args.workers * pool_workers)))
+
+    sock = _bind_socket(args.host, args.port)
+
+    # -----------------------------
+    # Load everything once, in the parent
+    # -----------------------------
+    # No forward pass may run here: torch's OpenMP pool does not survive fork.
+    t0 = time.perf_counter()
+    from inference import manager, challenger
+    from fraud_api import app
+
+    registry = manager.active
+
+    if registry.backend == "onnx":
+        # onnxruntime sessions own thread pools and must be created per worker
+        print("onnx backend: each worker loads its own session")
+    else:
+        registry.load()
+        share_model_memory(registry.torch_module)
+        print(f"Model loaded in parent in {time.perf_counter() - t0:.2f}s")
+    if challenger is not None:
+        # Frozen TorchScript: weights are graph constants, inherited copy-on-write
+        challenger.load()
+
+    # Keep the loaded objects out of future GC passes so collections in the
+    # workers don't touch (and copy-on-write) the inherited pages.
+    gc.collect()
+    gc.freeze()
+
+    # -----------------------------
+    # Fork workers
+    # -----------------------------
+    ctx = mp.get_context("fork")
+    workers = []
+    for _ in range(args.workers):
+        p = ctx.Process(target=_run_worker, args=(app, sock, args.log_level))
+        p.start()
+        workers.append(p)
+    print(f"Started {len(workers)} workers on {args.host}:{args.port}")
+
+    def _shutdown(signum, frame):
+        for p in workers:
+            if p.is_alive():
+                p.terminate()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    if args.report_memory:
+        time.sleep(2.0)
+        print(f"parent PSS: {_pss_mb(os.getpid()):.1f} MB")
+        for p in workers:
+            if p.is_alive():
+                print(f"worker {p.pid} PSS: {_pss_mb(p.pid):.1f} MB")
+
+    for p in workers:
+        p.join()
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
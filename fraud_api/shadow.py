@@ -0,0 +1,114 @@
+"""
+Shadow scoring off the request path.
+
+For a sampled request the API hands the parsed transaction, the score it
+answered with and the arm that produced it ("primary" or "challenger") to
+ShadowScorer.submit(). That call is one deque append. A background thread
+drains the deque every `drain_secs`, scores the whole backlog with the other
+arm in one batch and appends paired scores to a CSV for offline comparison.
+The thread runs reniced. Once `max_pending` samples are waiting, new ones
+are dropped and counted, so a slow shadow model never backs up requests.
+"""
+import collections
+import os
+import threading
+import time
+from executor import lower_thread_priority
+
+ARMS = ("primary", "challenger")
+COLUMNS = ("ts", "served_by", "primary_model", "challenger_model", "primary", "challenger")
+
+
+def model_name(reg) -> str:
+    return reg.family if reg.version is None else f"{reg.family}:{reg.version}"
+
+
+class ShadowScorer:
+    """
+    `models()` returns the current {"primary": registry, "challenger": registry},
+    so a hot-swapped primary is picked up by the next drain.
+    """
+
+    def __init__(self, models, log_path: str, max_pending: int = 10_000, drain_secs: float = 0.05,
+                 nice: int = 10):
+        self.models = models
+        self.log_path = log_path
+        self.max_pending = max_pending
+        self.drain_secs = drain_secs
+        self.nice = nice
+        self._pending = collections.deque()
+        self._closed = threading.Event()
+        self._thread = None
+        self.submitted = 0
+        self.dropped = 0
+        self.scored = 0
+        self.errors = 0
+
+    def start(self):
+        if self._thread is None:
+            self._closed.clear()
+            self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # -----------------------------
+    # Request side (constant time)
+    # -----------------------------
+    def submit(self, transaction, served_by: str, prob: float, model: str):
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append((time.time(), transaction, served_by, prob, model))
+        self.submitted += 1
+
+    def stats(self) -> dict:
+        return {"submitted": self.submitted, "scored": self.scored, "dropped": self.dropped,
+                "errors": self.errors, "pending": len(self._pending), "log_path": self.log_path}
+
+    # -----------------------------
+    # Scoring thread
+    # -----------------------------
+    def _drain(self, f):
+        batch = []
+        while self._pending:
+            batch.append(self._pending.popleft())
+        if not batch:
+            return
+        models = self.models()
+        for served_by in ARMS:
+            rows = [b for b in batch if b[2] == served_by]
+            if not rows:
+                continue
+            other = ARMS[served_by == "primary"]
+            reg = models[other]
+            try:
+                shadow_probs = reg.predict_batch([r[1] for r in rows])
+            except Exception as exc:
+                self.errors += len(rows)
+                print(f"Shadow scoring with the {other} failed: {exc!r}")
+                continue
+            shadow_name = model_name(reg)
+            for (ts, _, _, prob, model), shadow_prob in zip(rows, shadow_probs):
+                names = (model, shadow_name) if served_by == "primary" else (shadow_name, model)
+                probs = (prob, shadow_prob) if served_by == "primary" else (shadow_prob, prob)
+                f.write(f"{ts:.6f},{served_by},{names[0]},{names[1]},{probs[0]:.8g},{probs[1]:.8g}\n")
+            self.scored += len(rows)
+        f.flush()
+
+    def _run(self):
+        lower_thread_priority(self.nice)
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a") as f:
+            if f.tell() == 0:
+                f.write(",".join(COLUMNS) + "\n")
+            while True:
+                closing = self._closed.wait(self.drain_secs)
+                self._drain(f)
+                if closing:
+                    break
@@ -0,0 +1,285 @@
+"""
+Parallel TabNet hyperparameter sweep.
+
+The dataset is loaded, split (train/val/test) and scaled once. The scaled
+splits are written as .npy files that every worker memory-maps read-only,
+so N workers share one copy of the data. Each trial trains with early
+stopping. A median-stopping rule prunes trials whose best val AUC falls
+below the median of the other trials at the same epoch. Surviving models
+are then timed one at a time on a single thread, so latencies are
+comparable, and the results go to a leaderboard of val AUC vs latency.
+
+Run from the fraud_api directory:
+
+    python sweep.py --trials 24 --workers 4
+    python sweep.py --trials 8 --max-epochs 10 --out sweeps/quick
+
+Outputs (under --out): leaderboard.csv, trials/trial_XXX.zip,
+scaler.pkl and feature_names.pkl. Copy a frontier model to
+models/best_tabnet_model.zip (plus the scaler/feature names) to serve it.
+"""
+import argparse
+import concurrent.futures
+import datetime
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from pytorch_tabnet.callbacks import Callback
+from loaders.kaggle_loader import load_fraud_data
+from scaling import AffineScaler
+from train_tabnet import DATASET, build_classifier, fit_params
+
+# -----------------------------
+# Search space
+# -----------------------------
+# n_a is tied to n_d, as in the hand-tuned default
+SEARCH_SPACE = {
+    "n_d": [8, 16, 32],
+    "n_steps": [3, 4, 5],
+    "gamma": [1.3, 1.5, 2.0],
+    "n_independent": [1, 2],
+    "n_shared": [1, 2],
+    "lr": [1e-2, 2e-2],
+    "mask_type": ["entmax", "sparsemax"],
+}
+
+SPLITS = ("X_train", "y_train", "X_val", "y_val")
+
+
+def sample_configs(n_trials: int, seed: int = 0, space: dict = SEARCH_SPACE) -> list:
+    """
+    `n_trials` distinct configurations drawn from the grid (the whole grid
+    if it is smaller than that).
+    """
+    keys = list(space)
+    grid = list(itertools.product(*(space[k] for k in keys)))
+    rng = np.random.default_rng(seed)
+    if n_trials < len(grid):
+        grid = [grid[i] for i in rng.choice(len(grid), size=n_trials, replace=False)]
+    configs = [dict(zip(keys, values)) for values in grid]
+    for c in configs:
+        c["n_a"] = c["n_d"]
+    return configs
+
+
+def pareto_front(auc: np.ndarray, latency: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask of points that no other point beats on both higher AUC
+    and lower latency (ties on one axis need a strict win on the other).
+    """
+    front = np.ones(len(auc), dtype=bool)
+    for i in range(len(auc)):
+        better = (auc >= auc[i]) & (latency <= latency[i]) & ((auc > auc[i]) | (latency < latency[i]))
+        front[i] = not better.any()
+    return front
+
+
+# -----------------------------
+# Data: load and scale once, share via read-only memory maps
+# -----------------------------
+def prepare_data(out_dir: str, dataset: str = DATASET, data_dir: str = "data", val_size: float = 0.1):
+    X, y, idx, feature_names = load_fraud_data(
+        dataset=dataset, data_dir=data_dir, test_size=0.2, random_state=42, balance_data=False,
+        compact=True, val_size=val_size, return_indices=True
+    )
+    scaler = StandardScaler().fit(X[idx["train"]])
+    affine = AffineScaler.from_sklearn(scaler)
+
+    data_dir_out = os.path.join(out_dir, "data")
+    os.makedirs(data_dir_out, exist_ok=True)
+    arrays = {
+        "X_train": affine.transform(X[idx["train"]]), "y_train": y[idx["train"]],
+        "X_val": affine.transform(X[idx["val"]]), "y_val": y[idx["val"]],
+    }
+    for name, arr in arrays.items():
+        np.save(os.path.join(data_dir_out, f"{name}.npy"), arr)
+    joblib.dump(scaler, os.path.join(out_dir, "scaler.pkl"))
+    joblib.dump(feature_names, os.path.join(out_dir, "feature_names.pkl"))
+    return data_dir_out
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+_DATA = {}
+_SHARED = {}
+
+
+def _init_worker(data_dir: str, reports, threads: int):
+    import torch
+    torch.set_num_threads(threads)
+    for name in SPLITS:
+        _DATA[name] = np.load(os.path.join(data_dir, f"{name}.npy"), mmap_mode="r")
+    _SHARED["reports"] = reports
+
+
+class MedianPruner(Callback):
+    """
+    Stop a trial once its best val AUC so far is below the median of the
+    other trials' best-so-far at the same epoch. Nothing is pruned before
+    `warmup_epochs`, or while fewer than `min_peers` trials have reached
+    that epoch.
+    """
+
+    def __init__(self, trial_id, reports, warmup_epochs=3, min_peers=3):
+        super().__init__()
+        self.trial_id = trial_id
+        self.reports = reports
+        self.warmup_epochs = warmup_epochs
+        self.min_peers = min_peers
+        self.best = -np.inf
+        self.pruned = False
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.best = max(self.best, logs["val_auc"])
+        self.reports.append((self.trial_id, epoch, self.best))
+        if epoch + 1 < self.warmup_epochs:
+            return
+        peers = [auc for t, e, auc in list(self.reports) if e == epoch and t != self.trial_id]
+        if len(peers) >= self.min_peers and self.best < np.median(peers):
+            self.pruned = True
+            self.trainer._stop_training = True
+
+
+def _run_trial(trial_id: int, params: dict, max_epochs: int, patience: int, trials_dir: str,
+               warmup_epochs: int, seed: int) -> dict:
+    pruner = MedianPruner(trial_id, _SHARED["reports"], warmup_epochs=warmup_epochs)
+    clf = build_classifier(params, seed=seed, verbose=0)
+    t0 = time.perf_counter()
+    clf.fit(
+        _DATA["X_train"], _DATA["y_train"],
+        eval_set=[(_DATA["X_val"], _DATA["y_val"])],
+        eval_name=["val"],
+        eval_metric=["auc"],
+        max_epochs=max_epochs,
+        patience=patience,
+        callbacks=[pruner],
+        **fit_params(params)
+    )
+    result = {
+        "trial": trial_id,
+        "status": "pruned" if pruner.pruned else "complete",
+        "val_auc": float(clf.best_cost),
+        "best_epoch": int(clf.best_epoch) + 1,
+        "epochs": len(clf.history.history["val_auc"]),
+        "train_s": time.perf_counter() - t0,
+        "params": json.dumps(params, sort_keys=True),
+        "model_path": "",
+    }
+    if not pruner.pruned:
+        result["model_path"] = clf.save_model(os.path.join(trials_dir, f"trial_{trial_id:03d}"))
+    return result
+
+
+# -----------------------------
+# Latency (parent, one model at a time)
+# -----------------------------
+def measure_latency(model_path: str, X: np.ndarray, iters: int = 200, batch: int = 1024) -> dict:
+    """
+    Single-row p50 latency and batch throughput of the bare TabNet network
+    under inference_mode, single-threaded.
+    """
+    import torch
+    from pytorch_tabnet.tab_model import TabNetClassifier
+
+    clf = TabNetClassifier()
+    clf.load_model(model_path)
+    net = clf.network.eval()
+    one = torch.from_numpy(np.ascontiguousarray(X[:1], dtype=np.float32))
+    many = torch.from_numpy(np.ascontiguousarray(X[:batch], dtype=np.float32))
+    samples = []
+    with torch.inference_mode():
+        for _ in range(10):
+            net(one)
+        for _ in range(iters):
+            t0 = time.perf_counter()
+            net(one)
+            samples.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        for _ in range(10):
+            net(many)
+        batch_s = (time.perf_counter() - t0) / 10
+    return {"p50_us": float(np.median(samples) * 1e6), "rows_per_s": len(many) / batch_s}
+
+
+def run_sweep(args) -> pd.DataFrame:
+    import torch
+
+    os.makedirs(args.out, exist_ok=True)
+    trials_dir = os.path.join(args.out, "trials")
+    os.makedirs(trials_dir, exist_ok=True)
+    data_dir = prepare_data(args.out, dataset=args.dataset, data_dir=args.data_dir, val_size=args.val_size)
+
+    configs = sample_configs(args.trials, seed=args.seed)
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // args.workers)
+    print(f"Sweeping {len(configs)} configurations on {args.workers} workers x {threads} threads")
+
+    ctx = mp.get_context("spawn")
+    with ctx.Manager() as manager:
+        reports = manager.list()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=args.workers, mp_context=ctx,
+            initializer=_init_worker, initargs=(data_dir, reports, threads),
+        ) as pool:
+            futures = [
+                pool.submit(_run_trial, i, params, args.max_epochs, args.patience, trials_dir,
+                            args.warmup_epochs, args.seed)
+                for i, params in enumerate(configs)
+            ]
+            results = []
+            for fut in concurrent.futures.as_completed(futures):
+                r = fut.result()
+                results.append(r)
+                print(f"  trial {r['trial']:3d} {r['status']:<8} val AUC={r['val_auc']:.4f} "
+                      f"({r['epochs']} epochs, {r['train_s']:.0f}s)")
+
+    board = pd.DataFrame(results)
+    board["p50_us"] = np.nan
+    board["rows_per_s"] = np.nan
+    torch.set_num_threads(1)
+    X_val = np.load(os.path.join(data_dir, "X_val.npy"), mmap_mode="r")
+    for i, row in board[board["status"] == "complete"].iterrows():
+        lat = measure_latency(row["model_path"], X_val)
+        board.loc[i, ["p50_us", "rows_per_s"]] = lat["p50_us"], lat["rows_per_s"]
+
+    done = board["status"] == "complete"
+    board["pareto"] = False
+    board.loc[done, "pareto"] = pareto_front(board.loc[done, "val_auc"].to_numpy(),
+                                             board.loc[done, "p50_us"].to_numpy())
+    board = board.sort_values("val_auc", ascending=False).reset_index(drop=True)
+    board.to_csv(os.path.join(args.out, "leaderboard.csv"), index=False)
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel TabNet hyperparameter sweep")
+    parser.add_argument("--trials", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--threads-per-worker", type=int, default=0, help="0 = cpu_count / workers")
+    parser.add_argument("--max-epochs", type=int, default=50)
+    parser.add_argument("--patience", type=int, default=10, help="early stopping patience")
+    parser.add_argument("--warmup-epochs", type=int, default=3, help="epochs before a trial can be pruned")
+    parser.add_argument("--val-size", type=float, default=0.1)
+    parser.add_argument("--dataset", default=DATASET)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="default: sweeps/run_<timestamp>")
+    args = parser.parse_args()
+    if args.out is None:
+        args.out = os.path.join("sweeps", datetime.datetime.now().strftime("run_%Y%m%d_%H%M%S"))
+
+    board = run_sweep(args)
+    cols = ["trial", "status", "val_auc", "best_epoch", "p50_us", "rows_per_s", "pareto", "params"]
+    with pd.option_context("display.width", 200, "display.max_colwidth", 120):
+        print(board[cols].to_string(index=False, float_format=lambda v: f"{v:.4f}" if v < 10 else f"{v:,.0f}"))
+    print(f"\nLeaderboard written to {os.path.join(args.out, 'leaderboard.csv')}")
+
+
+if __name__ == "__main__":
+    main()
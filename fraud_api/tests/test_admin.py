@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fraud_api
+
+
+class TestAdminAuth(unittest.TestCase):
+
+    def setUp(self):
+        self.token = fraud_api.ADMIN_TOKEN
+        self.client = TestClient(fraud_api.app)
+
+    def tearDown(self):
+        fraud_api.ADMIN_TOKEN = self.token
+
+    def test_disabled_without_configured_token(self):
+        fraud_api.ADMIN_TOKEN = None
+        self.assertEqual(self.client.get("/admin/model").status_code, 404)
+        self.assertEqual(self.client.post("/admin/reload", headers={"X-Admin-Token": ""}).status_code, 404)
+
+    def test_requires_matching_token(self):
+        fraud_api.ADMIN_TOKEN = "s3cret"
+        self.assertEqual(self.client.get("/admin/model").status_code, 403)
+        self.assertEqual(self.client.get("/admin/model", headers={"X-Admin-Token": "nope"}).status_code, 403)
+        r = self.client.get("/admin/model", headers={"X-Admin-Token": "s3cret"})
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("version", r.json())
+
+
+if __name__ == "__main__":
+    unittest.main()
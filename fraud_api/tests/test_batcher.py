@@ -0,0 +1,58 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batcher import MicroBatcher
+from executor import InferenceExecutor
+
+
+class _Model:
+    def __init__(self, value):
+        self.value = value
+        self.passes = []
+
+    def predict_batch(self, rows):
+        self.passes.append(len(rows))
+        return [self.value] * len(rows)
+
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def test_rows_are_scored_by_the_model_they_were_submitted_with(self):
+        old, new = _Model(0.1), _Model(0.9)
+        batcher = MicroBatcher(lambda rows: [0.5] * len(rows), max_batch_size=64, max_wait_us=200_000)
+        batcher.start()
+        try:
+            # One collection window holding rows pinned to two model versions
+            futures = [batcher.submit(i, (old if i % 2 else new).predict_batch) for i in range(6)]
+            futures.append(batcher.submit("default"))
+            results = [f.result(timeout=5) for f in futures]
+        finally:
+            batcher.stop()
+        self.assertEqual(results, [0.9, 0.1, 0.9, 0.1, 0.9, 0.1, 0.5])
+        self.assertEqual((old.passes, new.passes), ([3], [3]))
+
+    def test_passes_run_on_the_executor(self):
+        executor = InferenceExecutor(workers=1, max_queue=4)
+        threads = []
+
+        def predict(rows):
+            threads.append(threading.current_thread().name)
+            return [0.5] * len(rows)
+
+        batcher = MicroBatcher(predict, max_batch_size=4, max_wait_us=200_000, executor=executor)
+        batcher.start()
+        try:
+            results = [f.result(timeout=5) for f in [batcher.submit(i) for i in range(4)]]
+        finally:
+            batcher.stop()
+            executor.shutdown()
+        self.assertEqual(results, [0.5] * 4)
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("inference"))
+
+
+if __name__ == "__main__":
+    unittest.main()
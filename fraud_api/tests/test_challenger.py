@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference import CREDITCARD_FEATURES, FraudNetRegistry
+from shadow import COLUMNS, ShadowScorer
+
+
+class TestFraudNetRegistry(unittest.TestCase):
+
+    def test_matches_scaled_forward_pass(self):
+        torch.manual_seed(0)
+        n = len(CREDITCARD_FEATURES)
+        net = torch.nn.Sequential(torch.nn.Linear(n, 1), torch.nn.Sigmoid()).eval()
+        rng = np.random.default_rng(0)
+        mean, scale = rng.normal(size=n), rng.uniform(0.5, 2.0, size=n)
+        X = rng.normal(size=(4, n)).astype(np.float32)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            torch.jit.trace(net, torch.zeros(1, n)).save(os.path.join(tmp, "FraudNet.pt"))
+            np.savez(os.path.join(tmp, "scaler.npz"), mean=mean, scale=scale)
+            reg = FraudNetRegistry(tmp).warmup()
+            txs = [dict(zip(CREDITCARD_FEATURES, row)) for row in X.tolist()]
+            got = reg.predict_batch(txs)
+            single = reg.predict_single(txs[0])
+
+        with torch.no_grad():
+            expected = net(torch.from_numpy(((X - mean) / scale).astype(np.float32))).numpy().ravel()
+        np.testing.assert_allclose(got, expected, rtol=1e-5)
+        self.assertAlmostEqual(single, float(expected[0]), places=5)
+        self.assertEqual(reg.decision_threshold, 0.5)  # no operating_points.json
+
+
+class _ConstModel:
+    def __init__(self, family, value, fail=False):
+        self.family, self.version, self.value, self.fail = family, None, value, fail
+
+    def predict_batch(self, transactions):
+        if self.fail:
+            raise RuntimeError("boom")
+        return [self.value] * len(transactions)
+
+
+class TestShadowScorer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, "shadow.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_logs_paired_scores_for_both_arms(self):
+        models = {"primary": _ConstModel("tabnet", 0.1), "challenger": _ConstModel("fraudnet", 0.9)}
+        scorer = ShadowScorer(lambda: models, self.log, drain_secs=0.01, nice=0).start()
+        scorer.submit({}, "primary", 0.2, "tabnet")
+        scorer.submit({}, "challenger", 0.8, "fraudnet")
+        scorer.stop()
+
+        df = pd.read_csv(self.log)
+        self.assertEqual(tuple(df.columns), COLUMNS)
+        rows = df.set_index("served_by")
+        # The serving arm keeps its own score; the other arm's comes from the shadow pass
+        self.assertEqual((rows.loc["primary", "primary"], rows.loc["primary", "challenger"]), (0.2, 0.9))
+        self.assertEqual((rows.loc["challenger", "primary"], rows.loc["challenger", "challenger"]), (0.1, 0.8))
+        self.assertEqual(scorer.stats()["scored"], 2)
+
+    def test_drops_when_backlog_is_full_and_survives_errors(self):
+        models = {"primary": _ConstModel("tabnet", 0.1), "challenger": _ConstModel("fraudnet", 0.9, fail=True)}
+        scorer = ShadowScorer(lambda: models, self.log, max_pending=2, nice=0)
+        for _ in range(5):
+            scorer.submit({}, "primary", 0.2, "tabnet")
+        self.assertEqual((scorer.submitted, scorer.dropped), (2, 3))
+
+        scorer.start()
+        scorer.stop()
+        self.assertEqual(scorer.stats()["errors"], 2)
+        self.assertEqual(len(pd.read_csv(self.log)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
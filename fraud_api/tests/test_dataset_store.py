@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loaders import dataset_store
+from loaders.dataset_store import DATASETS, ensure_dataset, is_valid, read_manifest
+
+
+class TestDatasetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmp.name
+        self.path = os.path.join(self.data_dir, DATASETS["creditcard"]["file"])
+        self.download = mock.patch.object(dataset_store, "_download").start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        self.tmp.cleanup()
+
+    def _write(self, text):
+        with open(self.path, "w") as f:
+            f.write(text)
+
+    def test_unrecorded_file_is_trusted_and_recorded(self):
+        self._write("Time,Class\n0,0\n")
+        self.assertEqual(ensure_dataset("creditcard", self.data_dir, offline=True), self.path)
+        self.assertEqual(read_manifest(self.data_dir)["creditcard"]["source"], "local")
+        self.assertTrue(is_valid(self.data_dir, "creditcard"))
+        self.download.assert_not_called()
+
+    def test_stale_file_is_rejected(self):
+        self._write("Time,Class\n0,0\n")
+        ensure_dataset("creditcard", self.data_dir, offline=True)
+        self._write("Time,Class\n1,1\n")  # same size, new content
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(is_valid(self.data_dir, "creditcard"))
+        with self.assertRaises(FileNotFoundError):
+            ensure_dataset("creditcard", self.data_dir, offline=True)
+
+    def test_missing_file_fails_fast_offline(self):
+        with self.assertRaises(FileNotFoundError):
+            ensure_dataset("creditcard", self.data_dir, offline=True)
+        self.download.assert_not_called()
+
+    def test_touched_file_is_hashed_once(self):
+        self._write("Time,Class\n0,0\n")
+        ensure_dataset("creditcard", self.data_dir, offline=True)
+        os.utime(self.path, ns=(0, 0))
+        self.assertTrue(is_valid(self.data_dir, "creditcard"))
+        self.assertEqual(read_manifest(self.data_dir)["creditcard"]["mtime_ns"], 0)
+        with mock.patch.object(dataset_store, "file_digest") as digest:
+            self.assertTrue(is_valid(self.data_dir, "creditcard"))
+        digest.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fraud_api
+from batcher import MicroBatcher
+from executor import InferenceExecutor, QueueFull
+from inference import CREDITCARD_FEATURES
+
+
+class TestBackpressure(unittest.TestCase):
+
+    def setUp(self):
+        # One worker, no queue: a single blocked pass fills the executor
+        self.release = threading.Event()
+        self.executor = InferenceExecutor(workers=1, max_queue=0)
+        self.executor.submit(self.release.wait)
+        self.client = TestClient(fraud_api.app)
+        self.tx = dict.fromkeys(CREDITCARD_FEATURES, 0.0)
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown()
+
+    def test_executor_rejects_when_full(self):
+        with self.assertRaises(QueueFull):
+            self.executor.submit(lambda: None)
+        self.assertEqual(self.executor.stats()["in_flight"], 1)
+
+    def test_full_queue_returns_503(self):
+        with mock.patch.object(fraud_api, "executor", self.executor), \
+                mock.patch.object(fraud_api, "batcher", None):
+            for path, body in (("/predict_one", self.tx), ("/predict_batch", {"transactions": [self.tx]})):
+                r = self.client.post(path, json=body)
+                self.assertEqual(r.status_code, 503, path)
+                self.assertEqual(r.headers["Retry-After"], "1")
+
+    def test_batched_pass_rejected_by_executor_returns_503(self):
+        batcher = MicroBatcher(lambda rows: [0.5] * len(rows), max_wait_us=0, executor=self.executor)
+        batcher.start()
+        try:
+            with mock.patch.object(fraud_api, "batcher", batcher):
+                r = self.client.post("/predict_one", json=self.tx)
+        finally:
+            batcher.stop()
+        self.assertEqual(r.status_code, 503)
+
+
+if __name__ == "__main__":
+    unittest.main()
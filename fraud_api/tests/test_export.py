@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import joblib
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from export_model import export_onnx, export_torchscript
+from inference import ModelRegistry, exported_path
+
+
+class TestExportParity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from pytorch_tabnet.tab_model import TabNetClassifier
+
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(512, 30)).astype(np.float32)
+        y = (X[:, 0] + X[:, 1] > 0).astype(int)
+
+        clf = TabNetClassifier(n_d=8, n_a=8, n_steps=3, mask_type="entmax",
+                               device_name="cpu", verbose=0, seed=0)
+        clf.fit(X, y, max_epochs=2, batch_size=128, virtual_batch_size=32)
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        model_path = clf.save_model(os.path.join(cls.tmp.name, "model"))
+        scaler_path = os.path.join(cls.tmp.name, "scaler.pkl")
+        names_path = os.path.join(cls.tmp.name, "feature_names.pkl")
+        joblib.dump(StandardScaler().fit(X), scaler_path)
+        joblib.dump([f"f{i}" for i in range(30)], names_path)
+
+        export_torchscript(clf, exported_path(model_path, "torchscript"))
+        cls.paths = (model_path, scaler_path, names_path)
+        cls.X = rng.normal(size=(1024, 30)).astype(np.float32)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _registry(self, backend):
+        return ModelRegistry(*self.paths, backend=backend).load()
+
+    def _assert_parity(self, backend):
+        eager = self._registry("tabnet")
+        exported = self._registry(backend)
+        for X in (self.X[:1], self.X):
+            np.testing.assert_allclose(
+                exported.predict_proba(X), eager.predict_proba(X), rtol=1e-4, atol=1e-5
+            )
+
+    def test_torchscript_matches_eager(self):
+        self._assert_parity("torchscript")
+
+    def test_onnx_matches_eager(self):
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            self.skipTest("onnxruntime not installed")
+        from pytorch_tabnet.tab_model import TabNetClassifier
+
+        clf = TabNetClassifier(device_name="cpu")
+        clf.load_model(self.paths[0])
+        export_onnx(clf, exported_path(self.paths[0], "onnx"))
+        self._assert_parity("onnx")
+
+
+if __name__ == "__main__":
+    unittest.main()
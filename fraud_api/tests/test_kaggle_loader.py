@@ -0,0 +1,95 @@
+import glob
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loaders.csv_cache import read_csv_cached
+from loaders.kaggle_loader import SCHEMAS, load_fraud_data, load_transactions
+
+
+def _paysim_frame(n=50, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "step": rng.integers(1, 100, n),
+        "type": rng.choice(["PAYMENT", "TRANSFER", "CASH_OUT"], n),
+        "amount": rng.random(n) * 1000,
+        "nameOrig": [f"C{i:09d}" for i in range(n)],
+        "oldbalanceOrg": rng.random(n),
+        "newbalanceOrig": rng.random(n),
+        "nameDest": [f"M{i:09d}" for i in range(n)],
+        "oldbalanceDest": rng.random(n),
+        "newbalanceDest": rng.random(n),
+        "isFraud": rng.integers(0, 2, n),
+        "isFlaggedFraud": np.zeros(n, dtype=int),
+    })
+
+
+class TestPaysimSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "paysim.csv")
+        _paysim_frame().to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_account_ids_are_not_features(self):
+        X, y = load_transactions(self.path, dataset="paysim")
+        self.assertEqual(X.shape, (50, len(SCHEMAS["paysim"]) - 1))
+        self.assertEqual(X.dtype, np.float32)
+
+    def test_partial_batch_keeps_training_codes(self):
+        X_full, _ = load_transactions(self.path, dataset="paysim")
+        df = _paysim_frame()
+        batch = df[df["type"].isin(["TRANSFER", "CASH_OUT"])]
+        batch_path = os.path.join(self.tmp.name, "batch.csv")
+        batch.to_csv(batch_path, index=False)
+
+        X_batch, _ = load_transactions(batch_path, dataset="paysim")
+        j = list(SCHEMAS["paysim"]).index("type")
+        np.testing.assert_array_equal(X_batch[:, j], X_full[batch.index.to_numpy(), j])
+        self.assertEqual(set(X_batch[:, j]), {1.0, 4.0})
+
+    def test_unknown_type_is_rejected(self):
+        df = _paysim_frame()
+        df.loc[0, "type"] = "WIRE"
+        df.to_csv(self.path, index=False)
+        with self.assertRaises(ValueError):
+            load_transactions(self.path, dataset="paysim")
+
+    def test_cache_skips_account_ids(self):
+        cache_dir = os.path.join(self.tmp.name, ".cache")
+        schema = SCHEMAS["paysim"]
+        df = read_csv_cached(self.path, cache_dir=cache_dir, dtypes=schema, usecols=list(schema))
+        self.assertNotIn("nameOrig", df.columns)
+        self.assertIsInstance(df["type"].dtype, pd.CategoricalDtype)
+        (meta,) = glob.glob(os.path.join(cache_dir, "*", "meta.json"))
+        with open(meta) as f:
+            self.assertNotIn("C000000001", f.read())
+
+    def test_full_load_caches_string_columns(self):
+        cache_dir = os.path.join(self.tmp.name, ".cache")
+        expected = pd.read_csv(self.path)
+        for _ in range(2):  # build, then reload from the memory-mapped entry
+            df = read_csv_cached(self.path, cache_dir=cache_dir)
+            self.assertIsInstance(df["nameOrig"].dtype, pd.CategoricalDtype)
+            self.assertEqual(df["type"].astype(str).tolist(), expected["type"].astype(str).tolist())
+            np.testing.assert_allclose(df["amount"], expected["amount"])
+
+
+class TestBalanceStrategy(unittest.TestCase):
+
+    def test_unknown_strategy_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                load_fraud_data(data_dir=tmp, compact=True, balance_strategy="undersampling", offline=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
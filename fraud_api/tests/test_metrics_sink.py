@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import torch
+from tensorboard.backend.event_processing.event_accumulator import EventAccumulator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metrics_sink import MetricsSink
+
+
+class TestMetricsSink(unittest.TestCase):
+
+    def test_running_mean_and_events_written_on_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with MetricsSink(tmp, flush_secs=60) as sink:
+                for v in (1.0, 2.0, 6.0):
+                    sink.update("loss", torch.tensor(v), run="train")
+                self.assertAlmostEqual(float(sink.mean("loss", run="train")), 3.0)
+                sink.log_mean("loss", 0, run="train")
+                sink.add_scalar("AUC/val", 0.9, 0)
+                sink.add_scalar("AUC/val", 0.95, 1)
+            train = EventAccumulator(os.path.join(tmp, "train")).Reload()
+            root = EventAccumulator(tmp).Reload()
+            self.assertEqual([e.value for e in train.Scalars("loss")], [3.0])
+            self.assertEqual([round(e.value, 4) for e in root.Scalars("AUC/val")], [0.9, 0.95])
+            self.assertEqual(sink.stats()["events"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
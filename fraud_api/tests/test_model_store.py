@@ -0,0 +1,109 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import model_store
+from inference import ModelManager
+
+
+def _write_artifacts(path, tag):
+    os.makedirs(path, exist_ok=True)
+    for name in model_store.REQUIRED:
+        with open(os.path.join(path, name), "w") as f:
+            f.write(tag)
+
+
+class TestModelStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.src = os.path.join(self.root, "trained")
+        _write_artifacts(self.src, "v1")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_flat_layout_without_current(self):
+        self.assertIsNone(model_store.current_version(self.root))
+        paths = model_store.artifact_paths(None, self.root)
+        self.assertEqual(paths["model_path"], os.path.join(self.root, model_store.MODEL_FILE))
+
+    def test_publish_and_activate(self):
+        model_store.publish(self.src, self.root, version="v1")
+        _write_artifacts(self.src, "v2")
+        model_store.publish(self.src, self.root, version="v2", activate_version=False)
+
+        self.assertEqual(model_store.list_versions(self.root), ["v1", "v2"])
+        self.assertEqual(model_store.current_version(self.root), "v1")
+        model_store.activate("v2", self.root)
+        self.assertEqual(model_store.current_version(self.root), "v2")
+        with open(model_store.artifact_paths("v2", self.root)["model_path"]) as f:
+            self.assertEqual(f.read(), "v2")
+
+    def test_versions_are_immutable(self):
+        model_store.publish(self.src, self.root, version="v1")
+        with self.assertRaises(FileExistsError):
+            model_store.publish(self.src, self.root, version="v1")
+        with self.assertRaises(FileNotFoundError):
+            model_store.activate("missing", self.root)
+        self.assertEqual(model_store.current_version(self.root), "v1")
+
+
+class _FakeRegistry:
+    def __init__(self, version, fail=False):
+        self.version = version
+        self.fail = fail
+        self.ready = False
+
+    def warmup(self):
+        if self.fail:
+            raise RuntimeError("corrupt model")
+        self.ready = True
+        return self
+
+
+class _FakeManager(ModelManager):
+    def _make(self, version):
+        return _FakeRegistry(version, fail=version == "bad")
+
+
+class TestModelManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        src = os.path.join(self.root, "trained")
+        _write_artifacts(src, "x")
+        for v in ("v1", "v2", "bad"):
+            model_store.publish(src, self.root, version=v, activate_version=v == "v1")
+        self.manager = _FakeManager(root=self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_swap_replaces_active_and_keeps_old_reference_valid(self):
+        in_flight = self.manager.active
+        self.manager.swap_to("v2")
+        self.assertEqual(self.manager.active.version, "v2")
+        self.assertTrue(self.manager.active.ready)
+        self.assertEqual(in_flight.version, "v1")
+        self.assertEqual(self.manager.swaps, 1)
+
+    def test_failed_load_keeps_serving_previous_version(self):
+        self.manager.swap_to("v2")
+        with self.assertRaises(RuntimeError):
+            self.manager.swap_to("bad")
+        self.assertEqual(self.manager.active.version, "v2")
+        self.assertIn("corrupt model", self.manager.status()["last_error"])
+
+    def test_reload_follows_current(self):
+        model_store.activate("v2", self.root)
+        self.manager.reload_async().join()
+        self.assertEqual(self.manager.active.version, "v2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fraud_api
+from inference import CREDITCARD_FEATURES, FraudNetRegistry
+
+
+class TestReadiness(unittest.TestCase):
+
+    def setUp(self):
+        self.warmup = fraud_api.WARMUP_ON_STARTUP
+        # No `with`: startup hooks (and so warm-up) don't run
+        self.client = TestClient(fraud_api.app)
+
+    def tearDown(self):
+        fraud_api.WARMUP_ON_STARTUP = self.warmup
+
+    def test_not_ready_until_warmed_up(self):
+        fraud_api.WARMUP_ON_STARTUP = True
+        r = self.client.get("/readyz")
+        self.assertEqual(r.status_code, 503)
+        self.assertFalse(r.json()["loaded"])
+
+    def test_lazy_mode_is_ready_before_loading(self):
+        fraud_api.WARMUP_ON_STARTUP = False
+        r = self.client.get("/readyz")
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.json()["ready"])
+
+    def test_lazy_load_marks_registry_ready(self):
+        n = len(CREDITCARD_FEATURES)
+        net = torch.nn.Sequential(torch.nn.Linear(n, 1), torch.nn.Sigmoid()).eval()
+        with tempfile.TemporaryDirectory() as tmp:
+            torch.jit.trace(net, torch.zeros(1, n)).save(os.path.join(tmp, "FraudNet.pt"))
+            np.savez(os.path.join(tmp, "scaler.npz"), mean=np.zeros(n), scale=np.ones(n))
+            reg = FraudNetRegistry(tmp)
+            self.assertFalse(reg.ready)
+            reg.predict_single(dict.fromkeys(CREDITCARD_FEATURES, 0.0))  # no warmup()
+            self.assertTrue(reg.ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
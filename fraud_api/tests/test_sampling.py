@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loaders.sampling import balance_indices, stratified_split_indices
+
+
+class TestSampling(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.y = (rng.random(10_000) < 0.02).astype(np.int8)
+        self.n_fraud = int(self.y.sum())
+
+    def test_undersample_ratio(self):
+        idx = balance_indices(self.y, "undersample", ratio=3.0, random_state=0)
+        self.assertEqual(int(self.y[idx].sum()), self.n_fraud)
+        self.assertEqual(int((self.y[idx] == 0).sum()), 3 * self.n_fraud)
+        self.assertEqual(len(np.unique(idx)), len(idx))
+
+    def test_oversample_keeps_majority(self):
+        idx = balance_indices(self.y, "oversample", ratio=1.0, random_state=0)
+        n_major = int((self.y == 0).sum())
+        self.assertEqual(int((self.y[idx] == 0).sum()), n_major)
+        self.assertEqual(int((self.y[idx] == 1).sum()), n_major)
+
+    def test_stratified_split_is_disjoint_and_stratified(self):
+        train, val, test = stratified_split_indices(self.y, test_size=0.2, val_size=0.1, random_state=0)
+        all_idx = np.concatenate([train, val, test])
+        self.assertEqual(len(all_idx), len(self.y))
+        self.assertEqual(len(np.unique(all_idx)), len(self.y))
+        for part, frac in ((test, 0.2), (val, 0.1)):
+            self.assertAlmostEqual(self.y[part].sum() / self.n_fraud, frac, delta=0.02)
+
+    def test_reproducible(self):
+        a = stratified_split_indices(self.y, random_state=7)
+        b = stratified_split_indices(self.y, random_state=7)
+        for x, z in zip(a, b):
+            np.testing.assert_array_equal(x, z)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import joblib
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scaling import AffineScaler
+
+
+class TestAffineScalerParity(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        # Mix of PCA-like columns and wide-range Time/Amount columns
+        self.X_train = np.column_stack([
+            rng.uniform(0, 172792, size=2000),
+            rng.normal(size=(2000, 28)),
+            rng.exponential(88.0, size=2000),
+        ])
+        self.X_new = np.column_stack([
+            rng.uniform(0, 172792, size=256),
+            rng.normal(size=(256, 28)),
+            rng.exponential(88.0, size=256),
+        ])
+        self.sk = StandardScaler().fit(self.X_train)
+
+    def test_matches_sklearn_transform(self):
+        affine = AffineScaler.from_sklearn(self.sk)
+        expected = self.sk.transform(self.X_new)
+        got = affine.transform(self.X_new.astype(np.float32))
+        self.assertEqual(got.dtype, np.float32)
+        np.testing.assert_allclose(got, expected, rtol=1e-5, atol=1e-5)
+
+    def test_in_place_on_request_buffer(self):
+        affine = AffineScaler.from_sklearn(self.sk)
+        buf = self.X_new[:1].astype(np.float32)
+        out = affine.transform(buf, out=buf)
+        self.assertIs(out, buf)
+        np.testing.assert_allclose(buf, self.sk.transform(self.X_new[:1]), rtol=1e-5, atol=1e-5)
+
+    def test_load_from_pickle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scaler.pkl")
+            joblib.dump(self.sk, path)
+            affine = AffineScaler.load(path)
+        np.testing.assert_allclose(
+            affine.transform(self.X_new), self.sk.transform(self.X_new), rtol=1e-5, atol=1e-5
+        )
+
+    def test_without_mean(self):
+        sk = StandardScaler(with_mean=False).fit(self.X_train)
+        affine = AffineScaler.from_sklearn(sk)
+        np.testing.assert_allclose(
+            affine.transform(self.X_new), sk.transform(self.X_new), rtol=1e-5, atol=1e-5
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
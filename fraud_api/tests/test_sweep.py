@@ -0,0 +1,33 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sweep import SEARCH_SPACE, pareto_front, sample_configs
+
+
+class TestSweepHelpers(unittest.TestCase):
+
+    def test_sample_configs_distinct_and_in_space(self):
+        configs = sample_configs(10, seed=1)
+        self.assertEqual(len(configs), 10)
+        self.assertEqual(len({tuple(sorted(c.items())) for c in configs}), 10)
+        for c in configs:
+            self.assertEqual(c["n_a"], c["n_d"])
+            for k, values in SEARCH_SPACE.items():
+                self.assertIn(c[k], values)
+
+    def test_sample_configs_deterministic(self):
+        self.assertEqual(sample_configs(5, seed=3), sample_configs(5, seed=3))
+
+    def test_pareto_front(self):
+        auc = np.array([0.90, 0.95, 0.93, 0.95])
+        latency = np.array([100.0, 300.0, 400.0, 350.0])
+        # 0: fastest, 1: most accurate; 2 is beaten by 1, 3 ties 1 on AUC but is slower
+        self.assertEqual(pareto_front(auc, latency).tolist(), [True, True, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
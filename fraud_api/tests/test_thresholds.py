@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.metrics import precision_score, recall_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from thresholds import ThresholdTable
+
+
+class TestThresholdTable(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.y = (rng.random(20_000) < 0.02).astype(int)
+        self.p = np.clip(rng.normal(0.2 + 0.5 * self.y, 0.15), 0, 1)
+        self.table = ThresholdTable.from_scores(self.y, self.p, cost_fp=1.0, cost_fn=20.0)
+
+    def test_rows_match_sklearn(self):
+        for t in (0.1, 0.35, 0.5, 0.8):
+            k = round(t * self.table.n_bins)
+            pred = self.p >= self.table.threshold[k]
+            self.assertAlmostEqual(self.table.precision[k], precision_score(self.y, pred), places=9)
+            self.assertAlmostEqual(self.table.recall[k], recall_score(self.y, pred), places=9)
+
+    def test_optimal_threshold_minimizes_cost(self):
+        k = self.table.optimal_index()
+        costs = [(self.p >= t).astype(int) for t in self.table.threshold]
+        brute = [np.sum((c == 1) & (self.y == 0)) + 20 * np.sum((c == 0) & (self.y == 1)) for c in costs]
+        self.assertEqual(k, int(np.argmin(brute)))
+        # Cheaper false negatives push the threshold up
+        self.assertGreater(self.table.optimal_threshold(cost_fn=2.0), self.table.optimal_threshold())
+
+    def test_json_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "operating_points.json")
+            self.table.save(path)
+            loaded = ThresholdTable.load(path)
+        self.assertEqual(loaded.optimal_threshold(), self.table.optimal_threshold())
+        self.assertEqual(loaded.row(500), self.table.row(500))
+
+
+class TestRegistryDecide(unittest.TestCase):
+
+    def test_accepts_python_and_numpy_scores(self):
+        from inference import ModelRegistry
+
+        reg = ModelRegistry()
+        reg.decision_threshold = 0.3
+        for prob in (0.5, np.float32(0.5), np.float64(0.5), reg.decision_threshold):
+            self.assertEqual(reg.decide(prob), "flag")
+        for prob in (0.1, np.float32(0.1)):
+            self.assertEqual(reg.decide(prob), "approve")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Operating-point table: precision / recall / cost for every decision threshold.
+
+Training scores a held-out split once and stores, for N_BINS evenly spaced
+thresholds, the confusion counts you would get by flagging scores >= the
+threshold. Serving loads the table, picks the cost-optimal threshold for
+the configured false-positive / false-negative costs once, and then each
+decision is a single comparison.
+
+DeepLearning uses this module too (loaded by path, see DeepLearning/shared.py).
+"""
+import json
+import os
+import numpy as np
+
+N_BINS = 1000
+# Missing a fraud is assumed to cost this many false alarms unless overridden
+DEFAULT_COST_FP = 1.0
+DEFAULT_COST_FN = 20.0
+
+
+class ThresholdTable:
+    """
+    Row k is threshold k / n_bins. Counts are over the evaluation split.
+    """
+
+    COLUMNS = ("threshold", "tp", "fp", "fn", "tn", "precision", "recall", "flag_rate")
+
+    def __init__(self, tp, fp, n_pos, n_neg, cost_fp=DEFAULT_COST_FP, cost_fn=DEFAULT_COST_FN):
+        self.tp = np.asarray(tp, dtype=np.int64)
+        self.fp = np.asarray(fp, dtype=np.int64)
+        self.n_pos, self.n_neg = int(n_pos), int(n_neg)
+        self.n_bins = len(self.tp)
+        self.cost_fp, self.cost_fn = float(cost_fp), float(cost_fn)
+        self.threshold = np.arange(self.n_bins) / self.n_bins
+        self.fn = self.n_pos - self.tp
+        self.tn = self.n_neg - self.fp
+        flagged = self.tp + self.fp
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Nothing flagged counts as perfectly precise (sklearn's convention)
+            self.precision = np.where(flagged > 0, self.tp / flagged, 1.0)
+            self.recall = self.tp / max(self.n_pos, 1)
+        self.flag_rate = flagged / max(self.n_pos + self.n_neg, 1)
+
+    @classmethod
+    def from_scores(cls, y_true, probs, n_bins: int = N_BINS, **costs):
+        """
+        Build the table in one pass: histogram the scores per class, then
+        reverse cumulative sums give TP/FP for every threshold.
+        """
+        y_true = np.asarray(y_true).astype(bool).ravel()
+        bins = np.minimum((np.asarray(probs, dtype=np.float64).ravel() * n_bins).astype(np.int64), n_bins - 1)
+        bins = np.maximum(bins, 0)
+        pos = np.bincount(bins[y_true], minlength=n_bins)
+        neg = np.bincount(bins[~y_true], minlength=n_bins)
+        tp = np.cumsum(pos[::-1])[::-1]
+        fp = np.cumsum(neg[::-1])[::-1]
+        return cls(tp, fp, y_true.sum(), (~y_true).sum(), **costs)
+
+    def cost(self, cost_fp: float = None, cost_fn: float = None) -> np.ndarray:
+        """
+        Expected cost per transaction at every threshold.
+        """
+        cost_fp = self.cost_fp if cost_fp is None else cost_fp
+        cost_fn = self.cost_fn if cost_fn is None else cost_fn
+        return (cost_fp * self.fp + cost_fn * self.fn) / max(self.n_pos + self.n_neg, 1)
+
+    def optimal_index(self, cost_fp: float = None, cost_fn: float = None) -> int:
+        return int(np.argmin(self.cost(cost_fp, cost_fn)))
+
+    def optimal_threshold(self, cost_fp: float = None, cost_fn: float = None) -> float:
+        return float(self.threshold[self.optimal_index(cost_fp, cost_fn)])
+
+    def row(self, k: int, cost_fp: float = None, cost_fn: float = None) -> dict:
+        cost_fp = self.cost_fp if cost_fp is None else cost_fp
+        cost_fn = self.cost_fn if cost_fn is None else cost_fn
+        r = {c: getattr(self, c)[k].item() for c in self.COLUMNS}
+        r["cost"] = (cost_fp * r["fp"] + cost_fn * r["fn"]) / max(self.n_pos + self.n_neg, 1)
+        return r
+
+    # -----------------------------
+    # Persistence (JSON next to the model artifacts)
+    # -----------------------------
+    def save(self, path: str):
+        payload = {
+            "n_bins": self.n_bins, "n_pos": self.n_pos, "n_neg": self.n_neg,
+            "cost_fp": self.cost_fp, "cost_fn": self.cost_fn,
+            "optimal_threshold": self.optimal_threshold(),
+            "tp": self.tp.tolist(), "fp": self.fp.tolist(),
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path) as f:
+            p = json.load(f)
+        return cls(p["tp"], p["fp"], p["n_pos"], p["n_neg"], cost_fp=p["cost_fp"], cost_fn=p["cost_fn"])
@@ -1,131 +1,219 @@
 import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from pytorch_tabnet.tab_model import TabNetClassifier
-from torch.utils.tensorboard import SummaryWriter
-from loaders.kaggle_loader import load_fraud_data
-from pytorch_tabnet.tab_model import TabNetClassifier
-from torch.utils.tensorboard import SummaryWriter
-from loaders.kaggle_loader import load_fraud_data
+from loaders.kaggle_loader import load_fraud_data, load_transactions
+from loaders.sampling import stratified_split_indices
+from metrics_sink import MetricsSink
+from thresholds import ThresholdTable
+from pytorch_tabnet.callbacks import Callback
+import argparse
+import time
 import joblib
 import os
 import datetime
 import torch
 
 # -----------------------------
-# Load dataset
-# -----------------------------
-# df = pd.read_csv("creditcard.csv")
-# df.columns = df.columns.str.strip()  # remove stray spaces
-
-# target_col = "Class"
-# X = df.drop(target_col, axis=1).values
-# y = df[target_col].values
-
-# # Train/test split
-# X_train, X_test, y_train, y_test = train_test_split(
-#     X, y, test_size=0.2, stratify=y, random_state=42
-# )
-
+# Config
 # -----------------------------
-    # Config
-    # -----------------------------
 DATASET = "creditcard"      # or "paysim"
-timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-LOG_DIR = f"./tabnet_logs/run_{timestamp}"
 MODELS_DIR = "./models"
 MAX_EPOCHS = 50
 PATIENCE = 10
 BATCH_SIZE = 1024
 VIRTUAL_BATCH_SIZE = 128
 
-os.makedirs(MODELS_DIR, exist_ok=True)
-
-# Load dataset (Credit Card Fraud or PaySim)
-# X_train, X_test, y_train, y_test, feature_names = load_fraud_data(
-#     dataset=DATASET,    
-#     balance_data=True
-# )
-X_train, X_test, y_train, y_test, feature_names = load_fraud_data(
-        dataset=DATASET, data_dir="data", test_size=0.2, random_state=42, balance_data=False
-    )
-
-# Scale features
-scaler = StandardScaler()
-X_train = scaler.fit_transform(X_train)
-X_test = scaler.transform(X_test)
-
-# Save scaler for inference
-scaler_path = os.path.join(MODELS_DIR, "scaler.pkl")
-joblib.dump(scaler, scaler_path)
-# -----------------------------
-# TensorBoard setup
-# -----------------------------
-writer = SummaryWriter(log_dir=LOG_DIR)
-
-if torch.cuda.is_available():
-    device = torch.device("cuda")
-    print(f"Using GPU: {torch.cuda.get_device_name()}")
-else:
-    device = torch.device("cpu")
-    print("CUDA not available, using CPU")
-# -----------------------------
-# TabNet model
-# -----------------------------
-clf = TabNetClassifier(
+# TabNet architecture/optimizer defaults (sweep.py searches around these)
+DEFAULT_PARAMS = dict(
     n_d=16, n_a=16, n_steps=5,
     gamma=1.5, n_independent=2, n_shared=2,
-    optimizer_params=dict(lr=2e-2),
-    mask_type='entmax'
+    lr=2e-2, mask_type="entmax",
+    batch_size=BATCH_SIZE, virtual_batch_size=VIRTUAL_BATCH_SIZE,
 )
 
-# -----------------------------
-# Train in ONE call
-# -----------------------------
-clf.fit(
-    X_train, y_train,
-    eval_set=[(X_train, y_train), (X_test, y_test)],
-    eval_name=['train', 'val'],
-    eval_metric=['auc', 'logloss', 'accuracy'],
-    max_epochs=MAX_EPOCHS,              # train multiple epochs in one call
-    patience=PATIENCE,                # early stopping patience
-    batch_size=BATCH_SIZE,
-    virtual_batch_size=VIRTUAL_BATCH_SIZE 
-)
+# Keys of DEFAULT_PARAMS that go to fit() rather than the constructor
+FIT_PARAMS = ("batch_size", "virtual_batch_size")
 
-# -----------------------------
-# Log metrics per epoch
-# -----------------------------
-history = clf.history.history
-metrics = ['auc', 'logloss', 'accuracy']
 
-# -----------------------------
-# Log metrics per epoch (robust)
-# -----------------------------
-hist = clf.history.history
-metrics = ['auc', 'logloss', 'accuracy']
-
-# Some keys might not exist depending on eval_metric choices; guard with .get
-num_epochs = len(hist.get('train_auc', []))
-for epoch in range(num_epochs):
-    for m in metrics:
-        tr_key, va_key = f"train_{m}", f"val_{m}"
-        if tr_key in hist:
-            writer.add_scalar(f"{m.upper()}/train", hist[tr_key][epoch], epoch)
-        if va_key in hist:
-            writer.add_scalar(f"{m.UPPER() if hasattr(str, 'UPPER') else m.upper()}/val", hist[va_key][epoch], epoch)
-    # Optional: concise console log when AUC is available
-    if 'train_auc' in hist and 'val_auc' in hist:
-        print(f"Epoch {epoch+1}: AUC train={hist['train_auc'][epoch]:.4f}, val={hist['val_auc'][epoch]:.4f}")
-
-writer.close()
+def build_classifier(params: dict = None, seed: int = 0, verbose: int = 1) -> TabNetClassifier:
+    """
+    TabNetClassifier from DEFAULT_PARAMS overridden by `params`.
+    """
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    lr = p.pop("lr")
+    for k in FIT_PARAMS:
+        p.pop(k)
+    return TabNetClassifier(**p, optimizer_params=dict(lr=lr), seed=seed, verbose=verbose)
+
+
+def fit_params(params: dict = None) -> dict:
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    return {k: p[k] for k in FIT_PARAMS}
+
+
+def load_scaled_data(dataset=DATASET, data_dir="data"):
+    """
+    Load the compact train/test split and standardize it.
+    Returns (X_train, X_test, y_train, y_test, feature_names, scaler).
+    """
+    X_train, X_test, y_train, y_test, feature_names = load_fraud_data(
+        dataset=dataset, data_dir=data_dir, test_size=0.2, random_state=42, balance_data=False,
+        compact=True
+    )
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    X_test = scaler.transform(X_test)
+    return X_train, X_test, y_train, y_test, feature_names, scaler
+
+
+def save_operating_points(clf, X, y, models_dir: str = MODELS_DIR) -> ThresholdTable:
+    """
+    Precision/recall/cost per threshold on a held-out split, written to
+    models_dir/operating_points.json for the API's /decide endpoint.
+    """
+    table = ThresholdTable.from_scores(y, clf.predict_proba(X)[:, 1])
+    table.save(os.path.join(models_dir, "operating_points.json"))
+    k = table.optimal_index()
+    print(f"Cost-optimal threshold {table.threshold[k]:.3f}: "
+          f"precision={table.precision[k]:.3f} recall={table.recall[k]:.3f}")
+    return table
+
+
+class TensorBoardCallback(Callback):
+    """
+    Log TabNet's epoch metrics (train_auc, val_logloss, ...) live, one
+    event per metric per epoch, through a MetricsSink. Tags are
+    "<METRIC>/<eval set>", e.g. "AUC/val".
+    """
+
+    def __init__(self, sink: MetricsSink):
+        super().__init__()
+        self.sink = sink
+        self.logged_s = 0.0
+
+    def on_epoch_end(self, epoch, logs=None):
+        t0 = time.perf_counter()
+        for key, value in (logs or {}).items():
+            eval_name, _, metric = key.partition("_")
+            if key == "loss":
+                eval_name, metric = "train", "loss"
+            if metric:
+                self.sink.add_scalar(f"{metric.upper()}/{eval_name}", value, epoch)
+        self.logged_s += time.perf_counter() - t0
+
+
+def incremental_update(new_data: str, models_dir: str = MODELS_DIR, dataset: str = DATASET,
+                       max_epochs: int = 10, patience: int = 3, lr: float = None, val_size: float = 0.2):
+    """
+    Fine-tune the saved model on a batch of new labelled transactions only.
+
+    The scaler is refreshed with StandardScaler.partial_fit (running
+    mean/variance over history + delta), the classifier is warm-started from
+    best_tabnet_model.zip, and both are written back to models_dir. Cost
+    scales with the size of `new_data`, not with the full history.
+
+    operating_points.json is left as is: the delta's validation slice holds
+    too few frauds to re-pick the threshold. A full retrain rewrites it.
+    """
+    t0 = time.perf_counter()
+    scaler_path = os.path.join(models_dir, "scaler.pkl")
+    feature_names = joblib.load(os.path.join(models_dir, "feature_names.pkl"))
+    X, y = load_transactions(new_data, dataset=dataset, feature_names=feature_names)
+    print(f"Incremental update on {len(X)} new rows ({int(y.sum())} fraud)")
+
+    scaler = joblib.load(scaler_path)
+    scaler.partial_fit(X)
+    X = scaler.transform(X)
+
+    # Early stopping needs a held-out slice of the delta
+    train_idx, _, val_idx = stratified_split_indices(y, test_size=val_size, random_state=42)
+    if len(np.unique(y[val_idx])) < 2:
+        raise ValueError("New data needs enough fraud rows for both classes in the validation slice")
+
+    clf = TabNetClassifier()
+    clf.load_model(f"{models_dir}/best_tabnet_model.zip")
+    if lr is not None:
+        clf.optimizer_params = dict(lr=lr)
+    clf.fit(
+        X[train_idx], y[train_idx],
+        eval_set=[(X[val_idx], y[val_idx])],
+        eval_name=['val'],
+        eval_metric=['auc'],
+        max_epochs=max_epochs,
+        patience=patience,
+        warm_start=True,
+        **fit_params()
+    )
+
+    # Model first: if saving it fails, the old scaler still matches the old
+    # model and a rerun does not count this batch twice in the running stats
+    clf.save_model(f"{models_dir}/best_tabnet_model")
+    joblib.dump(scaler, scaler_path)
+    print(f"✅ Incremental update complete in {time.perf_counter() - t0:.1f}s "
+          f"(scaler has seen {int(scaler.n_samples_seen_)} rows)")
+    return clf
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the TabNet fraud model")
+    parser.add_argument("--incremental", metavar="NEW_DATA",
+                        help="fine-tune the saved model on this CSV/Parquet batch instead of retraining")
+    parser.add_argument("--epochs", type=int, default=10, help="max epochs for --incremental")
+    parser.add_argument("--lr", type=float, default=None, help="learning rate for --incremental (default: saved)")
+    parser.add_argument("--log-flush-secs", type=float, default=10.0,
+                        help="TensorBoard flush interval of the background metrics writer")
+    args = parser.parse_args()
+    if args.incremental:
+        incremental_update(args.incremental, max_epochs=args.epochs, lr=args.lr)
+        return
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_dir = f"./tabnet_logs/run_{timestamp}"
+    os.makedirs(MODELS_DIR, exist_ok=True)
+
+    # Load dataset (Credit Card Fraud or PaySim)
+    X_train, X_test, y_train, y_test, feature_names, scaler = load_scaled_data(DATASET)
+
+    # Save scaler for inference
+    joblib.dump(scaler, os.path.join(MODELS_DIR, "scaler.pkl"))
+
+    sink = MetricsSink(log_dir, flush_secs=args.log_flush_secs)
+    tb_callback = TensorBoardCallback(sink)
+
+    if torch.cuda.is_available():
+        print(f"Using GPU: {torch.cuda.get_device_name()}")
+    else:
+        print("CUDA not available, using CPU")
+
+    # -----------------------------
+    # Train in ONE call
+    # -----------------------------
+    clf = build_classifier()
+    t0 = time.perf_counter()
+    clf.fit(
+        X_train, y_train,
+        eval_set=[(X_train, y_train), (X_test, y_test)],
+        eval_name=['train', 'val'],
+        eval_metric=['auc', 'logloss', 'accuracy'],
+        max_epochs=MAX_EPOCHS,              # train multiple epochs in one call
+        patience=PATIENCE,                # early stopping patience
+        callbacks=[tb_callback],          # metrics go to TensorBoard as each epoch ends
+        **fit_params()
+    )
+    train_s = time.perf_counter() - t0
+    sink.close()
+    print(f"Metrics logging: {tb_callback.logged_s / train_s:.3%} of training time ({sink.events} events)")
+
+    # -----------------------------
+    # Save best model
+    # -----------------------------
+    clf.save_model(f"{MODELS_DIR}/best_tabnet_model")
+    print("✅ Training complete. Best model saved as 'best_tabnet_model.zip'")
+    save_operating_points(clf, X_test, y_test)
+
+    # Save feature names for inference-time ordering checks
+    joblib.dump(feature_names, os.path.join(MODELS_DIR, "feature_names.pkl"))
 
-# -----------------------------
-# Save best model
-# -----------------------------
-clf.save_model(f"{MODELS_DIR}/best_tabnet_model")
-print("✅ Training complete. Best model saved as 'best_tabnet_model.zip'")
 
-# Save feature names for inference-time ordering checks
-joblib.dump(feature_names, os.path.join(MODELS_DIR, "feature_names.pkl"))
+if __name__ == "__main__":
+    main()